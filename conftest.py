@@ -0,0 +1,33 @@
+"""Shared fixtures: an EspansoAPI bound to a throwaway Espanso config directory."""
+
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def espanso_home(tmp_path, monkeypatch):
+    """Point HOME/XDG_CONFIG_HOME at `tmp_path` and create an empty match directory."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / ".config"))
+    match_dir = tmp_path / ".config" / "espanso" / "match"
+    match_dir.mkdir(parents=True)
+    (match_dir.parent / "config").mkdir()
+    return match_dir
+
+
+@pytest.fixture
+def make_api(espanso_home):
+    """Factory for EspansoAPI instances over `espanso_home`; each is shut down afterwards."""
+    from espansogui import EspansoAPI
+
+    created = []
+
+    def factory():
+        api = EspansoAPI()
+        created.append(api)
+        return api
+
+    yield factory
+    for api in created:
+        api.shutdown()
@@ -1,10 +1,31 @@
 """Espanso Companion Pro backend core package."""
 
 __all__ = [
+    "atomic_io",
+    "backup_retention",
+    "backup_store",
+    "body_store",
     "config_loader",
     "yaml_processor",
     "cli_integration",
+    "cli_jobs",
     "file_watcher",
+    "health_monitor",
     "variable_engine",
     "feature_catalog",
+    "event_channel",
+    "match_cache",
+    "match_snapshot",
+    "reload_pipeline",
+    "restart_scheduler",
+    "restore_plan",
+    "search_index",
+    "snippet_batch",
+    "snippet_locator",
+    "snippet_record",
+    "snippet_revisions",
+    "snippet_views",
+    "trigger_trie",
+    "workspace_index",
+    "yaml_editing",
 ]
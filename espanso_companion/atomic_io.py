@@ -0,0 +1,261 @@
+"""Crash-safe file writes (temp file + fsync + rename) and a coalescing background writer."""
+
+from __future__ import annotations
+
+import os
+import secrets
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Mapping, Optional, Tuple, Union
+
+PathLike = Union[str, Path]
+
+def fsync_directory(directory: PathLike) -> None:
+    """Flush a directory entry (the rename) to disk; a no-op where directories cannot be opened."""
+    if os.name == "nt":
+        return
+    try:
+        fd = os.open(str(directory), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _discard(temp_name: str) -> None:
+    try:
+        os.unlink(temp_name)
+    except OSError:
+        pass
+
+
+def _open_temp(target: Path) -> Tuple[int, str]:
+    """Create a temp file next to `target`; mode 0o666 lets the kernel apply the umask as open() would."""
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    for _ in range(100):
+        temp_name = str(target.parent / f".{target.name}.{secrets.token_hex(4)}.tmp")
+        try:
+            return os.open(temp_name, flags, 0o666), temp_name
+        except FileExistsError:
+            continue
+    raise FileExistsError(f"No free temp file name next to {target}")
+
+
+def _stage(target: Path, fill: Callable[[int], None]) -> str:
+    """Write a temp file next to `target` with `fill` and give it the target's mode; returns its name."""
+    fd, temp_name = _open_temp(target)
+    try:
+        fill(fd)
+        try:
+            os.chmod(temp_name, os.stat(target).st_mode & 0o7777)
+        except FileNotFoundError:
+            pass  # a new file keeps the umask-derived mode it was created with
+    except BaseException:
+        _discard(temp_name)
+        raise
+    return temp_name
+
+
+def _atomic_replace(target: Path, fill: Callable[[int], None], fsync_dir: bool) -> None:
+    temp_name = _stage(target, fill)
+    try:
+        os.replace(temp_name, target)
+    except BaseException:
+        _discard(temp_name)
+        raise
+    if fsync_dir:
+        fsync_directory(target.parent)
+
+
+def _text_fill(text: str, encoding: str) -> Callable[[int], None]:
+    def fill(fd: int) -> None:
+        with os.fdopen(fd, "w", encoding=encoding) as handle:
+            handle.write(text)
+            handle.flush()
+            os.fsync(handle.fileno())
+
+    return fill
+
+
+def _bytes_fill(data: bytes) -> Callable[[int], None]:
+    def fill(fd: int) -> None:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+            handle.flush()
+            os.fsync(handle.fileno())
+
+    return fill
+
+
+def atomic_write_text(
+    path: PathLike,
+    text: str,
+    *,
+    encoding: str = "utf-8",
+    fsync_dir: bool = False,
+) -> None:
+    """Replace `path` with `text` so readers see either the old or the new file, never a torn one.
+
+    The data goes to a temp file in the same directory, is fsynced, then renamed
+    over the target (keeping its permission bits). `fsync_dir` also flushes the
+    rename itself so it survives a power loss.
+    """
+    _atomic_replace(Path(path), _text_fill(text, encoding), fsync_dir)
+
+
+def atomic_write_bytes(path: PathLike, data: bytes, *, fsync_dir: bool = False) -> None:
+    """Binary counterpart of atomic_write_text."""
+    _atomic_replace(Path(path), _bytes_fill(data), fsync_dir)
+
+
+def atomic_write_files(
+    contents: Mapping[Path, str],
+    originals: Mapping[Path, bytes],
+    *,
+    encoding: str = "utf-8",
+    fsync_dir: bool = False,
+) -> None:
+    """Replace several text files as one unit: all of them get `contents`, or none changes.
+
+    Every temp file is written and fsynced before the first rename. If any write
+    or rename fails, the staged temp files are removed and targets already
+    replaced get their `originals` bytes back (targets not in `originals` did not
+    exist and are deleted); the error is then re-raised.
+    """
+    staged: List[Tuple[Path, str]] = []
+    replaced: List[Path] = []
+    try:
+        for target, text in contents.items():
+            staged.append((target, _stage(target, _text_fill(text, encoding))))
+        for target, temp_name in staged:
+            os.replace(temp_name, target)
+            replaced.append(target)
+    except BaseException:
+        for target, temp_name in staged[len(replaced):]:
+            _discard(temp_name)
+        for target in reversed(replaced):
+            try:
+                if target in originals:
+                    atomic_write_bytes(target, originals[target])
+                else:
+                    target.unlink()
+            except OSError as exc:
+                print(f"[ERROR] Could not roll back {target}: {exc}", flush=True)
+        raise
+    if fsync_dir:
+        for directory in {target.parent for target in replaced}:
+            fsync_directory(directory)
+
+
+class CoalescingWriter:
+    """Writes small state files on a worker thread, collapsing bursts into one atomic write.
+
+    `schedule(path, text)` replaces any pending payload for `path` (latest wins);
+    the write happens once `delay` seconds pass without a newer payload, or at
+    most `max_delay` after the first one. `flush()` writes everything pending on
+    the calling thread and should run at shutdown.
+    """
+
+    def __init__(self, *, delay: float = 0.25, max_delay: float = 2.0, fsync_dir: bool = False) -> None:
+        self._delay = max(0.0, delay)
+        self._max_delay = max(self._delay, max_delay)
+        self._fsync_dir = fsync_dir
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        # path -> (text, first scheduled, last scheduled)
+        self._pending: Dict[Path, Tuple[str, float, float]] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._writes = 0
+        self._coalesced = 0
+
+    def schedule(self, path: PathLike, text: str) -> None:
+        target = Path(path)
+        now = time.monotonic()
+        with self._condition:
+            previous = self._pending.get(target)
+            if previous is not None:
+                self._coalesced += 1
+            self._pending[target] = (text, previous[1] if previous else now, now)
+            self._condition.notify_all()
+            if not self._running:
+                self._running = True
+                self._thread = threading.Thread(target=self._run, name="espanso-writer", daemon=True)
+                self._thread.start()
+
+    def flush(self, path: Optional[PathLike] = None) -> None:
+        """Write pending payloads now (all of them, or just `path`)."""
+        with self._condition:
+            targets = list(self._pending) if path is None else [Path(path)]
+        self._write_pending(targets)
+
+    def close(self) -> None:
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=1)
+        self._thread = None
+        self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        with self._condition:
+            return {"pending": len(self._pending), "writes": self._writes, "coalesced": self._coalesced}
+
+    def _write_pending(self, targets: List[Path]) -> None:
+        # Taking payloads and writing them under one lock keeps an older payload
+        # from landing after a newer one flushed from another thread.
+        with self._write_lock:
+            with self._condition:
+                batch = [(target, self._pending.pop(target)[0]) for target in targets if target in self._pending]
+            for target, text in batch:
+                try:
+                    atomic_write_text(target, text, fsync_dir=self._fsync_dir)
+                except Exception as exc:
+                    print(f"[ERROR] Failed to write {target}: {exc}", flush=True)
+                    continue
+                with self._condition:
+                    self._writes += 1
+
+    def _due(self, now: float) -> Tuple[List[Path], Optional[float]]:
+        due: List[Path] = []
+        wake_at: Optional[float] = None
+        for target, (_, first, last) in self._pending.items():
+            deadline = min(last + self._delay, first + self._max_delay)
+            if deadline <= now:
+                due.append(target)
+            elif wake_at is None or deadline < wake_at:
+                wake_at = deadline
+        return due, wake_at
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while True:
+                    if not self._running:
+                        return
+                    now = time.monotonic()
+                    due, wake_at = self._due(now)
+                    if due:
+                        break
+                    self._condition.wait(timeout=None if wake_at is None else wake_at - now)
+            self._write_pending(due)
+
+
+"""
+CHANGELOG
+2026-10-18 Codex
+- Added atomic_write_text and CoalescingWriter so match, config and preference files are replaced atomically and bursts of state updates collapse into one write.
+2026-10-18 Codex
+- Added atomic_write_bytes for the backup object store.
+2026-10-18 Codex
+- Added atomic_write_files: stages every temp file before renaming any, and restores already-replaced files if a later one fails.
+2026-10-18 Codex
+- Temp files are created with os.open(..., 0o666) so new files get the umask from the kernel; the import-time umask probe (which briefly changed it process-wide) is gone.
+"""
@@ -0,0 +1,215 @@
+"""Retention rules for the backup store and the background janitor that applies them."""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+@dataclass
+class RetentionPolicy:
+    """Per kind: the newest `keep_recent` snapshots, plus the newest of each of the last
+    `keep_daily` days and `keep_weekly` ISO weeks. `max_bytes` caps the whole store
+    (oldest snapshots go first; the newest of each kind is always kept)."""
+
+    keep_recent: int = 20
+    keep_daily: int = 14
+    keep_weekly: int = 8
+    max_bytes: Optional[int] = DEFAULT_MAX_BYTES
+
+    @classmethod
+    def from_dict(cls, raw: Any) -> "RetentionPolicy":
+        """Read the `backupRetention` preference ({keepRecent, keepDaily, keepWeekly, maxBytes})."""
+        policy = cls()
+        if not isinstance(raw, dict):
+            return policy
+        for key, attribute in (("keepRecent", "keep_recent"), ("keepDaily", "keep_daily"), ("keepWeekly", "keep_weekly")):
+            if raw.get(key) is not None:
+                try:
+                    setattr(policy, attribute, max(0, int(raw[key])))
+                except (TypeError, ValueError):
+                    pass
+        if "maxBytes" in raw:
+            try:
+                policy.max_bytes = int(raw["maxBytes"]) if raw["maxBytes"] not in (None, "", 0) else None
+            except (TypeError, ValueError):
+                pass
+        policy.keep_recent = max(1, policy.keep_recent)
+        return policy
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "keepRecent": self.keep_recent,
+            "keepDaily": self.keep_daily,
+            "keepWeekly": self.keep_weekly,
+            "maxBytes": self.max_bytes,
+        }
+
+
+def _created(summary: Dict[str, Any]) -> datetime:
+    try:
+        created = datetime.fromisoformat(summary.get("created") or "")
+    except ValueError:
+        return datetime.fromtimestamp(0, timezone.utc)
+    return created if created.tzinfo else created.replace(tzinfo=timezone.utc)
+
+
+def select_kept(
+    summaries: Iterable[Dict[str, Any]],
+    policy: RetentionPolicy,
+    now: Optional[datetime] = None,
+) -> Set[str]:
+    """Ids of the snapshots the count/age rules keep (before the size cap)."""
+    now = now or datetime.now(timezone.utc)
+    by_kind: Dict[str, List[Dict[str, Any]]] = {}
+    for summary in summaries:
+        by_kind.setdefault(summary.get("kind", ""), []).append(summary)
+
+    kept: Set[str] = set()
+    for items in by_kind.values():
+        items.sort(key=_created, reverse=True)
+        kept.update(item["id"] for item in items[: max(1, policy.keep_recent)])
+        daily_cutoff = now - timedelta(days=policy.keep_daily)
+        weekly_cutoff = now - timedelta(weeks=policy.keep_weekly)
+        days: Set[Any] = set()
+        weeks: Set[Any] = set()
+        for item in items:
+            created = _created(item)
+            day = created.date()
+            if created >= daily_cutoff and day not in days:
+                days.add(day)
+                kept.add(item["id"])
+            week = created.isocalendar()[:2]
+            if created >= weekly_cutoff and week not in weeks:
+                weeks.add(week)
+                kept.add(item["id"])
+    return kept
+
+
+def prune_archives(paths: Iterable[Path], policy: RetentionPolicy, now: Optional[datetime] = None) -> List[Path]:
+    """Delete exported archives the policy does not keep; returns the deleted paths.
+
+    Archives are dated by mtime and treated as one kind, so the count/age rules
+    apply as for snapshots and `max_bytes` caps their combined size (the newest
+    archive is always kept).
+    """
+    summaries: List[Dict[str, Any]] = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        summaries.append({
+            "id": str(path),
+            "kind": "export",
+            "created": datetime.fromtimestamp(stat.st_mtime, timezone.utc).isoformat(),
+            "size": stat.st_size,
+        })
+    kept = select_kept(summaries, policy, now)
+    if policy.max_bytes is not None:
+        total = 0
+        for index, summary in enumerate(sorted(summaries, key=_created, reverse=True)):
+            if summary["id"] not in kept:
+                continue
+            total += summary["size"]
+            if index and total > policy.max_bytes:
+                kept.discard(summary["id"])
+    removed: List[Path] = []
+    for summary in summaries:
+        if summary["id"] in kept:
+            continue
+        path = Path(summary["id"])
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        removed.append(path)
+    return removed
+
+
+class BackupJanitor:
+    """Runs `prune()` on a worker thread: `delay` seconds after the last `request()`
+    (so a burst of edits prunes once) and at least every `interval` seconds."""
+
+    def __init__(self, prune: Callable[[], Dict[str, Any]], *, delay: float = 30.0, interval: float = 3600.0) -> None:
+        self._prune = prune
+        self._delay = delay
+        self._interval = interval
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._due: Optional[float] = None
+        self._run_lock = threading.Lock()
+        self._last: Optional[Dict[str, Any]] = None
+
+    def start(self) -> None:
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+            self._due = time.monotonic() + self._delay
+        self._thread = threading.Thread(target=self._run, name="espanso-backup-janitor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=1)
+        self._thread = None
+
+    def request(self) -> None:
+        """Note that backups were written; prune once things are quiet."""
+        with self._condition:
+            self._due = time.monotonic() + self._delay
+            self._condition.notify_all()
+
+    def run_now(self) -> Dict[str, Any]:
+        with self._run_lock:
+            started = time.monotonic()
+            try:
+                result = dict(self._prune())
+                result["status"] = "success"
+            except Exception as exc:
+                result = {"status": "error", "detail": str(exc)}
+            result["at"] = datetime.now(timezone.utc).isoformat()
+            result["durationMs"] = round((time.monotonic() - started) * 1000)
+            with self._condition:
+                self._last = result
+            return result
+
+    def last(self) -> Optional[Dict[str, Any]]:
+        with self._condition:
+            return dict(self._last) if self._last else None
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while self._running:
+                    now = time.monotonic()
+                    if self._due is not None and now >= self._due:
+                        break
+                    self._condition.wait(timeout=None if self._due is None else self._due - now)
+                if not self._running:
+                    return
+                self._due = time.monotonic() + self._interval
+            result = self.run_now()
+            if result["status"] != "success":
+                print(f"[ERROR] Backup pruning failed: {result['detail']}", flush=True)
+
+
+"""
+CHANGELOG
+2026-10-18 Codex
+- Added RetentionPolicy (keep recent/daily/weekly, total size cap) and BackupJanitor to prune backups in the background.
+2026-10-18 Codex
+- Added prune_archives so exported tar archives follow the same retention policy.
+"""
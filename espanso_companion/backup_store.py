@@ -0,0 +1,511 @@
+"""Content-addressed, deduplicating snapshot store for config and editor backups."""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import tarfile
+import tempfile
+import threading
+import uuid
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+
+from .atomic_io import atomic_write_bytes, atomic_write_text, fsync_directory
+from .backup_retention import RetentionPolicy, select_kept
+
+try:  # optional: better ratio and speed than zlib for blobs and exported archives
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+# Content-defined chunking over lines: a chunk ends after a line whose CRC has
+# the low bits clear (once MIN is reached) or at MAX. Boundaries depend only on
+# nearby content, so an edit re-stores the chunk around it, not the whole file.
+CHUNK_MIN_BYTES = 512
+CHUNK_MAX_BYTES = 64 * 1024
+CHUNK_MASK = 0x3F
+
+# Blob files are `<digest>.zst` (zstandard), `<digest>.z` (zlib) or bare `<digest>` (stored raw)
+BLOB_SUFFIXES = (".zst", ".z", "")
+INDEX_NAME = "index.jsonl"
+
+
+def compress_blob(data: bytes) -> Tuple[bytes, str]:
+    """Compress a chunk with the best available codec; raw when that does not save space."""
+    if zstandard is not None:
+        packed, suffix = zstandard.ZstdCompressor(level=6).compress(data), ".zst"
+    else:
+        packed, suffix = zlib.compress(data, 6), ".z"
+    if len(packed) >= len(data):
+        return data, ""
+    return packed, suffix
+
+
+def decompress_blob(data: bytes, suffix: str) -> bytes:
+    if suffix == ".zst":
+        if zstandard is None:
+            raise BackupError("This backup needs the 'zstandard' package to read")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if suffix == ".z":
+        return zlib.decompress(data)
+    return data
+
+
+def content_digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def split_chunks(data: bytes) -> List[bytes]:
+    """Split `data` at content-defined line boundaries (always at least one chunk)."""
+    if len(data) <= CHUNK_MIN_BYTES:
+        return [data]
+    chunks: List[bytes] = []
+    start = 0
+    position = 0
+    size = len(data)
+    while position < size:
+        newline = data.find(b"\n", position)
+        end = size if newline == -1 else newline + 1
+        length = end - start
+        if length >= CHUNK_MAX_BYTES or (
+            length >= CHUNK_MIN_BYTES and zlib.crc32(data[position:end]) & CHUNK_MASK == 0
+        ):
+            chunks.append(data[start:end])
+            start = end
+        position = end
+    if start < size:
+        chunks.append(data[start:])
+    return chunks
+
+
+@dataclass
+class SnapshotSource:
+    """One file to capture: read from `path`, or given directly as `data`."""
+
+    name: str
+    path: Optional[Path] = None
+    data: Optional[bytes] = None
+
+
+class BackupError(RuntimeError):
+    """A snapshot is missing or its stored content does not verify."""
+
+
+class BackupStore:
+    """Stores file contents once as hash-named chunk blobs plus one small manifest per snapshot.
+
+    Layout under `root`: compressed `objects/<aa>/<digest>[.zst|.z]` chunk blobs,
+    `snapshots/<id>.json` manifests listing each file's name, size, mtime, digest
+    and chunk digests, and `snapshots/index.jsonl` with one summary line per
+    snapshot. Unchanged files (same size and mtime as in the previous snapshot of
+    that kind) are not even re-read, so a snapshot costs O(changed bytes);
+    listing reads the index only.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self._objects = self.root / "objects"
+        self._snapshots = self.root / "snapshots"
+        self._lock = threading.Lock()
+        self._latest: Dict[str, Dict[str, Dict[str, Any]]] = {}  # kind -> name -> manifest entry
+        self._index: Optional[Dict[str, Dict[str, Any]]] = None  # id -> summary
+
+    def snapshot(self, kind: str, sources: Iterable[SnapshotSource], *, note: str = "") -> Dict[str, Any]:
+        """Capture `sources` as a new snapshot and return its manifest."""
+        with self._lock:
+            self._objects.mkdir(parents=True, exist_ok=True)
+            self._snapshots.mkdir(parents=True, exist_ok=True)
+            previous = self._latest_entries(kind)
+            touched_dirs: Set[Path] = set()
+            files: List[Dict[str, Any]] = []
+            new_bytes = 0
+            for source in sources:
+                entry, stored = self._capture(source, previous.get(source.name), touched_dirs)
+                files.append(entry)
+                new_bytes += stored
+            for directory in touched_dirs:
+                fsync_directory(directory)
+
+            created = datetime.now(timezone.utc)
+            snapshot_id = f"{kind}-{created.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:6]}"
+            manifest = {
+                "id": snapshot_id,
+                "kind": kind,
+                "created": created.isoformat(),
+                "note": note,
+                "files": files,
+                "totalBytes": sum(entry["size"] for entry in files),
+                "storedBytes": new_bytes,
+            }
+            atomic_write_text(self._manifest_path(snapshot_id), json.dumps(manifest, separators=(",", ":")), fsync_dir=True)
+            previous.update((entry["name"], entry) for entry in files)
+            summary = self._summary(manifest)
+            self._load_index()[snapshot_id] = summary
+            with open(self._snapshots / INDEX_NAME, "a", encoding="utf-8") as handle:
+                handle.write(json.dumps(summary, separators=(",", ":")) + "\n")
+            return manifest
+
+    def snapshot_tree(self, kind: str, directory: Path, *, note: str = "") -> Dict[str, Any]:
+        """Snapshot every file under `directory`, named by their relative POSIX paths."""
+        return self.snapshot(kind, self.tree_sources(directory), note=note)
+
+    @staticmethod
+    def tree_sources(directory: Path) -> List[SnapshotSource]:
+        sources: List[SnapshotSource] = []
+        for current, dirnames, filenames in os.walk(directory):
+            dirnames.sort()
+            base = Path(current)
+            for filename in sorted(filenames):
+                path = base / filename
+                sources.append(SnapshotSource(name=path.relative_to(directory).as_posix(), path=path))
+        return sources
+
+    def _capture(
+        self,
+        source: SnapshotSource,
+        previous: Optional[Dict[str, Any]],
+        touched_dirs: Set[Path],
+    ) -> Tuple[Dict[str, Any], int]:
+        mtime_ns: Optional[int] = None
+        data = source.data
+        if data is None:
+            if source.path is None:
+                raise ValueError(f"Snapshot source '{source.name}' has neither path nor data")
+            stat = source.path.stat()
+            mtime_ns = stat.st_mtime_ns
+            # `previous` comes from a snapshot pruning has not removed, so its chunks exist
+            if previous is not None and previous.get("size") == stat.st_size and previous.get("mtimeNs") == mtime_ns:
+                return dict(previous), 0
+            data = source.path.read_bytes()
+
+        digest = content_digest(data)
+        if previous is not None and previous.get("digest") == digest:
+            entry = dict(previous)
+            entry["mtimeNs"] = mtime_ns
+            return entry, 0
+
+        chunk_digests: List[str] = []
+        stored = 0
+        for chunk in split_chunks(data):
+            chunk_digest = content_digest(chunk)
+            chunk_digests.append(chunk_digest)
+            if self._find_blob(chunk_digest) is None:
+                packed, suffix = compress_blob(chunk)
+                blob = self._blob_path(chunk_digest, suffix)
+                blob.parent.mkdir(parents=True, exist_ok=True)
+                atomic_write_bytes(blob, packed)
+                touched_dirs.add(blob.parent)
+                stored += len(packed)
+        entry = {"name": source.name, "size": len(data), "mtimeNs": mtime_ns, "digest": digest, "chunks": chunk_digests}
+        return entry, stored
+
+    def snapshots(self, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Snapshot summaries (no file lists) from the index, newest first."""
+        with self._lock:
+            summaries = [
+                dict(summary, path=str(self._manifest_path(summary["id"])))
+                for summary in self._load_index().values()
+                if not kind or summary.get("kind") == kind
+            ]
+        summaries.sort(key=lambda item: item["created"], reverse=True)
+        return summaries
+
+    def usage(self) -> Dict[str, Any]:
+        """Snapshot count per kind and stored bytes (as recorded when each snapshot was taken)."""
+        with self._lock:
+            index = self._load_index()
+            kinds: Dict[str, int] = {}
+            for summary in index.values():
+                kinds[summary.get("kind", "")] = kinds.get(summary.get("kind", ""), 0) + 1
+            return {
+                "snapshots": len(index),
+                "kinds": kinds,
+                "storedBytes": sum(summary.get("storedBytes", 0) for summary in index.values()),
+            }
+
+    def has_snapshot(self, snapshot_id: str) -> bool:
+        return self._valid_id(snapshot_id) and self._manifest_path(snapshot_id).exists()
+
+    def manifest(self, snapshot_id: str) -> Dict[str, Any]:
+        """Full manifest, including each file's chunk list."""
+        if not self.has_snapshot(snapshot_id):
+            raise BackupError(f"Backup not found: {snapshot_id}")
+        return self._read_manifest_file(self._manifest_path(snapshot_id))
+
+    def read_file(self, entry: Mapping[str, Any]) -> bytes:
+        """Reassemble one manifest file entry and verify it against its digest."""
+        data = b"".join(self._iter_chunks(entry))
+        if content_digest(data) != entry.get("digest"):
+            raise BackupError(f"Backup data for {entry.get('name')} is corrupt")
+        return data
+
+    def restore(self, snapshot_id: str, destination: Path) -> int:
+        """Write every file of a snapshot under `destination`; returns the file count."""
+        manifest = self.manifest(snapshot_id)
+        count = 0
+        for entry in manifest.get("files") or []:
+            relative = PurePosixPath(entry["name"])
+            if relative.is_absolute() or ".." in relative.parts:
+                raise BackupError(f"Refusing to restore outside the target: {entry['name']}")
+            target = destination.joinpath(*relative.parts)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_bytes(target, self.read_file(entry))
+            count += 1
+        return count
+
+    def export_archive(self, snapshot_id: str, directory: Path) -> Path:
+        """Stream a snapshot into a compressed tar (`.tar.zst` with zstandard, else `.tar.gz`).
+
+        Files are fed to the archive chunk by chunk, so memory stays bounded by
+        one chunk whatever the snapshot size; the archive appears atomically.
+        """
+        manifest = self.manifest(snapshot_id)
+        directory.mkdir(parents=True, exist_ok=True)
+        suffix = ".tar.zst" if zstandard is not None else ".tar.gz"
+        target = directory / f"{snapshot_id}{suffix}"
+        created = datetime.fromisoformat(manifest["created"]).timestamp()
+        fd, temp_name = tempfile.mkstemp(dir=str(directory), prefix=f".{target.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw:
+                if zstandard is not None:
+                    with zstandard.ZstdCompressor(level=6).stream_writer(raw, closefd=False) as packed:
+                        self._write_tar(manifest, tarfile.open(fileobj=packed, mode="w|"), created)
+                else:
+                    self._write_tar(manifest, tarfile.open(fileobj=raw, mode="w|gz"), created)
+                raw.flush()
+                os.fsync(raw.fileno())
+            os.replace(temp_name, target)
+        except BaseException:
+            try:
+                os.unlink(temp_name)
+            except OSError:
+                pass
+            raise
+        return target
+
+    def _write_tar(self, manifest: Dict[str, Any], archive: tarfile.TarFile, created: float) -> None:
+        with archive:
+            for entry in manifest.get("files") or []:
+                info = tarfile.TarInfo(name=entry["name"])
+                info.size = entry["size"]
+                info.mtime = entry["mtimeNs"] / 1e9 if entry.get("mtimeNs") else created
+                archive.addfile(info, io.BufferedReader(_ChunkReader(self._iter_chunks(entry))))
+
+    def prune(self, policy: RetentionPolicy, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Drop snapshots the policy does not keep, then delete blobs nothing references.
+
+        When the surviving blobs exceed `policy.max_bytes`, the oldest snapshots
+        (never the newest of a kind) are dropped too until the store fits.
+        """
+        with self._lock:
+            index = self._load_index()
+            kept = select_kept(index.values(), policy, now)
+            newest: Dict[str, Tuple[str, str]] = {}
+            for summary in index.values():
+                kind = summary.get("kind", "")
+                if kind not in newest or summary["created"] > newest[kind][0]:
+                    newest[kind] = (summary["created"], summary["id"])
+            protected = {snapshot_id for _, snapshot_id in newest.values()}
+
+            blob_sizes = self._blob_sizes()
+            references: Dict[str, int] = {}
+            chunks_of: Dict[str, Set[str]] = {}
+            for snapshot_id in kept:
+                try:
+                    manifest = self._read_manifest_file(self._manifest_path(snapshot_id))
+                except (OSError, ValueError):
+                    continue
+                digests = {digest for entry in manifest.get("files") or [] for digest in entry.get("chunks") or []}
+                chunks_of[snapshot_id] = digests
+                for digest in digests:
+                    references[digest] = references.get(digest, 0) + 1
+            live_bytes = sum(blob_sizes.get(digest, (0, ""))[0] for digest in references)
+
+            removed = [snapshot_id for snapshot_id in index if snapshot_id not in chunks_of]
+            if policy.max_bytes is not None and live_bytes > policy.max_bytes:
+                oldest_first = sorted(
+                    (snapshot_id for snapshot_id in chunks_of if snapshot_id not in protected),
+                    key=lambda snapshot_id: index[snapshot_id]["created"],
+                )
+                for snapshot_id in oldest_first:
+                    if live_bytes <= policy.max_bytes:
+                        break
+                    for digest in chunks_of.pop(snapshot_id):
+                        references[digest] -= 1
+                        if references[digest] == 0:
+                            del references[digest]
+                            live_bytes -= blob_sizes.get(digest, (0, ""))[0]
+                    removed.append(snapshot_id)
+
+            for snapshot_id in removed:
+                try:
+                    self._manifest_path(snapshot_id).unlink()
+                except FileNotFoundError:
+                    pass
+                index.pop(snapshot_id, None)
+            freed = 0
+            removed_blobs = 0
+            for digest, (size, suffix) in blob_sizes.items():
+                if digest in references:
+                    continue
+                try:
+                    self._blob_path(digest, suffix).unlink()
+                except FileNotFoundError:
+                    continue
+                freed += size
+                removed_blobs += 1
+            self._write_index()
+            self._latest.clear()
+            return {
+                "removedSnapshots": len(removed),
+                "removedBlobs": removed_blobs,
+                "freedBytes": freed,
+                "storedBytes": live_bytes,
+                "snapshots": len(index),
+            }
+
+    def _iter_chunks(self, entry: Mapping[str, Any]) -> Iterator[bytes]:
+        for digest in entry.get("chunks") or []:
+            found = self._find_blob(digest)
+            if found is None:
+                raise BackupError(f"Backup data missing for {entry.get('name')}")
+            path, suffix = found
+            yield decompress_blob(path.read_bytes(), suffix)
+
+    def _blob_sizes(self) -> Dict[str, Tuple[int, str]]:
+        """digest -> (bytes on disk, suffix) for every blob in the store."""
+        sizes: Dict[str, Tuple[int, str]] = {}
+        if not self._objects.exists():
+            return sizes
+        with os.scandir(self._objects) as prefixes:
+            for prefix in prefixes:
+                if not prefix.is_dir():
+                    continue
+                with os.scandir(prefix.path) as blobs:
+                    for blob in blobs:
+                        if blob.name.startswith("."):
+                            continue
+                        stem, _, extension = blob.name.partition(".")
+                        sizes[prefix.name + stem] = (blob.stat().st_size, f".{extension}" if extension else "")
+        return sizes
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        """Summaries by id, from index.jsonl; rebuilt from the manifests if it is missing or out of step."""
+        if self._index is not None:
+            return self._index
+        index: Dict[str, Dict[str, Any]] = {}
+        names: Set[str] = set()
+        if self._snapshots.exists():
+            with os.scandir(self._snapshots) as entries:
+                names = {entry.name[:-5] for entry in entries if entry.name.endswith(".json")}
+            try:
+                with open(self._snapshots / INDEX_NAME, encoding="utf-8") as handle:
+                    for line in handle:
+                        if line.strip():
+                            summary = json.loads(line)
+                            index[summary["id"]] = summary
+            except (OSError, ValueError, KeyError, TypeError):
+                index = {}
+        self._index = index
+        if set(index) != names:
+            index.clear()
+            for name in names:
+                try:
+                    index[name] = self._summary(self._read_manifest_file(self._manifest_path(name)))
+                except (OSError, ValueError):
+                    continue
+            self._write_index()
+        return index
+
+    def _write_index(self) -> None:
+        if not self._snapshots.exists():
+            return
+        lines = "".join(json.dumps(summary, separators=(",", ":")) + "\n" for summary in (self._index or {}).values())
+        atomic_write_text(self._snapshots / INDEX_NAME, lines)
+
+    @staticmethod
+    def _summary(manifest: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "id": manifest["id"],
+            "kind": manifest.get("kind", ""),
+            "created": manifest.get("created", ""),
+            "note": manifest.get("note", ""),
+            "files": len(manifest.get("files") or []),
+            "totalBytes": manifest.get("totalBytes", 0),
+            "storedBytes": manifest.get("storedBytes", 0),
+        }
+
+    def _latest_entries(self, kind: str) -> Dict[str, Dict[str, Any]]:
+        if kind not in self._latest:
+            latest = [summary for summary in self._load_index().values() if summary.get("kind") == kind]
+            entries: Dict[str, Dict[str, Any]] = {}
+            if latest:
+                newest = max(latest, key=lambda summary: summary["created"])
+                try:
+                    manifest = self._read_manifest_file(self._manifest_path(newest["id"]))
+                    entries = {entry["name"]: entry for entry in manifest.get("files") or []}
+                except (OSError, ValueError):
+                    entries = {}
+            self._latest[kind] = entries
+        return self._latest[kind]
+
+    def _blob_path(self, digest: str, suffix: str = "") -> Path:
+        return self._objects / digest[:2] / f"{digest[2:]}{suffix}"
+
+    def _find_blob(self, digest: str) -> Optional[Tuple[Path, str]]:
+        for suffix in BLOB_SUFFIXES:
+            path = self._blob_path(digest, suffix)
+            if path.exists():
+                return path, suffix
+        return None
+
+    def _manifest_path(self, snapshot_id: str) -> Path:
+        return self._snapshots / f"{snapshot_id}.json"
+
+    @staticmethod
+    def _valid_id(snapshot_id: str) -> bool:
+        return bool(snapshot_id) and "/" not in snapshot_id and "\\" not in snapshot_id and not snapshot_id.startswith(".")
+
+    @staticmethod
+    def _read_manifest_file(path: Path) -> Dict[str, Any]:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+        if not isinstance(manifest, dict) or "id" not in manifest:
+            raise ValueError(f"Invalid manifest {path.name}")
+        return manifest
+
+
+class _ChunkReader(io.RawIOBase):
+    """Read-only file object over a chunk iterator, for streaming into tarfile."""
+
+    def __init__(self, chunks: Iterator[bytes]) -> None:
+        self._chunks = chunks
+        self._buffer = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, target: Any) -> int:
+        while not self._buffer:
+            try:
+                self._buffer = next(self._chunks)
+            except StopIteration:
+                return 0
+        size = min(len(target), len(self._buffer))
+        target[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+
+"""
+CHANGELOG
+2026-10-18 Codex
+- Added BackupStore: content-addressed chunk blobs plus per-snapshot manifests so backups store unchanged files once and edits cost only the changed chunks.
+2026-10-18 Codex
+- Blobs are compressed (zstandard when installed, else zlib), listing reads an index.jsonl instead of every manifest, prune() applies a RetentionPolicy with a size cap and garbage-collects blobs, and export_archive streams a snapshot into a .tar.zst/.tar.gz.
+"""
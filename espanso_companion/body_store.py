@@ -0,0 +1,189 @@
+"""Spill file for long `replace` bodies: the cache keeps a preview and a content-hash reference."""
+
+from __future__ import annotations
+
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Optional, Tuple
+
+DEFAULT_THRESHOLD = 2048  # characters; shorter bodies stay in memory
+PREVIEW_CHARS = 160
+
+
+class LazyBody:
+    """Reference to a body held in a BodyStore: its digest, length and a short preview."""
+
+    __slots__ = ("digest", "length", "preview")
+
+    def __init__(self, digest: str, length: int, preview: str) -> None:
+        self.digest = digest
+        self.length = length
+        self.preview = preview
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, LazyBody) and other.digest == self.digest
+
+    def __hash__(self) -> int:
+        return hash(self.digest)
+
+    def __repr__(self) -> str:
+        return f"LazyBody({self.digest[:12]}, {self.length} chars)"
+
+    def __getstate__(self) -> Tuple[str, int, str]:
+        return (self.digest, self.length, self.preview)
+
+    def __setstate__(self, state: Tuple[str, int, str]) -> None:
+        self.digest, self.length, self.preview = state
+
+
+class BodyStore:
+    """Moves bodies longer than `threshold` characters out of the snippet cache.
+
+    Bodies are appended once per distinct content to an anonymous temp file and
+    read back on demand through a small LRU (`cache_bytes`). The file is rewritten
+    with only the live bodies once it grows past twice what was live at the last
+    compaction. `threshold=0` disables spilling.
+    """
+
+    def __init__(
+        self,
+        threshold: int = DEFAULT_THRESHOLD,
+        *,
+        directory: Optional[Path] = None,
+        cache_bytes: int = 4 * 1024 * 1024,
+        preview_chars: int = PREVIEW_CHARS,
+        min_compact_bytes: int = 8 * 1024 * 1024,
+    ) -> None:
+        self.threshold = max(0, threshold)
+        self._directory = directory
+        self._cache_bytes = cache_bytes
+        self._preview_chars = preview_chars
+        self._min_compact_bytes = min_compact_bytes
+        self._lock = threading.RLock()
+        self._file: Optional[IO[bytes]] = None
+        self._size = 0
+        self._offsets: Dict[str, Tuple[int, int]] = {}
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._cached_bytes = 0
+        self._live_after_compaction = 0
+        self._reads = 0
+        self._hits = 0
+
+    def spill(self, records: Iterable[Any]) -> int:
+        """Swap each record's long `replace` string for a LazyBody; returns how many moved."""
+        if not self.threshold:
+            return 0
+        moved = 0
+        for record in records:
+            body = record.replace
+            if isinstance(body, str) and len(body) > self.threshold:
+                record.replace = self.put(body)
+                moved += 1
+        return moved
+
+    def put(self, text: str) -> LazyBody:
+        data = text.encode("utf-8")
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        with self._lock:
+            if digest not in self._offsets:
+                handle = self._handle()
+                handle.seek(self._size)
+                handle.write(data)
+                self._offsets[digest] = (self._size, len(data))
+                self._size += len(data)
+        return LazyBody(digest, len(text), text[: self._preview_chars])
+
+    def text(self, body: Any) -> Any:
+        """The full text of `body` (strings pass through unchanged)."""
+        if not isinstance(body, LazyBody):
+            return body
+        with self._lock:
+            self._reads += 1
+            cached = self._cache.get(body.digest)
+            if cached is not None:
+                self._hits += 1
+                self._cache.move_to_end(body.digest)
+                return cached
+            location = self._offsets.get(body.digest)
+            if location is None or self._file is None:
+                raise KeyError(f"Body {body.digest} is not in the store")
+            offset, size = location
+            self._file.seek(offset)
+            text = self._file.read(size).decode("utf-8")
+            self._remember(body.digest, text, size)
+            return text
+
+    def needs_compaction(self) -> bool:
+        with self._lock:
+            return self._size > max(self._min_compact_bytes, 2 * self._live_after_compaction)
+
+    def compact(self, live: Iterable[LazyBody]) -> None:
+        """Rewrite the spill file keeping only the bodies in `live`."""
+        with self._lock:
+            if self._file is None:
+                return
+            keep = {body.digest for body in live if body.digest in self._offsets}
+            replacement = self._open()
+            offsets: Dict[str, Tuple[int, int]] = {}
+            position = 0
+            for digest in keep:
+                offset, size = self._offsets[digest]
+                self._file.seek(offset)
+                replacement.write(self._file.read(size))
+                offsets[digest] = (position, size)
+                position += size
+            self._file.close()
+            self._file = replacement
+            self._offsets = offsets
+            self._size = position
+            self._live_after_compaction = position
+            for digest in [digest for digest in self._cache if digest not in offsets]:
+                self._cached_bytes -= len(self._cache.pop(digest).encode("utf-8"))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "threshold": self.threshold,
+                "bodies": len(self._offsets),
+                "fileBytes": self._size,
+                "cachedBytes": self._cached_bytes,
+                "reads": self._reads,
+                "cacheHits": self._hits,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+            self._file = None
+            self._offsets.clear()
+            self._cache.clear()
+            self._cached_bytes = 0
+            self._size = 0
+
+    def _handle(self) -> IO[bytes]:
+        if self._file is None:
+            self._file = self._open()
+        return self._file
+
+    def _open(self) -> IO[bytes]:
+        return tempfile.TemporaryFile(prefix="espanso-bodies-", dir=self._directory)
+
+    def _remember(self, digest: str, text: str, size: int) -> None:
+        if size > self._cache_bytes:
+            return
+        self._cache[digest] = text
+        self._cached_bytes += size
+        while self._cached_bytes > self._cache_bytes:
+            _, evicted = self._cache.popitem(last=False)
+            self._cached_bytes -= len(evicted.encode("utf-8"))
+
+
+"""
+CHANGELOG
+2026-10-18 Codex
+- Added BodyStore/LazyBody so long replace bodies live in a temp spill file (deduplicated by hash, read through an LRU) instead of the snippet cache.
+"""
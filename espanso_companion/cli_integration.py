@@ -7,10 +7,51 @@ import os
 import platform
 import shutil
 import subprocess
+import threading
+import time
 from pathlib import Path
 from subprocess import CompletedProcess
 from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
+from .cli_jobs import CliJobRunner
+
+
+# Seconds a read-only command's output may be reused, keyed by leading arguments
+READ_ONLY_TTLS: Dict[Tuple[str, ...], float] = {
+    ("status",): 2.0,
+    ("--version",): 300.0,
+    ("path",): 60.0,
+    ("package", "list"): 30.0,
+    ("service", "check"): 10.0,
+    ("log",): 2.0,
+}
+
+FAILURE_TTL = 2.0
+
+# Commands that change daemon, package or service state; running one drops every cached result
+MUTATING_COMMANDS: Tuple[Tuple[str, ...], ...] = (
+    ("start",),
+    ("stop",),
+    ("restart",),
+    ("package",),
+    ("service",),
+    ("install",),
+    ("uninstall",),
+)
+
+
+def _matches_prefix(args: Tuple[str, ...], prefix: Tuple[str, ...]) -> bool:
+    return args[: len(prefix)] == prefix
+
+
+class _Flight:
+    """One in-progress subprocess that concurrent identical calls wait on."""
+
+    def __init__(self, generation: int) -> None:
+        self.generation = generation  # cache generation the command started in
+        self.done = threading.Event()
+        self.result: Optional[CompletedProcess] = None
+
 
 class EspansoCLI:
     """Encapsulates espanso CLI commands for reuse in Streamlit."""
@@ -21,6 +62,32 @@ class EspansoCLI:
         self._espanso_exe: Optional[str] = None  # Cache for espanso executable path
         self._config_dir: Optional[Path] = None
         self._command_prefix: List[str] = []
+        self._cache: Dict[Tuple[Any, ...], Tuple[float, CompletedProcess]] = {}
+        self._inflight: Dict[Tuple[Any, ...], _Flight] = {}
+        self._cache_lock = threading.Lock()
+        self._generation = 0  # bumped by every invalidation; older reads are not cached
+        self._jobs: Optional[CliJobRunner] = None
+
+    @staticmethod
+    def cache_ttl(args: Sequence[str]) -> Optional[float]:
+        """TTL for a read-only command, or None when its output must not be reused."""
+        key = tuple(args)
+        for prefix, ttl in READ_ONLY_TTLS.items():
+            if _matches_prefix(key, prefix):
+                return ttl
+        return None
+
+    @staticmethod
+    def is_mutating(args: Sequence[str]) -> bool:
+        key = tuple(args)
+        if EspansoCLI.cache_ttl(key) is not None:
+            return False
+        return any(_matches_prefix(key, prefix) for prefix in MUTATING_COMMANDS)
+
+    def invalidate_cache(self) -> None:
+        with self._cache_lock:
+            self._generation += 1
+            self._cache.clear()
 
     def _find_espanso_executable(self) -> str:
         """
@@ -70,17 +137,99 @@ class EspansoCLI:
         args: Sequence[str],
         cwd: Optional[Path] = None,
         capture_output: bool = True,
+        *,
+        fresh: bool = False,
     ) -> subprocess.CompletedProcess:
-        """Run a command and return the CompletedProcess for inspection."""
+        """Run a command and return the CompletedProcess for inspection.
+
+        Read-only commands (see READ_ONLY_TTLS) are served from a short-lived cache and
+        concurrent identical calls share one subprocess; `fresh=True` skips both and
+        always runs the command. Mutating commands drop the whole cache before and after
+        they run, and a read that was already running when they did is not cached.
+        """
+        ttl = self.cache_ttl(args) if capture_output else None
+        if ttl is None:
+            if self.is_mutating(args):
+                self.invalidate_cache()
+                try:
+                    return self._execute(args, cwd, capture_output)
+                finally:
+                    self.invalidate_cache()
+            return self._execute(args, cwd, capture_output)
+
+        key = (tuple(args), str(cwd) if cwd else None, str(self._config_dir) if self._config_dir else None)
+        with self._cache_lock:
+            generation = self._generation
+            cached = self._cache.get(key)
+            if cached is not None and not fresh:
+                # Failures are only reused briefly so e.g. a fresh install is noticed quickly
+                lifetime = ttl if cached[1].returncode == 0 else min(ttl, FAILURE_TTL)
+                if time.monotonic() - cached[0] < lifetime:
+                    return cached[1]
+            flight = self._inflight.get(key)
+            # A flight from before the last mutation may report the old state; start a new one
+            leader = fresh or flight is None or flight.generation != generation
+            if leader:
+                flight = self._inflight[key] = _Flight(generation)
+        if not leader:
+            flight.done.wait()
+            if flight.result is not None:
+                return flight.result
+            return self._execute(args, cwd, capture_output)
+
+        result: Optional[CompletedProcess] = None
         try:
-            # Get the actual executable path (handles Windows .cmd -> .exe resolution)
-            espanso_exe = self._find_espanso_executable()
-            cmd = [*self._command_prefix, espanso_exe, *args]
+            result = self._execute(args, cwd, capture_output)
+            return result
+        finally:
+            with self._cache_lock:
+                if self._inflight.get(key) is flight:
+                    self._inflight.pop(key)
+                if result is not None and result.returncode != 124 and self._generation == generation:
+                    self._cache[key] = (time.monotonic(), result)
+            flight.result = result
+            flight.done.set()
+
+    def build_command(self, args: Sequence[str]) -> Tuple[List[str], Optional[Dict[str, str]]]:
+        """Resolve the argv and environment for an espanso command (raises FileNotFoundError)."""
+        # Get the actual executable path (handles Windows .cmd -> .exe resolution)
+        espanso_exe = self._find_espanso_executable()
+        cmd = [*self._command_prefix, espanso_exe, *args]
+
+        env = None
+        if self._config_dir:
+            env = os.environ.copy()
+            env["ESPANSO_CONFIG_DIR"] = str(self._config_dir)
+        return cmd, env
+
+    def submit(self, args: Sequence[str]) -> Dict[str, Any]:
+        """Start `args` as a background job and return its initial state (see CliJobRunner)."""
+        mutating = self.is_mutating(args)
+        if mutating:
+            self.invalidate_cache()
+        job = self.jobs.submit(args, on_finish=(lambda _job: self.invalidate_cache()) if mutating else None)
+        return job.to_dict()
 
-            env = None
-            if self._config_dir:
-                env = os.environ.copy()
-                env["ESPANSO_CONFIG_DIR"] = str(self._config_dir)
+    def close(self) -> None:
+        """Cancel any background jobs still running (their process trees are killed)."""
+        if self._jobs is not None:
+            self._jobs.shutdown()
+
+    @property
+    def jobs(self) -> CliJobRunner:
+        with self._cache_lock:
+            if self._jobs is None:
+                self._jobs = CliJobRunner(self.build_command)
+            return self._jobs
+
+    def _execute(
+        self,
+        args: Sequence[str],
+        cwd: Optional[Path],
+        capture_output: bool,
+    ) -> subprocess.CompletedProcess:
+        try:
+            cmd, env = self.build_command(args)
 
             # Run directly without shell - works cross-platform
             result = self._runner(
@@ -110,9 +259,9 @@ class EspansoCLI:
                 stderr=f"Command timed out after {self.timeout} seconds: {exc}"
             )
 
-    def status(self) -> Dict[str, Any]:
+    def status(self, fresh: bool = False) -> Dict[str, Any]:
         """Return parsed output for `espanso status` to show install/daemon info."""
-        result = self.run(["status"])
+        result = self.run(["status"], fresh=fresh)
         return {
             "returncode": result.returncode,
             "stdout": result.stdout.strip(),
@@ -167,6 +316,7 @@ class EspansoCLI:
 
     def set_config_dir(self, config_dir: Path) -> None:
         self._config_dir = config_dir
+        self.invalidate_cache()
 
 def synthesize_conversation(commands: Iterable[Tuple[str, Sequence[str]]]) -> List[Dict[str, Any]]:
     """Utility for building CLI timeline data, useful for analytics wiring."""
@@ -184,4 +334,10 @@ CHANGELOG
 - Updated Windows resolution to prefer espanso.exe over espansod.exe to avoid UnknownArgument errors.
 2025-11-14 Codex
 - Reinstated environment-driven config overrides and wrapper support to prevent regressions on daemon-only installs.
+2026-10-18 Codex
+- Added a TTL cache with single-flight deduplication for read-only commands; mutating commands invalidate it.
+2026-10-18 Codex
+- Added build_command/submit so long commands can run as background jobs (CliJobRunner) without blocking the bridge.
+2026-10-18 Codex
+- Cache generations: a read that overlaps a mutating command is neither cached nor joined by later callers; `fresh=True` also skips in-flight sharing.
 """
@@ -0,0 +1,279 @@
+"""Background execution of long-running espanso CLI commands as pollable jobs."""
+
+from __future__ import annotations
+
+import os
+import signal
+import subprocess
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Jobs of one class run at most this many at a time; the rest wait in "queued"
+DEFAULT_CLASS_LIMITS: Dict[str, int] = {
+    "package": 1,
+    "service": 1,
+    "doctor": 1,
+    "default": 2,
+}
+
+ACTIVE_STATES = ("queued", "running")
+
+CommandBuilder = Callable[[Sequence[str]], Tuple[List[str], Optional[Dict[str, str]]]]
+
+
+def command_class(args: Sequence[str]) -> str:
+    """Bucket a command for concurrency limits (package/service/doctor/default)."""
+    head = args[0] if args else ""
+    if head in ("package", "install", "uninstall"):
+        return "package"
+    if head in ("service", "start", "stop", "restart"):
+        return "service"
+    if head == "doctor":
+        return "doctor"
+    return "default"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+@dataclass
+class CliJob:
+    id: str
+    args: List[str]
+    command_class: str
+    state: str = "queued"
+    returncode: Optional[int] = None
+    created: str = field(default_factory=_now)
+    started: Optional[str] = None
+    finished: Optional[str] = None
+    chunks: List[Tuple[str, str]] = field(default_factory=list)
+    process: Optional[subprocess.Popen] = None
+    cancel_requested: bool = False
+
+    def to_dict(self, cursor: int = 0) -> Dict[str, Any]:
+        cursor = max(0, min(cursor, len(self.chunks)))
+        return {
+            "id": self.id,
+            "args": list(self.args),
+            "commandClass": self.command_class,
+            "state": self.state,
+            "done": self.state not in ACTIVE_STATES,
+            "returncode": self.returncode,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "chunks": [{"stream": stream, "text": text} for stream, text in self.chunks[cursor:]],
+            "cursor": len(self.chunks),
+        }
+
+    def output(self, stream: str) -> str:
+        return "".join(text for name, text in self.chunks if name == stream)
+
+
+def kill_process_tree(process: subprocess.Popen, grace: float = 3.0) -> None:
+    """Terminate `process` and everything it spawned (its own process group/session)."""
+    if process.poll() is not None:
+        return
+    try:
+        if os.name == "nt":
+            subprocess.run(
+                ["taskkill", "/F", "/T", "/PID", str(process.pid)],
+                capture_output=True,
+                check=False,
+            )
+        else:
+            os.killpg(process.pid, signal.SIGTERM)
+            try:
+                process.wait(timeout=grace)
+            except subprocess.TimeoutExpired:
+                os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError, OSError):
+        process.kill()
+
+
+class CliJobRunner:
+    """Starts commands on worker threads and keeps their streamed output for polling.
+
+    Each job runs in its own process group so cancellation or a timeout kills
+    helper processes too. Finished jobs are kept (up to `max_finished`) so the UI
+    can fetch the tail of the output after completion.
+    """
+
+    def __init__(
+        self,
+        build_command: CommandBuilder,
+        *,
+        limits: Optional[Dict[str, int]] = None,
+        timeout: Optional[float] = 600.0,
+        max_finished: int = 50,
+    ) -> None:
+        self._build_command = build_command
+        self._limits = dict(DEFAULT_CLASS_LIMITS, **(limits or {}))
+        self._slots = {name: threading.BoundedSemaphore(max(1, limit)) for name, limit in self._limits.items()}
+        self._timeout = timeout
+        self._max_finished = max_finished
+        self._jobs: "OrderedDict[str, CliJob]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        args: Sequence[str],
+        on_finish: Optional[Callable[[CliJob], None]] = None,
+    ) -> CliJob:
+        job = CliJob(id=uuid.uuid4().hex[:12], args=list(args), command_class=command_class(args))
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        thread = threading.Thread(target=self._run, args=(job, on_finish), name=f"espanso-job-{job.id}", daemon=True)
+        thread.start()
+        return job
+
+    def get(self, job_id: str) -> Optional[CliJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def snapshot(self, job_id: str, cursor: int = 0) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.to_dict(cursor) if job is not None else None
+
+    def jobs(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [job.to_dict(len(job.chunks)) for job in reversed(self._jobs.values())]
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[CliJob]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is None or job.state not in ACTIVE_STATES:
+                return job
+            if deadline is not None and time.monotonic() >= deadline:
+                return job
+            time.sleep(0.05)
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued job or kill a running one (with its children); False if already done."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.state not in ACTIVE_STATES:
+                return False
+            job.cancel_requested = True
+            process = job.process
+        if process is not None:
+            kill_process_tree(process)
+        return True
+
+    def shutdown(self) -> None:
+        with self._lock:
+            active = [job.id for job in self._jobs.values() if job.state in ACTIVE_STATES]
+        for job_id in active:
+            self.cancel(job_id)
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.state not in ACTIVE_STATES]
+        for job_id in finished[: max(0, len(finished) - self._max_finished)]:
+            del self._jobs[job_id]
+
+    def _append(self, job: CliJob, stream: str, text: str) -> None:
+        with self._lock:
+            job.chunks.append((stream, text))
+
+    def _finish(self, job: CliJob, state: str, returncode: Optional[int]) -> None:
+        with self._lock:
+            job.state = state
+            job.returncode = returncode
+            job.finished = _now()
+            job.process = None
+
+    def _pump(self, job: CliJob, stream_name: str, pipe: Any) -> None:
+        try:
+            for line in iter(pipe.readline, ""):
+                self._append(job, stream_name, line)
+        except (OSError, ValueError):
+            pass
+        finally:
+            pipe.close()
+
+    def _run(self, job: CliJob, on_finish: Optional[Callable[[CliJob], None]]) -> None:
+        slot = self._slots.get(job.command_class, self._slots["default"])
+        with slot:
+            if job.cancel_requested:
+                self._finish(job, "cancelled", None)
+            else:
+                self._execute(job)
+        if on_finish is not None:
+            try:
+                on_finish(job)
+            except Exception as exc:
+                print(f"[ERROR] CLI job callback failed: {exc}", flush=True)
+
+    def _execute(self, job: CliJob) -> None:
+        try:
+            command, env = self._build_command(job.args)
+            options: Dict[str, Any] = {}
+            if os.name == "nt":
+                options["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+            else:
+                options["start_new_session"] = True
+            process = subprocess.Popen(
+                command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                stdin=subprocess.DEVNULL,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+                bufsize=1,
+                env=env,
+                **options,
+            )
+        except (OSError, ValueError) as exc:
+            self._append(job, "stderr", f"espanso not available: {exc}")
+            self._finish(job, "failed", 1)
+            return
+
+        with self._lock:
+            job.process = process
+            job.state = "running"
+            job.started = _now()
+            cancelled_early = job.cancel_requested
+        if cancelled_early:
+            kill_process_tree(process)
+
+        pumps = [
+            threading.Thread(target=self._pump, args=(job, "stdout", process.stdout), daemon=True),
+            threading.Thread(target=self._pump, args=(job, "stderr", process.stderr), daemon=True),
+        ]
+        for pump in pumps:
+            pump.start()
+        timed_out = False
+        try:
+            process.wait(timeout=self._timeout)
+        except subprocess.TimeoutExpired:
+            timed_out = True
+            kill_process_tree(process)
+            process.wait()
+        for pump in pumps:
+            pump.join(timeout=1)
+
+        if job.cancel_requested:
+            state = "cancelled"
+        elif timed_out:
+            self._append(job, "stderr", f"Command timed out after {self._timeout} seconds")
+            state = "timeout"
+        else:
+            state = "succeeded" if process.returncode == 0 else "failed"
+        self._finish(job, state, process.returncode)
+
+
+"""
+CHANGELOG
+2026-10-18 Codex
+- Added CliJobRunner: espanso commands as background jobs with streamed output, per-class concurrency limits and process-tree cancellation.
+"""
@@ -6,6 +6,7 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
+from .workspace_index import WorkspaceIndex
 from .yaml_processor import YamlProcessor
 
 
@@ -41,10 +42,12 @@ class ConfigTreeBuilder:
         config_root: Path,
         match_root: Path,
         yaml_processor: Optional[YamlProcessor] = None,
+        workspace_index: Optional[WorkspaceIndex] = None,
     ):
         self._config_root = config_root
         self._match_root = match_root
         self._yaml = yaml_processor or YamlProcessor()
+        self._index = workspace_index or WorkspaceIndex([config_root, match_root])
 
     def describe(self) -> Dict[str, Any]:
         """Return directory trees plus import diagnostics."""
@@ -115,11 +118,7 @@ class ConfigTreeBuilder:
         }
 
     def _iter_yaml_files(self) -> Iterable[Path]:
-        for root in (self._config_root, self._match_root):
-            if not root.exists():
-                continue
-            yield from root.rglob("*.yml")
-            yield from root.rglob("*.yaml")
+        return self._index.files()
 
     @staticmethod
     def _extract_import_entries(data: Dict[str, Any]) -> List[str]:
@@ -189,4 +188,6 @@ class ConfigTreeBuilder:
 CHANGELOG
 2025-11-14 Codex
 - Added ConfigTreeBuilder to describe directory trees, import edges, and cycle diagnostics for Espanso configs.
+2026-10-18 Codex
+- Sourced import-graph files from the shared WorkspaceIndex instead of two rglob passes per root.
 """
@@ -0,0 +1,160 @@
+"""Backend → webview push channel: coalesced, sequence-numbered event batches."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+RECEIVER = "window.espansoEvents"
+
+Merge = Callable[[Any, Any], Any]
+
+
+class EventChannel:
+    """Collects events published from any thread and delivers them in batches.
+
+    Events with the same `(kind, key)` published before a batch goes out are
+    coalesced (the newer payload wins, or `merge(old, new)` combines them).
+    Every delivered event gets a sequence number and is kept in a bounded
+    backlog, so a receiver that notices a gap can ask for what it missed via
+    `since()` or resync from scratch when the backlog no longer reaches back.
+    Nothing is pushed until a sender is attached and the page has subscribed.
+    """
+
+    def __init__(self, *, interval: float = 0.05, backlog: int = 500) -> None:
+        self._interval = interval
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()  # keeps batches in sequence order across threads
+        self._pending: Dict[Tuple[str, Optional[str]], Dict[str, Any]] = {}
+        self._backlog: Deque[Dict[str, Any]] = deque(maxlen=backlog)
+        self._seq = 0
+        self._send: Optional[Callable[[str], Any]] = None
+        self._live = False
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._due: Optional[float] = None
+        self._delivered = 0
+        self._failures = 0
+
+    def attach(self, send: Optional[Callable[[str], Any]]) -> None:
+        """Set the function that evaluates JavaScript in the page (e.g. `window.evaluate_js`)."""
+        with self._condition:
+            self._send = send
+            if send is None:
+                self._live = False
+
+    def subscribe(self) -> int:
+        """The page's receiver is installed; returns the last sequence number it can assume."""
+        self.flush()
+        with self._condition:
+            self._live = True
+            return self._seq
+
+    def start(self) -> None:
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="espanso-event-channel", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=1)
+        self._thread = None
+
+    def publish(self, kind: str, data: Any, *, key: Optional[str] = None, merge: Optional[Merge] = None) -> None:
+        with self._condition:
+            slot = (kind, key)
+            previous = self._pending.pop(slot, None)
+            if previous is not None and merge is not None:
+                data = merge(previous["data"], data)
+            # Re-inserting keeps delivery in order of the latest publish
+            self._pending[slot] = {"kind": kind, "key": key, "data": data}
+            if self._due is None:
+                self._due = time.monotonic() + self._interval
+                self._condition.notify_all()
+
+    def since(self, seq: int) -> Dict[str, Any]:
+        """Events after `seq` still in the backlog; `resync` when some were already dropped."""
+        self.flush()
+        with self._condition:
+            events = [event for event in self._backlog if event["seq"] > seq]
+            oldest = self._backlog[0]["seq"] if self._backlog else self._seq + 1
+            resync = seq > self._seq or (seq < self._seq and seq + 1 < oldest)
+            return {"events": events, "seq": self._seq, "resync": resync}
+
+    def flush(self) -> int:
+        """Number and deliver everything pending now; returns how many events went out."""
+        with self._flush_lock:
+            with self._condition:
+                batch = self._take_pending()
+                send = self._send if self._live else None
+            if not batch:
+                return 0
+            if send is not None:
+                script = f"{RECEIVER} && {RECEIVER}.receive({json.dumps(batch, default=str)})"
+                try:
+                    send(script)
+                except Exception as exc:
+                    with self._condition:
+                        self._failures += 1
+                    print(f"[ERROR] Event push failed: {exc}", flush=True)
+            return len(batch["events"])
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                "seq": self._seq,
+                "pending": len(self._pending),
+                "live": self._live,
+                "delivered": self._delivered,
+                "failures": self._failures,
+            }
+
+    def _take_pending(self) -> Optional[Dict[str, Any]]:
+        self._due = None
+        if not self._pending:
+            return None
+        at = datetime.now(timezone.utc).isoformat()
+        events: List[Dict[str, Any]] = []
+        for event in self._pending.values():
+            self._seq += 1
+            event = {"seq": self._seq, "at": at, **event}
+            self._backlog.append(event)
+            events.append(event)
+        self._pending.clear()
+        self._delivered += len(events)
+        return {"first": events[0]["seq"], "last": events[-1]["seq"], "events": events}
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while self._running:
+                    now = time.monotonic()
+                    if self._due is not None and now >= self._due:
+                        break
+                    self._condition.wait(timeout=None if self._due is None else self._due - now)
+                if not self._running:
+                    return
+            try:
+                self.flush()
+            except Exception as exc:
+                print(f"[ERROR] Event channel flush failed: {exc}", flush=True)
+
+
+"""
+CHANGELOG
+2026-10-18 Codex
+- Added EventChannel and snippet deltas so the backend pushes coalesced, sequence-numbered changes to the webview instead of the UI polling.
+2026-10-18 Codex
+- Snippet deltas moved to snippet_revisions (revision-based change sets shared with get_snippet_changes).
+"""
@@ -4,8 +4,8 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from queue import Empty, Queue
-from typing import Callable, List
+from queue import Empty, Full, Queue
+from typing import Callable, List, Optional
 
 from watchdog.events import FileSystemEvent, FileSystemEventHandler
 from watchdog.observers import Observer
@@ -16,40 +16,52 @@ class WatchEvent:
     src_path: Path
     event_type: str
     is_directory: bool
+    dest_path: Optional[Path] = None
 
 
 class _EventHandler(FileSystemEventHandler):
-    def __init__(self, queue: Queue):
+    def __init__(self, queue: Queue, callbacks: List[Callable[[WatchEvent], None]]):
         super().__init__()
         self._queue = queue
+        self._callbacks = callbacks
 
     def on_any_event(self, event: FileSystemEvent) -> None:
         """Handle filesystem events with error protection."""
         try:
             if not event.src_path:
                 return
-            self._queue.put(
-                WatchEvent(
-                    src_path=Path(event.src_path),
-                    event_type=event.event_type,
-                    is_directory=event.is_directory,
-                )
+            dest_path = getattr(event, "dest_path", "")
+            watch_event = WatchEvent(
+                src_path=Path(event.src_path),
+                event_type=event.event_type,
+                is_directory=event.is_directory,
+                dest_path=Path(dest_path) if dest_path else None,
             )
         except Exception:
             # Silently ignore errors in event handler to prevent watcher thread crash
             # This can happen with invalid paths, permissions issues, etc.
+            return
+        try:
+            self._queue.put_nowait(watch_event)
+        except Full:
+            # Nobody is polling; callbacks still receive every event
             pass
+        for callback in list(self._callbacks):
+            try:
+                callback(watch_event)
+            except Exception:
+                pass
 
 
 class FileWatcher:
     """Observes directories and exposes pending events for polling."""
 
     def __init__(self, paths: List[Path]) -> None:
-        self._queue: Queue = Queue()
+        self._queue: Queue = Queue(maxsize=1000)
         self._observer = Observer()
-        self._handler = _EventHandler(self._queue)
-        self._paths = paths
         self._callbacks: List[Callable[[WatchEvent], None]] = []
+        self._handler = _EventHandler(self._queue, self._callbacks)
+        self._paths = paths
 
     def start(self) -> None:
         for path in self._paths:
@@ -61,6 +73,7 @@ class FileWatcher:
         self._observer.join(timeout=1)
 
     def register_callback(self, callback: Callable[[WatchEvent], None]) -> None:
+        """Invoke `callback` on the observer thread for every event."""
         self._callbacks.append(callback)
 
     def poll(self) -> List[WatchEvent]:
@@ -72,3 +85,10 @@ class FileWatcher:
             except Empty:
                 break
         return events
+
+
+"""
+CHANGELOG
+2026-10-18 Codex
+- Dispatched events to registered callbacks (previously stored but never invoked), carried move destinations, and bounded the poll queue.
+"""
@@ -0,0 +1,194 @@
+"""Background health probes with cached, timestamped results for the dashboard."""
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+Probe = Tuple[str, Callable[[], Tuple[str, str]]]
+
+
+class HealthMonitor:
+    """Runs the connection probes on a worker thread and serves the last results instantly.
+
+    The interval adapts: it resets to `min_interval` whenever a probe's status
+    changes (or after `refresh()`), and doubles up to `max_interval` while
+    results stay the same, so a steady daemon is polled rarely. `on_change(steps)`
+    is called after any cycle whose statuses differ from the previous one.
+    Probes must only read state; one-off actions such as starting the daemon go in
+    `bootstrap`, which runs once on the worker thread before the first cycle.
+    """
+
+    def __init__(
+        self,
+        probes: Sequence[Probe],
+        *,
+        min_interval: float = 5.0,
+        max_interval: float = 120.0,
+        stale_after: float = 60.0,
+        on_change: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+        bootstrap: Optional[Callable[[], Any]] = None,
+    ) -> None:
+        self._probes = list(probes)
+        self._on_change = on_change
+        self._bootstrap = bootstrap
+        self._min_interval = min_interval
+        self._max_interval = max(min_interval, max_interval)
+        self._stale_after = stale_after
+        self._interval = min_interval
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._wake = False
+        self._refreshing = False
+        self._steps: List[Dict[str, Any]] = []
+        self._checked_at: Optional[float] = None
+        self._next_at: Optional[float] = None
+        self._cycles = 0
+
+    def start(self) -> None:
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+            self._wake = True
+        self._thread = threading.Thread(target=self._run, name="espanso-health", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=1)
+        self._thread = None
+
+    def refresh(self, wait: Optional[float] = None) -> None:
+        """Ask for a probe cycle now; optionally block up to `wait` seconds for it to finish."""
+        with self._condition:
+            target = self._cycles + 1 if not self._refreshing else self._cycles + 2
+            self._wake = True
+            self._interval = self._min_interval
+            self._condition.notify_all()
+            running = self._running
+        if not running:
+            self.run_cycle()
+            return
+        if wait:
+            self._wait_for_cycle(target, wait)
+
+    def wait_first(self, timeout: float) -> None:
+        """Block until the first cycle has produced results (or `timeout` passes)."""
+        self._wait_for_cycle(1, timeout)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Cached steps plus age/staleness; requests a background refresh when stale."""
+        with self._condition:
+            now = time.monotonic()
+            age = None if self._checked_at is None else now - self._checked_at
+            stale = age is None or age > self._stale_after
+            if stale and self._running and not self._refreshing:
+                self._wake = True
+                self._condition.notify_all()
+            return {
+                "steps": [dict(step) for step in self._steps],
+                "ageSeconds": None if age is None else round(age, 1),
+                "stale": stale,
+                "refreshing": self._refreshing,
+                "nextCheckInSeconds": None if self._next_at is None else round(max(0.0, self._next_at - now), 1),
+                "intervalSeconds": self._interval,
+            }
+
+    def step(self, label: str) -> Optional[Dict[str, Any]]:
+        with self._condition:
+            for step in self._steps:
+                if step["label"] == label:
+                    return dict(step)
+        return None
+
+    def run_cycle(self) -> List[Dict[str, Any]]:
+        """Run every probe once (on the calling thread) and publish the results."""
+        with self._condition:
+            self._refreshing = True
+        steps = [self._run_probe(label, action) for label, action in self._probes]
+        with self._condition:
+            previous = [(step["label"], step["status"]) for step in self._steps]
+            current = [(step["label"], step["status"]) for step in steps]
+            changed = previous != current
+            if changed:
+                self._interval = self._min_interval
+            else:
+                self._interval = min(self._interval * 2, self._max_interval)
+            self._steps = steps
+            self._checked_at = time.monotonic()
+            self._next_at = self._checked_at + self._interval
+            self._refreshing = False
+            self._cycles += 1
+            self._condition.notify_all()
+        if changed and self._on_change is not None:
+            self._on_change([dict(step) for step in steps])
+        return steps
+
+    @staticmethod
+    def _run_probe(label: str, action: Callable[[], Tuple[str, str]]) -> Dict[str, Any]:
+        started = time.monotonic()
+        try:
+            status, detail = action()
+        except Exception as exc:
+            status = "error"
+            detail = str(exc)
+        return {
+            "label": label,
+            "status": status,
+            "detail": detail,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "durationMs": round((time.monotonic() - started) * 1000),
+        }
+
+    def _wait_for_cycle(self, target: int, timeout: float) -> None:
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while self._cycles < target and self._running:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                self._condition.wait(timeout=remaining)
+
+    def _run(self) -> None:
+        bootstrap, self._bootstrap = self._bootstrap, None
+        if bootstrap is not None:
+            try:
+                bootstrap()
+            except Exception as exc:
+                print(f"[ERROR] Health bootstrap failed: {exc}", flush=True)
+        while True:
+            with self._condition:
+                while self._running and not self._wake:
+                    timeout = None if self._next_at is None else self._next_at - time.monotonic()
+                    if timeout is not None and timeout <= 0:
+                        break
+                    self._condition.wait(timeout=timeout)
+                if not self._running:
+                    return
+                self._wake = False
+            try:
+                self.run_cycle()
+            except Exception as exc:
+                print(f"[ERROR] Health check cycle failed: {exc}", flush=True)
+                with self._condition:
+                    self._refreshing = False
+                    self._next_at = time.monotonic() + self._interval
+
+
+"""
+CHANGELOG
+2026-10-18 Codex
+- Added HealthMonitor so dashboard connection probes run on an adaptive background schedule and are served from cache.
+2026-10-18 Codex
+- Added an `on_change` callback fired when probe statuses change, so health can be pushed instead of polled.
+2026-10-18 Codex
+- Added a one-shot `bootstrap` hook; probes are now expected to be read-only.
+"""
@@ -0,0 +1,332 @@
+"""Incremental per-file parse cache for Espanso match files."""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import os
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .body_store import BodyStore, LazyBody
+from .snippet_record import SnippetRecord, sanitize_delay_value  # noqa: F401 - re-exported
+from .yaml_editing import match_item_spans
+from .yaml_processor import YamlProcessor
+
+ParseResult = Tuple[List[SnippetRecord], Optional[Dict[str, str]]]
+
+
+@dataclass(frozen=True)
+class FileFingerprint:
+    """Cheap on-disk identity for a match file."""
+
+    mtime_ns: int
+    size: int
+    digest: Optional[str] = None
+
+    def same_stat(self, other: "FileFingerprint") -> bool:
+        return self.mtime_ns == other.mtime_ns and self.size == other.size
+
+
+@dataclass
+class CachedMatchFile:
+    path: Path
+    label: str
+    fingerprint: FileFingerprint
+    snippets: List[SnippetRecord]
+    error: Optional[Dict[str, str]] = None
+
+
+@dataclass
+class SyncResult:
+    reparsed: List[Path] = field(default_factory=list)
+    removed: List[Path] = field(default_factory=list)
+    reused: int = 0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.reparsed or self.removed)
+
+
+def fingerprint_file(path: Path, with_digest: bool = False) -> FileFingerprint:
+    """Stat a file (and optionally hash it) to detect changes since the last parse."""
+    stat = os.stat(path)
+    digest = _digest_file(path) if with_digest else None
+    return FileFingerprint(mtime_ns=stat.st_mtime_ns, size=stat.st_size, digest=digest)
+
+
+def _digest_file(path: Path) -> str:
+    hasher = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 16), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def parse_match_file(path: Path, label: str, yaml_processor: Optional[YamlProcessor] = None) -> ParseResult:
+    """Parse one match file into snippet records plus an optional error entry."""
+    processor = yaml_processor or YamlProcessor()
+    try:
+        text = path.read_text(encoding="utf-8")
+        # Compose once: the nodes give each item's source span, then build the data from them
+        root = processor.compose(text)
+        data = processor.construct(root)
+        if not isinstance(data, dict):
+            data = {}
+    except Exception as exc:
+        print(f"[ERROR] Failed to load {label}: {exc}", flush=True)
+        return [], {"file": label, "error": str(exc)}
+
+    try:
+        matches = data.get("matches") or []
+        spans = match_item_spans(text, root)
+        if len(spans) != len(matches):
+            spans = [None] * len(matches)
+        return [
+            SnippetRecord.from_raw(raw, label, index, span.line if span else None, span.end_line if span else None)
+            for index, (raw, span) in enumerate(zip(matches, spans))
+        ], None
+    except Exception as exc:
+        print(f"[ERROR] Failed to process matches in {label}: {exc}", flush=True)
+        return [], {"file": label, "error": f"Processing error: {exc}"}
+
+
+class MatchFileCache:
+    """Keeps parsed snippets per file and only re-parses files whose fingerprint changed.
+
+    When `workers` is greater than one and at least `parallel_threshold` files are
+    stale, parsing fans out over a process pool (YAML parsing holds the GIL).
+    Results are merged back in the caller's file order, so output is deterministic.
+    With `bodies`, replace texts longer than its threshold are spilled to the body
+    store as they are cached, leaving a LazyBody preview in the record.
+    """
+
+    def __init__(
+        self,
+        parser: Optional[Callable[[Path, str], ParseResult]] = None,
+        *,
+        hash_content: bool = False,
+        workers: int = 0,
+        parallel_threshold: int = 8,
+        bodies: Optional[BodyStore] = None,
+    ) -> None:
+        self._parser = parser or parse_match_file
+        self._hash_content = hash_content
+        self._workers = max(0, workers)
+        self._parallel_threshold = max(1, parallel_threshold)
+        self._bodies = bodies
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._entries: Dict[Path, CachedMatchFile] = {}
+        self._order: List[Path] = []
+        self._lock = threading.RLock()
+
+    def sync(self, files: Iterable[Tuple[Path, str]]) -> SyncResult:
+        """Bring the cache in line with `files` (ordered (path, label) pairs)."""
+        result = SyncResult()
+        with self._lock:
+            wanted: List[Tuple[Path, str]] = list(files)
+            wanted_paths = {path for path, _ in wanted}
+            for path in list(self._entries):
+                if path not in wanted_paths:
+                    self._entries.pop(path, None)
+                    result.removed.append(path)
+
+            stale: List[Tuple[Path, str, FileFingerprint]] = []
+            for path, label in wanted:
+                fingerprint = self._stale_fingerprint(path, label)
+                if fingerprint is None:
+                    if path in self._entries:
+                        result.reused += 1
+                    continue
+                stale.append((path, label, fingerprint))
+
+            for (path, label, fingerprint), parsed in zip(stale, self._parse_many(stale)):
+                self._store(path, label, fingerprint, parsed)
+                result.reparsed.append(path)
+            self._order = [path for path, _ in wanted if path in self._entries]
+            if result.reparsed:
+                self._compact_bodies()
+        return result
+
+    def _stale_fingerprint(self, path: Path, label: str) -> Optional[FileFingerprint]:
+        """Return the fresh fingerprint if `path` needs parsing, else None (cached or missing)."""
+        try:
+            current = fingerprint_file(path)
+        except OSError:
+            self._entries.pop(path, None)
+            return None
+
+        cached = self._entries.get(path)
+        if cached is not None and cached.label == label:
+            if cached.fingerprint.same_stat(current):
+                return None
+            if self._hash_content and cached.fingerprint.digest:
+                digest = _digest_file(path)
+                if digest == cached.fingerprint.digest:
+                    cached.fingerprint = FileFingerprint(current.mtime_ns, current.size, digest)
+                    return None
+                return FileFingerprint(current.mtime_ns, current.size, digest)
+
+        if self._hash_content:
+            return FileFingerprint(current.mtime_ns, current.size, _digest_file(path))
+        return current
+
+    def _store(self, path: Path, label: str, fingerprint: FileFingerprint, parsed: ParseResult) -> None:
+        snippets, error = parsed
+        if self._bodies is not None:
+            self._bodies.spill(snippets)
+        self._entries[path] = CachedMatchFile(
+            path=path,
+            label=label,
+            fingerprint=fingerprint,
+            snippets=snippets,
+            error=error,
+        )
+
+    def _parse_many(self, stale: Sequence[Tuple[Path, str, FileFingerprint]]) -> List[ParseResult]:
+        paths = [path for path, _, _ in stale]
+        labels = [label for _, label, _ in stale]
+        if self._workers > 1 and len(stale) >= self._parallel_threshold:
+            try:
+                pool = self._ensure_pool()
+                chunksize = max(1, len(stale) // (self._workers * 4))
+                return list(pool.map(self._parser, paths, labels, chunksize=chunksize))
+            except (BrokenProcessPool, OSError, RuntimeError, pickle.PicklingError) as exc:
+                print(f"[WARNING] Parallel match loading unavailable, parsing sequentially: {exc}", flush=True)
+                self.close()
+        return [self._parser(path, label) for path, label in zip(paths, labels)]
+
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self._workers)
+        return self._pool
+
+    def close(self) -> None:
+        """Shut down the worker pool, if one was started."""
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _refresh_entry(self, path: Path, label: str) -> bool:
+        """Re-parse `path` if its fingerprint changed; return True when parsed."""
+        fingerprint = self._stale_fingerprint(path, label)
+        if fingerprint is None:
+            return False
+        self._store(path, label, fingerprint, self._parser(path, label))
+        self._compact_bodies()
+        return True
+
+    def _compact_bodies(self) -> None:
+        """Drop spilled bodies no cached snippet refers to any more, once enough have piled up."""
+        if self._bodies is None or not self._bodies.needs_compaction():
+            return
+        live = [
+            snippet.replace
+            for entry in self._entries.values()
+            for snippet in entry.snippets
+            if isinstance(snippet.replace, LazyBody)
+        ]
+        self._bodies.compact(live)
+
+    def update(self, path: Path, label: str) -> bool:
+        """Refresh one file in place (keeping label order); return True if the cache changed."""
+        with self._lock:
+            known = path in self._entries
+            parsed = self._refresh_entry(path, label)
+            if path not in self._entries:
+                if path in self._order:
+                    self._order.remove(path)
+                return known
+            if path not in self._order:
+                labels = [self._entries[item].label for item in self._order]
+                self._order.insert(bisect.bisect(labels, label), path)
+            return parsed
+
+    def discard(self, path: Path) -> bool:
+        """Drop a deleted file; return True if it was cached."""
+        with self._lock:
+            if path in self._order:
+                self._order.remove(path)
+            return self._entries.pop(path, None) is not None
+
+    def invalidate(self, path: Optional[Path] = None) -> None:
+        """Forget one file (or everything) so the next sync re-parses it."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                self._order = []
+            else:
+                self._entries.pop(path, None)
+                if path in self._order:
+                    self._order.remove(path)
+
+    def snippets(self) -> List[SnippetRecord]:
+        """Concatenate cached snippets in file order."""
+        with self._lock:
+            merged: List[SnippetRecord] = []
+            for path in self._order:
+                entry = self._entries.get(path)
+                if entry is not None:
+                    merged.extend(entry.snippets)
+            return merged
+
+    def errors(self) -> List[Dict[str, str]]:
+        with self._lock:
+            return [
+                self._entries[path].error
+                for path in self._order
+                if path in self._entries and self._entries[path].error
+            ]
+
+    def entry(self, path: Path) -> Optional[CachedMatchFile]:
+        with self._lock:
+            return self._entries.get(path)
+
+    def files(self) -> Sequence[Path]:
+        with self._lock:
+            return list(self._order)
+
+    def export(self) -> List[CachedMatchFile]:
+        """The cached files in order; a re-parse swaps in a new entry, so these stay safe to read unlocked."""
+        with self._lock:
+            return [self._entries[path] for path in self._order if path in self._entries]
+
+    def seed(self, files: Iterable[CachedMatchFile]) -> int:
+        """Install files parsed in an earlier session; the next sync re-checks their fingerprints.
+
+        Only fills an empty cache. Returns the number of files installed.
+        """
+        with self._lock:
+            if self._entries:
+                return 0
+            for entry in files:
+                if self._bodies is not None:
+                    self._bodies.spill(entry.snippets)
+                self._entries[entry.path] = entry
+                self._order.append(entry.path)
+            return len(self._order)
+
+
+"""
+CHANGELOG
+2026-10-18 Codex
+- Added MatchFileCache so match loading only re-parses files whose mtime/size (or optional content digest) changed.
+- Added single-file update/discard so watcher-driven reloads can splice one file without a directory rescan.
+2026-10-18 Codex
+- Added optional process-pool parsing for cold loads with many stale files, merged back in file order.
+2026-10-18 Codex
+- Snippet records include the match's `triggers` list.
+2026-10-18 Codex
+- Snippet records carry their `matches` index and source lines (composed once per parse) for the trigger location index.
+2026-10-18 Codex
+- Files parse straight into slotted SnippetRecords (no MatchDefinition or per-snippet dict in between).
+2026-10-18 Codex
+- Optional BodyStore: long replace bodies are spilled as files are cached and compacted when stale ones pile up.
+2026-10-18 Codex
+- Added export/seed so a persisted snapshot can fill the cache at startup before the first sync validates it.
+"""
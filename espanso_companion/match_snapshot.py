@@ -0,0 +1,194 @@
+"""On-disk snapshot of the parsed match cache so startup can skip YAML parsing."""
+
+from __future__ import annotations
+
+import io
+import pickle
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .atomic_io import atomic_write_bytes
+from .body_store import BodyStore, LazyBody
+from .match_cache import CachedMatchFile, FileFingerprint
+from .snippet_record import SnippetRecord
+
+SNAPSHOT_VERSION = 1
+_REPLACE = SnippetRecord.__slots__.index("replace")
+# Besides plain containers, safe YAML loading can only produce these
+_ALLOWED_GLOBALS = {
+    ("datetime", "date"),
+    ("datetime", "datetime"),
+    ("datetime", "timedelta"),
+    ("datetime", "timezone"),
+}
+
+
+class _PlainUnpickler(pickle.Unpickler):
+    """Refuses every global except the datetime types, so a tampered file cannot run code."""
+
+    def find_class(self, module: str, name: str) -> Any:
+        if (module, name) in _ALLOWED_GLOBALS:
+            return super().find_class(module, name)
+        raise pickle.UnpicklingError(f"Unexpected global in match snapshot: {module}.{name}")
+
+
+def _record_state(record: SnippetRecord, bodies: Optional[BodyStore]) -> tuple:
+    state = record.__getstate__()
+    if isinstance(state[_REPLACE], LazyBody):
+        if bodies is None:
+            raise KeyError("Spilled body without a body store")
+        state = state[:_REPLACE] + (bodies.text(state[_REPLACE]),) + state[_REPLACE + 1:]
+    return state
+
+
+def save_snapshot(
+    path: Path,
+    match_dir: Path,
+    files: Sequence[CachedMatchFile],
+    bodies: Optional[BodyStore] = None,
+) -> int:
+    """Write `files` (with spilled bodies resolved) as plain tuples; returns the byte size.
+
+    A file whose body vanished from the store mid-save is left out; the next
+    startup simply parses it.
+    """
+    rows: List[tuple] = []
+    for entry in files:
+        try:
+            states = [_record_state(record, bodies) for record in entry.snippets]
+        except (KeyError, OSError):
+            continue
+        fingerprint = entry.fingerprint
+        rows.append(
+            (str(entry.path), entry.label, (fingerprint.mtime_ns, fingerprint.size, fingerprint.digest), states, entry.error)
+        )
+    payload = {
+        "version": SNAPSHOT_VERSION,
+        "slots": SnippetRecord.__slots__,
+        "matchDir": str(match_dir),
+        "files": rows,
+    }
+    data = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+    atomic_write_bytes(path, data)
+    return len(data)
+
+
+def load_snapshot(path: Path, match_dir: Path) -> Optional[List[CachedMatchFile]]:
+    """Cached files from a snapshot of `match_dir`, or None if there is none or it does not fit."""
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+    try:
+        payload = _PlainUnpickler(io.BytesIO(data)).load()
+        if (
+            not isinstance(payload, dict)
+            or payload.get("version") != SNAPSHOT_VERSION
+            or tuple(payload.get("slots") or ()) != SnippetRecord.__slots__
+            or payload.get("matchDir") != str(match_dir)
+        ):
+            return None
+        files: List[CachedMatchFile] = []
+        for file_path, label, (mtime_ns, size, digest), states, error in payload["files"]:
+            snippets = []
+            for state in states:
+                record = SnippetRecord.__new__(SnippetRecord)
+                record.__setstate__(state)
+                snippets.append(record)
+            files.append(
+                CachedMatchFile(
+                    path=Path(file_path),
+                    label=label,
+                    fingerprint=FileFingerprint(mtime_ns, size, digest),
+                    snippets=snippets,
+                    error=error,
+                )
+            )
+        return files
+    except Exception as exc:
+        print(f"[WARNING] Ignoring unreadable match snapshot {path}: {exc}", flush=True)
+        return None
+
+
+class SnapshotWriter:
+    """Runs `save()` on a worker thread once `delay` seconds pass without another `request()`.
+
+    `stop()` writes a still-pending snapshot before returning, so the next start
+    sees the latest cache.
+    """
+
+    def __init__(self, save: Callable[[], Any], *, delay: float = 2.0) -> None:
+        self._save = save
+        self._delay = delay
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._due: Optional[float] = None
+        self._run_lock = threading.Lock()
+        self._last: Optional[Dict[str, Any]] = None
+
+    def start(self) -> None:
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="espanso-match-snapshot", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._condition:
+            self._running = False
+            pending = self._due is not None
+            self._due = None
+            self._condition.notify_all()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=1)
+        self._thread = None
+        if pending:
+            self.run_now()
+
+    def request(self) -> None:
+        """Note that the cache changed; save once things are quiet."""
+        with self._condition:
+            self._due = time.monotonic() + self._delay
+            self._condition.notify_all()
+
+    def run_now(self) -> Dict[str, Any]:
+        with self._run_lock:
+            started = time.monotonic()
+            try:
+                result = {"status": "success", "bytes": self._save()}
+            except Exception as exc:
+                result = {"status": "error", "detail": str(exc)}
+                print(f"[ERROR] Saving match snapshot failed: {exc}", flush=True)
+            result["durationMs"] = round((time.monotonic() - started) * 1000)
+            with self._condition:
+                self._last = result
+            return result
+
+    def last(self) -> Optional[Dict[str, Any]]:
+        with self._condition:
+            return dict(self._last) if self._last else None
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while self._running:
+                    now = time.monotonic()
+                    if self._due is not None and now >= self._due:
+                        break
+                    self._condition.wait(timeout=None if self._due is None else self._due - now)
+                if not self._running:
+                    return
+                self._due = None
+            self.run_now()
+
+
+"""
+CHANGELOG
+2026-10-18 Codex
+- Added save_snapshot/load_snapshot (pickled plain tuples, restricted unpickler, fingerprints kept) and SnapshotWriter so startup can seed the match cache and validate it in the background.
+"""
@@ -0,0 +1,108 @@
+"""Debounced reload pipeline that turns watcher bursts into per-file reloads."""
+
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+
+class ReloadPipeline:
+    """Coalesces events per path and hands settled paths to a worker-thread handler.
+
+    Editors typically emit modify+create+move bursts for one save; a path is only
+    released once it has been quiet for `quiet_seconds` (or has been pending for
+    `max_delay` seconds, so a file under constant churn still reloads).
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[List[Path]], None],
+        *,
+        quiet_seconds: float = 0.25,
+        max_delay: float = 2.0,
+    ) -> None:
+        self._handler = handler
+        self._quiet = quiet_seconds
+        self._max_delay = max_delay
+        self._pending: Dict[Path, List[float]] = {}
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    def start(self) -> None:
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="espanso-reload", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._condition:
+            self._running = False
+            self._pending.clear()
+            self._condition.notify_all()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=1)
+        self._thread = None
+
+    def submit(self, path: Path) -> None:
+        """Record an event for `path`; safe to call from the watcher thread."""
+        now = time.monotonic()
+        with self._condition:
+            if not self._running:
+                return
+            stamps = self._pending.get(path)
+            if stamps is None:
+                self._pending[path] = [now, now]
+            else:
+                stamps[1] = now
+            self._condition.notify_all()
+
+    def pending(self) -> int:
+        with self._condition:
+            return len(self._pending)
+
+    def _take_ready(self, now: float) -> List[Path]:
+        ready = [
+            path
+            for path, (first, last) in self._pending.items()
+            if now - last >= self._quiet or now - first >= self._max_delay
+        ]
+        for path in ready:
+            self._pending.pop(path, None)
+        return ready
+
+    def _next_deadline(self, now: float) -> float:
+        deadline = min(
+            min(last + self._quiet, first + self._max_delay)
+            for first, last in self._pending.values()
+        )
+        return max(0.0, deadline - now)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while self._running and not self._pending:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                now = time.monotonic()
+                ready = self._take_ready(now)
+                if not ready:
+                    self._condition.wait(timeout=self._next_deadline(now))
+                    continue
+            try:
+                self._handler(sorted(ready))
+            except Exception as exc:
+                print(f"[ERROR] Reload pipeline failed: {exc}", flush=True)
+
+
+"""
+CHANGELOG
+2026-10-18 Codex
+- Added ReloadPipeline to debounce watcher events per path and reload only settled files on a worker thread.
+"""
@@ -0,0 +1,202 @@
+"""Background scheduler that coalesces Espanso daemon restarts."""
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime, timezone
+from subprocess import CompletedProcess
+from typing import Any, Callable, Dict, List, Optional
+
+
+class RestartScheduler:
+    """Runs at most one restart at a time, after requests have been quiet for `quiet_seconds`.
+
+    Requests arriving while a restart is in flight queue exactly one follow-up.
+    Unforced requests are dropped at fire time when `skip_when()` says Espanso
+    will reload by itself (its `auto_restart` option watches the config dir).
+    """
+
+    def __init__(
+        self,
+        restart: Callable[[], CompletedProcess],
+        *,
+        quiet_seconds: float = 1.5,
+        max_delay: float = 10.0,
+        skip_when: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        self._restart = restart
+        self._quiet = max(0.0, quiet_seconds)
+        self._max_delay = max(self._quiet, max_delay)
+        self._skip_when = skip_when
+        self._condition = threading.Condition()
+        self._run_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._first_request: Optional[float] = None
+        self._last_request: Optional[float] = None
+        self._reasons: List[str] = []
+        self._forced = False
+        self._in_flight = False
+        self._last: Optional[Dict[str, Any]] = None
+        self._restarts = 0
+        self._skipped = 0
+        self._coalesced = 0
+
+    def configure(self, *, quiet_seconds: Optional[float] = None) -> None:
+        with self._condition:
+            if quiet_seconds is not None:
+                self._quiet = max(0.0, quiet_seconds)
+                self._max_delay = max(self._quiet, self._max_delay)
+            self._condition.notify_all()
+
+    def start(self) -> None:
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="espanso-restart", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=1)
+        self._thread = None
+
+    def request(self, reason: str = "", *, force: bool = False) -> Dict[str, Any]:
+        """Queue a restart; returns the scheduler state right after queueing."""
+        now = time.monotonic()
+        with self._condition:
+            if self._first_request is None:
+                self._first_request = now
+            else:
+                self._coalesced += 1
+            self._last_request = now
+            if reason and reason not in self._reasons:
+                self._reasons.append(reason)
+            self._forced = self._forced or force
+            self._condition.notify_all()
+        if not self._running:
+            self.flush()
+        return self.state()
+
+    def run_now(self, reason: str = "") -> CompletedProcess:
+        """Restart synchronously (absorbing anything pending), still never overlapping another restart."""
+        with self._condition:
+            if reason and reason not in self._reasons:
+                self._reasons.append(reason)
+            reasons = self._take_pending()
+        return self._execute(reasons or [reason or "manual"])
+
+    def flush(self) -> Optional[CompletedProcess]:
+        """Fire any pending request immediately (used when no worker thread is running)."""
+        with self._condition:
+            if self._first_request is None:
+                return None
+            forced = self._forced
+            reasons = self._take_pending()
+        if not forced and self._should_skip():
+            self._record_skip(reasons)
+            return None
+        return self._execute(reasons)
+
+    def state(self) -> Dict[str, Any]:
+        with self._condition:
+            pending = self._first_request is not None
+            due_in = None
+            if pending and self._last_request is not None and self._first_request is not None:
+                now = time.monotonic()
+                deadline = min(self._last_request + self._quiet, self._first_request + self._max_delay)
+                due_in = max(0.0, round(deadline - now, 3))
+            return {
+                "pending": pending,
+                "pendingReasons": list(self._reasons),
+                "dueInSeconds": due_in,
+                "inFlight": self._in_flight,
+                "quietSeconds": self._quiet,
+                "restarts": self._restarts,
+                "skipped": self._skipped,
+                "coalesced": self._coalesced,
+                "last": dict(self._last) if self._last else None,
+            }
+
+    def _take_pending(self) -> List[str]:
+        reasons = self._reasons
+        self._reasons = []
+        self._first_request = None
+        self._last_request = None
+        self._forced = False
+        return reasons
+
+    def _should_skip(self) -> bool:
+        if self._skip_when is None:
+            return False
+        try:
+            return bool(self._skip_when())
+        except Exception:
+            return False
+
+    def _record_skip(self, reasons: List[str]) -> None:
+        print(f"[INFO] Skipped Espanso restart ({', '.join(reasons)}): auto_restart picks up the change", flush=True)
+        with self._condition:
+            self._skipped += 1
+            self._last = {
+                "at": datetime.now(timezone.utc).isoformat(),
+                "reasons": reasons,
+                "outcome": "skipped",
+                "detail": "Espanso auto-restart picks up the change",
+            }
+
+    def _execute(self, reasons: List[str]) -> CompletedProcess:
+        with self._run_lock:
+            with self._condition:
+                self._in_flight = True
+            started = time.monotonic()
+            try:
+                result = self._restart()
+            except Exception as exc:
+                result = CompletedProcess(["espanso", "restart"], returncode=1, stdout="", stderr=str(exc))
+            finally:
+                with self._condition:
+                    self._in_flight = False
+            with self._condition:
+                self._restarts += 1
+                self._last = {
+                    "at": datetime.now(timezone.utc).isoformat(),
+                    "reasons": reasons,
+                    "outcome": "success" if result.returncode == 0 else "error",
+                    "returncode": result.returncode,
+                    "detail": (result.stdout or "").strip() or (result.stderr or "").strip(),
+                    "durationMs": round((time.monotonic() - started) * 1000),
+                }
+            return result
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while self._running and self._first_request is None:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                now = time.monotonic()
+                deadline = min(self._last_request + self._quiet, self._first_request + self._max_delay)
+                if now < deadline:
+                    self._condition.wait(timeout=deadline - now)
+                    continue
+            try:
+                self.flush()
+            except Exception as exc:
+                print(f"[ERROR] Scheduled Espanso restart failed: {exc}", flush=True)
+
+
+"""
+CHANGELOG
+2026-10-18 Codex
+- Added RestartScheduler so edits queue a debounced, non-overlapping `espanso restart` instead of blocking the bridge call.
+2026-10-18 Codex
+- Skipped restarts are logged with their reasons.
+"""
@@ -0,0 +1,184 @@
+"""Per-file diff between a backup and the live config tree, and applying only what differs."""
+
+from __future__ import annotations
+
+import difflib
+import os
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Set
+
+from .atomic_io import atomic_write_bytes, fsync_directory
+from .backup_store import BackupError, BackupStore, content_digest
+
+@dataclass
+class BackupEntry:
+    """One file in a backup: its size, optional digest/mtime, and how to read it."""
+
+    name: str
+    size: int
+    read: Callable[[], bytes]
+    digest: Optional[str] = None
+    mtime_ns: Optional[int] = None
+
+
+@dataclass
+class RestoreChange:
+    name: str
+    status: str  # added / changed / removed
+    size_before: Optional[int] = None
+    size_after: Optional[int] = None
+    diff: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {"name": self.name, "status": self.status, "sizeBefore": self.size_before, "sizeAfter": self.size_after}
+        if self.diff is not None:
+            data["diff"] = self.diff
+        return data
+
+
+@dataclass
+class RestorePlan:
+    changes: List[RestoreChange] = field(default_factory=list)
+    unchanged: int = 0
+
+    def count(self, status: str) -> int:
+        return sum(1 for change in self.changes if change.status == status)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "added": self.count("added"),
+            "changed": self.count("changed"),
+            "removed": self.count("removed"),
+            "unchanged": self.unchanged,
+            "files": [change.to_dict() for change in self.changes],
+        }
+
+
+def snapshot_entries(store: BackupStore, snapshot_id: str) -> Dict[str, BackupEntry]:
+    """Entries of a store snapshot; content is fetched (and verified) only when read."""
+    entries: Dict[str, BackupEntry] = {}
+    for item in store.manifest(snapshot_id).get("files") or []:
+        entries[item["name"]] = BackupEntry(
+            name=item["name"],
+            size=item["size"],
+            read=lambda item=item: store.read_file(item),
+            digest=item.get("digest"),
+            mtime_ns=item.get("mtimeNs"),
+        )
+    return entries
+
+
+def folder_entries(directory: Path) -> Dict[str, BackupEntry]:
+    """Entries of a legacy backup that is a plain copy of the config directory."""
+    return {
+        name: BackupEntry(name=name, size=path.stat().st_size, read=path.read_bytes)
+        for name, path in _tree_files(directory).items()
+    }
+
+
+def safe_relative(name: str) -> PurePosixPath:
+    relative = PurePosixPath(name)
+    if relative.is_absolute() or ".." in relative.parts or not relative.parts:
+        raise BackupError(f"Refusing to restore outside the target: {name}")
+    return relative
+
+
+def _tree_files(directory: Path) -> Dict[str, Path]:
+    files: Dict[str, Path] = {}
+    if not directory.exists():
+        return files
+    for current, _, filenames in os.walk(directory):
+        base = Path(current)
+        for filename in filenames:
+            path = base / filename
+            files[path.relative_to(directory).as_posix()] = path
+    return files
+
+
+def _same_content(entry: BackupEntry, path: Path, stat: os.stat_result) -> bool:
+    if stat.st_size != entry.size:
+        return False
+    if entry.mtime_ns is not None and entry.mtime_ns == stat.st_mtime_ns:
+        return True  # untouched since the snapshot read it
+    current = path.read_bytes()
+    if entry.digest is not None:
+        return content_digest(current) == entry.digest
+    return current == entry.read()
+
+
+def plan_restore(
+    entries: Iterable[BackupEntry],
+    destination: Path,
+    *,
+    delete_extra: bool,
+    include_diff: bool = False,
+    max_diff_lines: int = 200,
+) -> RestorePlan:
+    """Compare a backup with `destination`: files to add, overwrite and (optionally) delete."""
+    plan = RestorePlan()
+    current = _tree_files(destination)
+    seen: Set[str] = set()
+    for entry in sorted(entries, key=lambda item: item.name):
+        safe_relative(entry.name)
+        seen.add(entry.name)
+        path = current.get(entry.name)
+        if path is None:
+            plan.changes.append(RestoreChange(entry.name, "added", size_after=entry.size))
+            continue
+        stat = path.stat()
+        if _same_content(entry, path, stat):
+            plan.unchanged += 1
+            continue
+        change = RestoreChange(entry.name, "changed", size_before=stat.st_size, size_after=entry.size)
+        if include_diff:
+            change.diff = text_diff(path.read_bytes(), entry.read(), entry.name, max_diff_lines)
+        plan.changes.append(change)
+    if delete_extra:
+        for name in sorted(set(current) - seen):
+            plan.changes.append(RestoreChange(name, "removed", size_before=current[name].stat().st_size))
+    return plan
+
+
+def text_diff(before: bytes, after: bytes, name: str, max_lines: int) -> str:
+    """Unified diff (current → backup), truncated to `max_lines`; empty for binary files."""
+    try:
+        old = before.decode("utf-8").splitlines(keepends=True)
+        new = after.decode("utf-8").splitlines(keepends=True)
+    except UnicodeDecodeError:
+        return ""
+    lines: List[str] = []
+    for line in difflib.unified_diff(old, new, fromfile=f"current/{name}", tofile=f"backup/{name}"):
+        if len(lines) >= max_lines:
+            lines.append("... (diff truncated)\n")
+            break
+        lines.append(line if line.endswith("\n") else line + "\n")
+    return "".join(lines)
+
+
+def apply_restore(plan: RestorePlan, entries: Mapping[str, BackupEntry], destination: Path) -> List[Path]:
+    """Write added/changed files atomically and delete removed ones; returns every path touched."""
+    touched: List[Path] = []
+    directories: Set[Path] = set()
+    for change in plan.changes:
+        target = destination.joinpath(*safe_relative(change.name).parts)
+        if change.status == "removed":
+            try:
+                target.unlink()
+            except FileNotFoundError:
+                pass
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_bytes(target, entries[change.name].read())
+        directories.add(target.parent)
+        touched.append(target)
+    for directory in directories:
+        fsync_directory(directory)
+    return touched
+
+
+"""
+CHANGELOG
+2026-10-18 Codex
+- Added plan_restore/apply_restore so restores diff against the live tree, preview the changes and rewrite only files that differ.
+"""
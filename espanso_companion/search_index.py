@@ -0,0 +1,522 @@
+"""Inverted trigram index backing snippet search in the dashboard."""
+
+from __future__ import annotations
+
+import bisect
+import threading
+from array import array
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .body_store import BodyStore, LazyBody
+from .trigger_trie import snippet_triggers
+
+GRAM = 3
+
+
+def _grams(text: str) -> Set[str]:
+    return {text[i:i + GRAM] for i in range(len(text) - GRAM + 1)}
+
+
+def _indexed_grams(text: str) -> Set[str]:
+    """Every 1..GRAM character substring, so queries shorter than a trigram have postings too."""
+    return {text[i:i + size] for size in range(1, GRAM + 1) for i in range(len(text) - size + 1)}
+
+
+def _haystack(snippet: Dict[str, Any]) -> str:
+    """Same lowercase concatenation the linear filter used, plus any extra `triggers` entries."""
+    extra = [trigger for trigger in snippet.get("triggers") or () if trigger and trigger != snippet.get("trigger")]
+    parts = [
+        snippet.get("trigger") or "",
+        *extra,
+        snippet.get("replace") or "",
+        snippet.get("label") or "",
+        snippet.get("file") or "",
+    ]
+    return " ".join(parts).lower()
+
+
+def _trigger_grams(trigger: str) -> Set[str]:
+    """Padded bigrams, with repeats numbered so set overlap equals multiset overlap."""
+    padded = f"\x02{trigger}\x03"
+    grams: Set[str] = set()
+    for i in range(len(padded) - 1):
+        gram = padded[i:i + 2]
+        occurrence = 0
+        while gram in grams:
+            occurrence += 1
+            gram = f"{padded[i:i + 2]}{occurrence}"
+        grams.add(gram)
+    return grams
+
+
+def bounded_levenshtein(left: str, right: str, bound: int) -> Optional[int]:
+    """Edit distance between two strings, or None as soon as it must exceed `bound`.
+
+    Only the diagonal band of width 2*bound+1 is evaluated, so cost is O(len * bound).
+    """
+    if abs(len(left) - len(right)) > bound:
+        return None
+    if left == right:
+        return 0
+    overflow = bound + 1
+    width = len(right)
+    previous = [column if column <= bound else overflow for column in range(width + 1)]
+    for row in range(1, len(left) + 1):
+        left_char = left[row - 1]
+        low = max(1, row - bound)
+        high = min(width, row + bound)
+        current = [overflow] * (width + 1)
+        if row <= bound:
+            current[0] = row
+        best = current[0] if low == 1 else overflow
+        for column in range(low, high + 1):
+            value = previous[column - 1] + (left_char != right[column - 1])
+            if previous[column] + 1 < value:
+                value = previous[column] + 1
+            if current[column - 1] + 1 < value:
+                value = current[column - 1] + 1
+            if value > overflow:
+                value = overflow
+            current[column] = value
+            if value < best:
+                best = value
+        if best > bound:
+            return None
+        previous = current
+    distance = previous[width]
+    return distance if distance <= bound else None
+
+
+def default_fuzzy_distance(query: str) -> int:
+    return 1 if len(query) <= 4 else 2
+
+
+# Ranking tiers for search_ranked (lower is better)
+RANK_EXACT = 0
+RANK_PREFIX = 1
+RANK_TRIGGER_SUBSTRING = 2
+RANK_FUZZY_BASE = 3  # plus the edit distance
+RANK_LABEL = 6
+RANK_BODY = 7
+
+
+def _contains(postings: array, doc_id: int) -> bool:
+    index = bisect.bisect_left(postings, doc_id)
+    return index < len(postings) and postings[index] == doc_id
+
+
+class SnippetSearchIndex:
+    """Trigram postings plus filter sets over the match cache, maintained per file.
+
+    Unigrams and bigrams are posted alongside the trigrams, so 1-2 character
+    queries are answered from a single posting list instead of a scan.
+
+    Postings are append-only int arrays (doc ids only ever grow, so they stay
+    sorted); removed documents are tombstoned and the arrays are compacted once
+    tombstones outnumber live documents. Snippets whose body was spilled to
+    `bodies` keep only the preview in their haystack, but the grams of the full
+    body go into the postings, so a body is read back only when it is a
+    candidate for the query.
+    """
+
+    def __init__(self, bodies: Optional[BodyStore] = None) -> None:
+        self._lock = threading.RLock()
+        self._bodies = bodies
+        self._reset()
+
+    def _reset(self) -> None:
+        self._snippets: Dict[int, Dict[str, Any]] = {}
+        self._haystacks: Dict[int, str] = {}
+        self._order: Dict[int, Tuple[str, int]] = {}
+        self._trigger_keys: Dict[int, Tuple[Tuple[str, int], ...]] = {}
+        self._postings: Dict[str, array] = {}
+        self._files: Dict[str, List[int]] = {}
+        self._file_filter: Dict[str, Set[int]] = {}
+        self._disabled: Set[int] = set()
+        self._has_vars: Set[int] = set()
+        self._has_form: Set[int] = set()
+        self._lazy_docs: Set[int] = set()
+        self._triggers: List[Tuple[str, int]] = []
+        self._trigger_docs: Dict[str, Set[int]] = {}
+        self._trigger_gram_postings: Dict[str, Set[str]] = {}
+        self._trigger_lengths: Dict[int, Set[str]] = {}
+        self._dead = 0
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._snippets)
+
+    def keys(self) -> Set[str]:
+        with self._lock:
+            return set(self._files)
+
+    def replace_file(self, key: str, snippets: Iterable[Dict[str, Any]]) -> None:
+        """Swap every document that came from `key` (typically a file path) for `snippets`."""
+        with self._lock:
+            removed = self._remove_docs(key)
+            doc_ids = [self._add_doc(position, snippet) for position, snippet in enumerate(snippets)]
+            self._files[key] = doc_ids
+            self._merge_triggers(removed, [key for doc_id in doc_ids for key in self._trigger_keys[doc_id]])
+            self._maybe_compact()
+
+    def remove_file(self, key: str) -> None:
+        with self._lock:
+            self._merge_triggers(self._remove_docs(key), [])
+            self._maybe_compact()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reset()
+
+    def search(
+        self,
+        query: str = "",
+        filters: Optional[Dict[str, Any]] = None,
+        *,
+        interpret_bool: Callable[[Any], bool] = bool,
+        prefix: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Return snippets (in cache order) whose text contains `query` and that pass `filters`.
+
+        With `prefix=True` the query is matched against the start of triggers only.
+        """
+        with self._lock:
+            snippets = self._snippets
+            return [snippets[doc_id] for doc_id in self._search_ids(query, filters or {}, interpret_bool, prefix)]
+
+    def search_ranked(
+        self,
+        query: str,
+        filters: Optional[Dict[str, Any]] = None,
+        *,
+        interpret_bool: Callable[[Any], bool] = bool,
+        max_distance: Optional[int] = None,
+    ) -> List[Tuple[Dict[str, Any], int]]:
+        """Typo-tolerant search returning (snippet, rank) pairs, best first.
+
+        Ranks: exact trigger < trigger prefix < trigger substring < fuzzy trigger
+        (3 + edit distance) < label substring < replace/body substring. Every entry
+        of a `triggers` list counts as a trigger.
+        """
+        with self._lock:
+            filters = filters or {}
+            normalized = (query or "").strip().lower()
+            if not normalized:
+                ids = self._search_ids("", filters, interpret_bool, False)
+                return [(self._snippets[doc_id], RANK_EXACT) for doc_id in ids]
+
+            restrict = self._filter_candidates(filters, interpret_bool)
+            ranks: Dict[int, int] = {}
+            for doc_id in self._prefix_ids(normalized):
+                exact = any(trigger == normalized for trigger, _ in self._trigger_keys[doc_id])
+                ranks[doc_id] = RANK_EXACT if exact else RANK_PREFIX
+
+            bound = default_fuzzy_distance(normalized) if max_distance is None else max(0, max_distance)
+            for trigger, distance in self._fuzzy_triggers(normalized, bound):
+                for doc_id in self._trigger_docs.get(trigger, ()):
+                    ranks.setdefault(doc_id, RANK_FUZZY_BASE + distance)
+
+            for doc_id in self._substring_ids(normalized, restrict):
+                rank = ranks.get(doc_id)
+                if rank is not None and rank <= RANK_PREFIX:
+                    continue
+                snippet = self._snippets[doc_id]
+                if any(normalized in trigger for trigger, _ in self._trigger_keys[doc_id]):
+                    tier = RANK_TRIGGER_SUBSTRING
+                elif normalized in (snippet.get("label") or "").lower():
+                    tier = RANK_LABEL
+                else:
+                    tier = RANK_BODY
+                ranks[doc_id] = tier if rank is None else min(rank, tier)
+
+            label_filter = (filters.get("label") or "").strip().lower()
+            ordered: List[Tuple[Tuple[int, Tuple[str, int]], int]] = []
+            for doc_id, rank in ranks.items():
+                if restrict is not None and doc_id not in restrict:
+                    continue
+                if label_filter and label_filter not in (self._snippets[doc_id].get("label") or "").lower():
+                    continue
+                ordered.append(((rank, self._order[doc_id]), doc_id))
+            ordered.sort()
+            return [(self._snippets[doc_id], key[0]) for key, doc_id in ordered]
+
+    def _fuzzy_triggers(self, query: str, bound: int) -> List[Tuple[str, int]]:
+        """Distinct triggers within `bound` edits, pre-filtered with the q-gram count lemma."""
+        if bound <= 0:
+            return [(query, 0)] if query in self._trigger_docs else []
+        grams = _trigger_grams(query)
+        threshold = len(grams) - 2 * bound
+        if threshold <= 0:
+            candidates: Iterable[str] = [
+                trigger
+                for length in range(max(0, len(query) - bound), len(query) + bound + 1)
+                for trigger in self._trigger_lengths.get(length, ())
+            ]
+        else:
+            # A match shares >= threshold grams with the query, so it must contain at
+            # least one of the (len - threshold + 1) rarest ones: union only those.
+            postings = sorted((self._trigger_gram_postings.get(gram, set()) for gram in grams), key=len)
+            pool: Set[str] = set()
+            for bucket in postings[: len(grams) - threshold + 1]:
+                pool |= bucket
+            candidates = [
+                trigger
+                for trigger in pool
+                if abs(len(trigger) - len(query)) <= bound
+                and sum(1 for gram in grams if trigger in self._trigger_gram_postings.get(gram, ())) >= threshold
+            ]
+        matches: List[Tuple[str, int]] = []
+        for trigger in candidates:
+            distance = bounded_levenshtein(query, trigger, bound)
+            if distance is not None:
+                matches.append((trigger, distance))
+        return matches
+
+    def _search_ids(
+        self,
+        query: str,
+        filters: Dict[str, Any],
+        interpret_bool: Callable[[Any], bool],
+        prefix: bool,
+    ) -> List[int]:
+        normalized = (query or "").strip().lower()
+        candidates = self._filter_candidates(filters, interpret_bool)
+
+        if normalized and prefix:
+            matched = self._prefix_ids(normalized)
+            candidates = matched if candidates is None else candidates & matched
+            results = [doc_id for doc_id in candidates if doc_id in self._haystacks]
+        else:
+            results = self._substring_ids(normalized, candidates)
+
+        label_filter = (filters.get("label") or "").strip().lower()
+        if label_filter:
+            snippets = self._snippets
+            results = [
+                doc_id for doc_id in results if label_filter in (snippets[doc_id].get("label") or "").lower()
+            ]
+        results.sort(key=self._order.__getitem__)
+        return results
+
+    def _substring_ids(self, normalized: str, candidates: Optional[Set[int]]) -> List[int]:
+        """Unsorted ids whose haystack contains `normalized` (restricted to `candidates`)."""
+        if normalized:
+            candidates = self._gram_candidates(normalized, candidates)
+        elif candidates is None:
+            candidates = set(self._snippets)
+        haystacks = self._haystacks
+        if not normalized:
+            return [doc_id for doc_id in candidates if doc_id in haystacks]
+        lazy = self._lazy_docs
+        found: List[int] = []
+        pending: Set[int] = set()
+        for doc_id in candidates:
+            if normalized in haystacks.get(doc_id, ""):
+                found.append(doc_id)
+            elif doc_id in lazy:
+                pending.add(doc_id)
+        if not pending:
+            return found
+        if len(normalized) <= GRAM:
+            found.extend(pending)  # the postings (which include body grams) already answered exactly
+        else:
+            found.extend(doc_id for doc_id in pending if self._body_contains(doc_id, normalized))
+        return found
+
+    def _body_contains(self, doc_id: int, normalized: str) -> bool:
+        """Check a spilled body's full text (its haystack only holds the preview)."""
+        return normalized in self._body_text(self._snippets[doc_id])
+
+    def _body_text(self, snippet: Dict[str, Any]) -> str:
+        """Lowercase full body of a spilled snippet ('' if it can no longer be read)."""
+        if self._bodies is None:
+            return ""
+        try:
+            return self._bodies.text(snippet.replace).lower()
+        except (KeyError, OSError):
+            return ""
+
+    def _doc_grams(self, doc_id: int) -> Set[str]:
+        grams = _indexed_grams(self._haystacks[doc_id])
+        if doc_id in self._lazy_docs:
+            grams |= _indexed_grams(self._body_text(self._snippets[doc_id]))
+        return grams
+
+    def _filter_candidates(self, filters: Dict[str, Any], interpret_bool: Callable[[Any], bool]) -> Optional[Set[int]]:
+        """Intersect the exact-match filter sets; None means 'no restriction'."""
+        restrictions: List[Set[int]] = []
+        file_filter = (filters.get("file") or "").strip().lower()
+        if file_filter:
+            restrictions.append(self._file_filter.get(file_filter, set()))
+        if interpret_bool(filters.get("hasVars")):
+            restrictions.append(self._has_vars)
+        if interpret_bool(filters.get("hasForm")):
+            restrictions.append(self._has_form)
+
+        enabled_filter = (filters.get("enabled") or "").strip().lower()
+        if enabled_filter == "disabled":
+            restrictions.append(self._disabled)
+
+        if restrictions:
+            restrictions.sort(key=len)
+            candidates = set(restrictions[0])
+            for restriction in restrictions[1:]:
+                candidates &= restriction
+        else:
+            candidates = None
+
+        if enabled_filter == "enabled":
+            if candidates is None:
+                candidates = set(self._snippets)
+            candidates -= self._disabled
+        return candidates
+
+    def _gram_candidates(self, query: str, restrict: Optional[Set[int]]) -> Set[int]:
+        lists: List[array] = []
+        for gram in _grams(query) if len(query) >= GRAM else (query,):
+            postings = self._postings.get(gram)
+            if postings is None:
+                return set()
+            lists.append(postings)
+        lists.sort(key=len)
+        smallest, others = lists[0], lists[1:3]
+        if restrict is not None and len(restrict) < len(smallest):
+            candidates = {doc_id for doc_id in restrict if _contains(smallest, doc_id)}
+        else:
+            candidates = set(smallest)
+            if restrict is not None:
+                candidates &= restrict
+        for postings in others:
+            if len(candidates) * 8 < len(postings):
+                candidates = {doc_id for doc_id in candidates if _contains(postings, doc_id)}
+            else:
+                candidates.intersection_update(postings)
+        return candidates
+
+    def _prefix_ids(self, prefix: str) -> Set[int]:
+        index = bisect.bisect_left(self._triggers, (prefix, -1))
+        found: Set[int] = set()
+        while index < len(self._triggers):
+            trigger, doc_id = self._triggers[index]
+            if not trigger.startswith(prefix):
+                break
+            found.add(doc_id)
+            index += 1
+        return found
+
+    def _add_doc(self, position: int, snippet: Dict[str, Any]) -> int:
+        doc_id = self._next_id
+        self._next_id += 1
+        haystack = _haystack(snippet)
+        file_label = snippet.get("file") or ""
+        self._snippets[doc_id] = snippet
+        self._haystacks[doc_id] = haystack
+        self._order[doc_id] = (file_label, position)
+        triggers = list(dict.fromkeys(trigger.lower() for trigger in snippet_triggers(snippet)))
+        self._trigger_keys[doc_id] = tuple((trigger, doc_id) for trigger in triggers)
+        for trigger in triggers:
+            docs = self._trigger_docs.get(trigger)
+            if docs is None:
+                docs = self._trigger_docs[trigger] = set()
+                self._trigger_lengths.setdefault(len(trigger), set()).add(trigger)
+                for gram in _trigger_grams(trigger):
+                    self._trigger_gram_postings.setdefault(gram, set()).add(trigger)
+            docs.add(doc_id)
+        if isinstance(getattr(snippet, "replace", None), LazyBody):
+            self._lazy_docs.add(doc_id)
+        for gram in self._doc_grams(doc_id):
+            postings = self._postings.get(gram)
+            if postings is None:
+                postings = self._postings[gram] = array("i")
+            postings.append(doc_id)
+        self._file_filter.setdefault(file_label.lower(), set()).add(doc_id)
+        if snippet.get("enabled", True) is False:
+            self._disabled.add(doc_id)
+        if snippet.get("hasVars"):
+            self._has_vars.add(doc_id)
+        if snippet.get("hasForm"):
+            self._has_form.add(doc_id)
+        return doc_id
+
+    def _remove_docs(self, key: str) -> Set[Tuple[str, int]]:
+        removed: Set[Tuple[str, int]] = set()
+        for doc_id in self._files.pop(key, []):
+            snippet = self._snippets.pop(doc_id, None)
+            if snippet is None:
+                continue
+            self._dead += 1
+            self._haystacks.pop(doc_id, None)
+            self._order.pop(doc_id, None)
+            for trigger_key in self._trigger_keys.pop(doc_id):
+                removed.add(trigger_key)
+                self._forget_trigger_doc(trigger_key[0], doc_id)
+            file_key = (snippet.get("file") or "").lower()
+            members = self._file_filter.get(file_key)
+            if members is not None:
+                members.discard(doc_id)
+                if not members:
+                    self._file_filter.pop(file_key, None)
+            self._disabled.discard(doc_id)
+            self._has_vars.discard(doc_id)
+            self._has_form.discard(doc_id)
+            self._lazy_docs.discard(doc_id)
+        return removed
+
+    def _forget_trigger_doc(self, trigger: str, doc_id: int) -> None:
+        docs = self._trigger_docs.get(trigger)
+        if docs is None:
+            return
+        docs.discard(doc_id)
+        if docs:
+            return
+        del self._trigger_docs[trigger]
+        same_length = self._trigger_lengths.get(len(trigger))
+        if same_length is not None:
+            same_length.discard(trigger)
+            if not same_length:
+                del self._trigger_lengths[len(trigger)]
+        for gram in _trigger_grams(trigger):
+            bucket = self._trigger_gram_postings.get(gram)
+            if bucket is not None:
+                bucket.discard(trigger)
+                if not bucket:
+                    del self._trigger_gram_postings[gram]
+
+    def _merge_triggers(self, removed: Set[Tuple[str, int]], added: List[Tuple[str, int]]) -> None:
+        """Keep the sorted trigger list current with one linear pass instead of per-item inserts."""
+        if removed:
+            self._triggers = [item for item in self._triggers if item not in removed]
+        if added:
+            self._triggers.extend(added)
+            self._triggers.sort()
+
+    def _maybe_compact(self) -> None:
+        """Rebuild postings without tombstoned ids once they dominate."""
+        if self._dead <= max(1024, len(self._snippets)):
+            return
+        postings: Dict[str, array] = {}
+        for doc_id in sorted(self._haystacks):
+            for gram in self._doc_grams(doc_id):
+                bucket = postings.get(gram)
+                if bucket is None:
+                    bucket = postings[gram] = array("i")
+                bucket.append(doc_id)
+        self._postings = postings
+        self._dead = 0
+
+
+"""
+CHANGELOG
+2026-10-18 Codex
+- Added SnippetSearchIndex (trigram postings, filter sets, sorted trigger list) so search_snippets no longer rescans every snippet per keystroke.
+2026-10-18 Codex
+- Added search_ranked: typo-tolerant trigger matching via bigram-count candidate filtering plus bounded Levenshtein, ranked exact > prefix > trigger > fuzzy > label > body.
+2026-10-18 Codex
+- Snippets with spilled (lazy) bodies are indexed by preview and verified against the full body from the BodyStore.
+2026-10-18 Codex
+- Spilled bodies contribute their full-body grams to the postings, so only gram candidates are read back for verification (queries of up to 3 characters need no read at all).
+2026-10-18 Codex
+- Prefix, fuzzy and substring search index every entry of a snippet's `triggers` list, not just `trigger`.
+2026-10-18 Codex
+- Unigrams and bigrams are posted too, so 1-2 character queries no longer scan every snippet's haystack.
+"""
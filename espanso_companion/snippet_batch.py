@@ -0,0 +1,281 @@
+"""In-memory batch editing of match files, committed with one write per touched file."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .workspace_index import is_yaml_name
+
+OPERATIONS = ("create", "update", "delete", "move")
+
+DEFAULT_MATCH_FILE = "base.yml"
+
+
+class BatchConflict(ValueError):
+    """An operation that cannot be applied; aborts the batch unless conflicts are skipped."""
+
+
+@dataclass
+class BatchOperation:
+    op: str
+    trigger: str = ""
+    snippet: Dict[str, Any] = field(default_factory=dict)
+    file: Optional[str] = None  # None: the file that defines `trigger` (base.yml for creates)
+    target: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, raw: Any) -> "BatchOperation":
+        """Parse one frontend operation: {op, trigger?, snippet?, file?, target?}."""
+        if not isinstance(raw, dict):
+            raise BatchConflict("Operation must be an object")
+        op = str(raw.get("op") or "").lower()
+        if op not in OPERATIONS:
+            raise BatchConflict(f"Unknown operation '{raw.get('op')}'")
+        snippet = raw.get("snippet") or {}
+        if not isinstance(snippet, dict):
+            raise BatchConflict("Operation snippet must be an object")
+        trigger = str(raw.get("trigger") or snippet.get("trigger") or "").strip()
+        return cls(
+            op=op,
+            trigger=trigger,
+            snippet=snippet,
+            file=str(raw["file"]) if raw.get("file") else None,
+            target=str(raw["target"]) if raw.get("target") else None,
+        )
+
+
+@dataclass
+class SourceItem:
+    """A `matches` item read from the source lines the cache recorded, and how to rewrite it in place."""
+
+    match: Dict[str, Any]
+    rewrite: Callable[[Optional[Dict[str, Any]]], Optional[str]]  # new file text (None deletes); None if unsafe
+    only: bool  # the file's only item, so deleting it needs a full rewrite
+
+
+def defines(match: Any, trigger: str) -> bool:
+    """True if a raw match answers to `trigger` (its `trigger` or one of its `triggers`)."""
+    if not isinstance(match, dict):
+        return False
+    return match.get("trigger") == trigger or trigger in (match.get("triggers") or [])
+
+
+class SnippetBatch:
+    """Applies operations to loaded match documents without touching disk.
+
+    `build_match(snippet_data, existing)` turns editor data into a match dict
+    (raising ValueError when invalid). `defined_in(trigger)` names the match files
+    the live cache says define a trigger; files already loaded into the batch are
+    judged by their in-memory state instead, so earlier operations are respected.
+    Operations on existing snippets without a `file` go to whichever file defines
+    the trigger.
+
+    With `read_item(path, trigger)`, a batch's first update or delete goes
+    straight to the item at its recorded source lines and splices the file text,
+    without parsing the whole file; `read_item` returns None when the file
+    changed since it was cached, and the operation falls back to loading the
+    file. A later operation in the same batch replays that first one on the
+    loaded document.
+    """
+
+    def __init__(
+        self,
+        match_root: Path,
+        load: Callable[[Path], Dict[str, Any]],
+        build_match: Callable[[Dict[str, Any], Optional[Dict[str, Any]]], Dict[str, Any]],
+        defined_in: Callable[[str], List[str]],
+        read_item: Optional[Callable[[Path, str], Optional[SourceItem]]] = None,
+    ) -> None:
+        self._root = match_root
+        self._load = load
+        self._build_match = build_match
+        self._defined_in = defined_in
+        self._documents: Dict[Path, Dict[str, Any]] = {}
+        self._existed: Dict[Path, bool] = {}
+        self._touched: List[Path] = []
+        self._read_item = read_item
+        self._texts: Dict[Path, str] = {}  # files edited in place, as their new text
+        self._in_place: Optional[BatchOperation] = None
+
+    @property
+    def touched(self) -> List[Path]:
+        return list(self._touched)
+
+    def document(self, path: Path) -> Dict[str, Any]:
+        return self._documents[path]
+
+    def text(self, path: Path) -> Optional[str]:
+        """New text of a file edited in place (None: write `document(path)`)."""
+        return self._texts.get(path)
+
+    def existed(self, path: Path) -> bool:
+        return self._existed.get(path, False)
+
+    def label(self, path: Path) -> str:
+        return path.relative_to(self._root).as_posix()
+
+    def apply(self, operation: BatchOperation) -> str:
+        """Apply one operation in memory and return a human-readable detail line."""
+        if self._in_place is not None:
+            self._replay_in_place()
+        if not self._touched:
+            detail = self._apply_in_place(operation)
+            if detail is not None:
+                return detail
+        handler = getattr(self, f"_apply_{operation.op}")
+        return handler(operation)
+
+    def _apply_create(self, operation: BatchOperation) -> str:
+        path = self._resolve(operation.file or DEFAULT_MATCH_FILE)
+        match = self._build(operation.snippet, None)
+        trigger = match["trigger"]
+        self._ensure_unique(trigger)
+        self._matches(path, create=True).append(match)
+        self._touch(path)
+        return f"Created snippet '{trigger}'"
+
+    def _apply_update(self, operation: BatchOperation) -> str:
+        path = self._owner(operation)
+        matches = self._matches(path)
+        index = self._find(matches, operation.trigger, path)
+        updated, trigger = self._updated(operation, matches[index])
+        matches[index] = updated
+        self._touch(path)
+        return f"Updated snippet '{trigger}'"
+
+    def _updated(self, operation: BatchOperation, original: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
+        updated = self._build(operation.snippet, original)
+        if updated["trigger"] != operation.trigger:
+            self._ensure_unique(updated["trigger"])
+        trigger = updated["trigger"]
+        if "trigger" not in original and isinstance(original.get("triggers"), list):
+            # Keep a `triggers`-only match in list form, renaming just the edited entry
+            del updated["trigger"]
+            updated["triggers"] = [trigger if item == operation.trigger else item for item in original["triggers"]]
+        return updated, trigger
+
+    def _apply_in_place(self, operation: BatchOperation) -> Optional[str]:
+        """Splice an update/delete into the file text at the item's recorded lines (None: not possible)."""
+        if self._read_item is None or operation.op not in ("update", "delete"):
+            return None
+        path = self._owner(operation)
+        item = self._read_item(path, operation.trigger)
+        if item is None:
+            return None
+        if operation.op == "delete":
+            if item.only:
+                return None
+            text = item.rewrite(None)
+            detail = f"Deleted snippet '{operation.trigger}'"
+        else:
+            updated, trigger = self._updated(operation, item.match)
+            text = item.rewrite(updated)
+            detail = f"Updated snippet '{trigger}'"
+        if text is None:
+            return None
+        self._texts[path] = text
+        self._existed[path] = True
+        self._in_place = operation
+        self._touch(path)
+        return detail
+
+    def _replay_in_place(self) -> None:
+        """Redo the in-place operation on the loaded document so later operations see one state."""
+        operation, self._in_place = self._in_place, None
+        self._texts.clear()
+        self._touched.clear()
+        getattr(self, f"_apply_{operation.op}")(operation)
+
+    def _apply_delete(self, operation: BatchOperation) -> str:
+        path = self._owner(operation)
+        matches = self._matches(path)
+        del matches[self._find(matches, operation.trigger, path)]
+        self._touch(path)
+        return f"Deleted snippet '{operation.trigger}'"
+
+    def _apply_move(self, operation: BatchOperation) -> str:
+        source = self._owner(operation)
+        if not operation.target:
+            raise BatchConflict(f"Move of '{operation.trigger}' needs a target file")
+        target = self._resolve(operation.target)
+        if target == source:
+            return f"'{operation.trigger}' already in {self.label(target)}"
+        matches = self._matches(source)
+        index = self._find(matches, operation.trigger, source)
+        target_matches = self._matches(target, create=True)
+        target_matches.append(matches.pop(index))
+        self._touch(source)
+        self._touch(target)
+        return f"Moved snippet '{operation.trigger}' to {self.label(target)}"
+
+    def _build(self, snippet: Dict[str, Any], existing: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        try:
+            return self._build_match(snippet, existing)
+        except ValueError as exc:
+            raise BatchConflict(str(exc)) from exc
+
+    def _resolve(self, label: str) -> Path:
+        """Map a match-relative label to a path, refusing anything outside the match directory."""
+        relative = PurePosixPath(label.replace("\\", "/"))
+        if relative.is_absolute() or ".." in relative.parts or not is_yaml_name(relative.name):
+            raise BatchConflict(f"Invalid match file '{label}'")
+        return self._root.joinpath(*relative.parts)
+
+    def _owner(self, operation: BatchOperation) -> Path:
+        """The file an operation on an existing snippet targets: its `file`, else the one defining the trigger."""
+        if operation.file:
+            return self._resolve(operation.file)
+        for path, document in self._documents.items():
+            if any(defines(match, operation.trigger) for match in document.get("matches") or []):
+                return path
+        loaded = {self.label(path) for path in self._documents}
+        for label in self._defined_in(operation.trigger):
+            if label not in loaded:
+                return self._resolve(label)
+        return self._resolve(DEFAULT_MATCH_FILE)
+
+    def _matches(self, path: Path, create: bool = False) -> List[Dict[str, Any]]:
+        if path not in self._documents:
+            exists = path.exists()
+            if not exists and not create:
+                raise BatchConflict(f"{self.label(path)} not found")
+            self._documents[path] = self._load(path) if exists else {"matches": []}
+            self._existed[path] = exists
+        document = self._documents[path]
+        matches = document.get("matches")
+        if not isinstance(matches, list):
+            matches = document["matches"] = []
+        return matches
+
+    @staticmethod
+    def _find(matches: List[Dict[str, Any]], trigger: str, path: Path) -> int:
+        for index, match in enumerate(matches):
+            if defines(match, trigger):
+                return index
+        raise BatchConflict(f"Snippet '{trigger}' not found in {path.name}")
+
+    def _ensure_unique(self, trigger: str) -> None:
+        for path, document in self._documents.items():
+            if any(defines(match, trigger) for match in document.get("matches") or []):
+                raise BatchConflict(f"Snippet '{trigger}' already exists in {self.label(path)}")
+        loaded = {self.label(path) for path in self._documents}
+        for label in self._defined_in(trigger):
+            if label not in loaded:
+                raise BatchConflict(f"Snippet '{trigger}' already exists in {label}")
+
+    def _touch(self, path: Path) -> None:
+        if path not in self._touched:
+            self._touched.append(path)
+
+
+"""
+CHANGELOG
+2026-10-18 Codex
+- Added SnippetBatch so create/update/delete/move operations are validated in memory and committed with one write per touched file.
+2026-10-18 Codex
+- Update/delete/move without a `file` target the file that defines the trigger; `triggers` lists count when finding and de-duplicating snippets.
+2026-10-18 Codex
+- A batch's first update/delete can splice the item at its located source lines (`read_item`/SourceItem) instead of parsing and scanning the whole file.
+"""
@@ -0,0 +1,109 @@
+"""Trigger → owning match file index, maintained from the cached snippet records."""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from .trigger_trie import snippet_triggers
+
+
+@dataclass(frozen=True)
+class SnippetLocation:
+    trigger: str
+    file: str  # match-relative label
+    key: str  # cache key of the file
+    index: int  # position in the file's `matches` list
+    line: Optional[int] = None
+    end_line: Optional[int] = None
+    record: Dict[str, Any] = field(default_factory=dict, compare=False, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trigger": self.trigger,
+            "file": self.file,
+            "index": self.index,
+            "line": self.line,
+            "endLine": self.end_line,
+        }
+
+
+class SnippetLocator:
+    """Maps every trigger (including `triggers` lists and disabled snippets) to where it is defined.
+
+    Swapped one file at a time alongside the search index and trigger trie, so
+    resolving a trigger is a dict lookup instead of a parse of base.yml.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._by_trigger: Dict[str, List[SnippetLocation]] = {}
+        self._files: Dict[str, List[SnippetLocation]] = {}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._by_trigger)
+
+    def keys(self) -> Set[str]:
+        with self._lock:
+            return set(self._files)
+
+    def replace_file(self, key: str, snippets: Iterable[Dict[str, Any]]) -> None:
+        locations: List[SnippetLocation] = []
+        for position, snippet in enumerate(snippets):
+            index = snippet.get("index")
+            for trigger in snippet_triggers(snippet):
+                locations.append(
+                    SnippetLocation(
+                        trigger=trigger,
+                        file=str(snippet.get("file") or ""),
+                        key=key,
+                        index=position if index is None else index,
+                        line=snippet.get("line"),
+                        end_line=snippet.get("endLine"),
+                        record=snippet,
+                    )
+                )
+        with self._lock:
+            self._forget(key)
+            self._files[key] = locations
+            for location in locations:
+                self._by_trigger.setdefault(location.trigger, []).append(location)
+
+    def remove_file(self, key: str) -> None:
+        with self._lock:
+            self._forget(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._by_trigger.clear()
+            self._files.clear()
+
+    def locate(self, trigger: str, file: Optional[str] = None) -> List[SnippetLocation]:
+        """Every definition of `trigger` (optionally only in match file `file`), ordered by file then index."""
+        with self._lock:
+            found = list(self._by_trigger.get(trigger, ()))
+        if file:
+            found = [location for location in found if location.file == file]
+        return sorted(found, key=lambda location: (location.file, location.index))
+
+    def first(self, trigger: str, file: Optional[str] = None) -> Optional[SnippetLocation]:
+        found = self.locate(trigger, file)
+        return found[0] if found else None
+
+    def _forget(self, key: str) -> None:
+        for location in self._files.pop(key, ()):
+            bucket = self._by_trigger.get(location.trigger)
+            if bucket is None:
+                continue
+            bucket[:] = [item for item in bucket if item.key != key]
+            if not bucket:
+                del self._by_trigger[location.trigger]
+
+
+"""
+CHANGELOG
+2026-10-18 Codex
+- Added SnippetLocator so snippet lookups and edits resolve the owning match file, index and source lines from the cache in O(1).
+"""
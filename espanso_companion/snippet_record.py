@@ -0,0 +1,181 @@
+"""Compact, read-only snippet records for the match cache."""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .body_store import LazyBody
+
+# Bridge key -> attribute, in the order the dashboard has always received them
+FIELDS: Tuple[Tuple[str, Optional[str]], ...] = (
+    ("name", "name"),
+    ("trigger", "trigger"),
+    ("triggers", "triggers"),
+    ("replace", "replace"),
+    ("variables", "variables"),
+    ("enabled", "enabled"),
+    ("file", "file"),
+    ("label", "label"),
+    ("backend", "backend"),
+    ("delay", "delay"),
+    ("left_word", "left_word"),
+    ("right_word", "right_word"),
+    ("uppercase_style", "uppercase_style"),
+    ("image_path", "image_path"),
+    ("word", "word"),
+    ("propagate_case", "propagate_case"),
+    ("form", "form"),
+    ("hasForm", None),
+    ("hasVars", None),
+    ("index", "index"),
+    ("line", "line"),
+    ("endLine", "end_line"),
+)
+KEYS: Tuple[str, ...] = tuple(key for key, _ in FIELDS)
+_ATTRIBUTES: Dict[str, Optional[str]] = dict(FIELDS)
+_POSITION = ("index", "line", "end_line")
+
+EMPTY: Tuple[Any, ...] = ()  # shared by every snippet without triggers/vars
+
+
+def _short(value: Any) -> Any:
+    """Intern the short repeated strings (labels, backends, styles); leave anything else alone."""
+    return sys.intern(value) if isinstance(value, str) and len(value) <= 64 else value
+
+
+def sanitize_delay_value(value: Any) -> Optional[int]:
+    if value in (None, "", False):
+        return None
+    try:
+        delay = int(value)
+    except (TypeError, ValueError):
+        return None
+    return delay if delay >= 0 else None
+
+
+class SnippetRecord(Mapping):
+    """One snippet as slots instead of a 22-key dict.
+
+    Reads like the dict it replaces (`record["trigger"]`, `.get()`, iteration), so
+    indexes and views need no changes; `to_dict()` builds a real dict only where
+    one must cross the JS bridge or be mutated. A `replace` spilled to a BodyStore
+    holds a LazyBody; the mapping view then shows its preview.
+    """
+
+    __slots__ = (
+        "name", "trigger", "triggers", "replace", "variables", "enabled", "file", "label",
+        "backend", "delay", "left_word", "right_word", "uppercase_style", "image_path", "word",
+        "propagate_case", "form", "index", "line", "end_line",
+    )
+
+    @classmethod
+    def from_raw(
+        cls,
+        raw: Dict[str, Any],
+        file: str,
+        index: Optional[int] = None,
+        line: Optional[int] = None,
+        end_line: Optional[int] = None,
+    ) -> "SnippetRecord":
+        """Build straight from a parsed `matches` item (no intermediate dataclass)."""
+        record = cls.__new__(cls)
+        triggers = raw.get("triggers")
+        variables = raw.get("vars")
+        record.name = raw.get("name", "")
+        record.trigger = raw.get("trigger", "")
+        record.triggers = tuple(item for item in triggers if isinstance(item, str)) if triggers else EMPTY
+        record.replace = raw.get("replace", "")
+        record.variables = variables if variables else EMPTY
+        record.enabled = raw.get("enabled", True)
+        record.file = sys.intern(file)
+        record.label = _short(raw.get("label") or "")
+        record.backend = _short(raw.get("backend") or "")
+        record.delay = sanitize_delay_value(raw.get("delay"))
+        record.left_word = bool(raw.get("left_word", False))
+        record.right_word = bool(raw.get("right_word", False))
+        record.uppercase_style = _short(raw.get("uppercase_style") or "")
+        record.image_path = raw.get("image_path") or ""
+        record.word = bool(raw.get("word", False))
+        record.propagate_case = bool(raw.get("propagate_case", False))
+        record.form = raw.get("form")
+        record.index = index
+        record.line = line
+        record.end_line = end_line
+        return record
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "hasForm":
+            return bool(self.form)
+        if key == "hasVars":
+            return bool(self.variables)
+        attribute = _ATTRIBUTES.get(key)
+        if attribute is None:
+            raise KeyError(key)
+        value = getattr(self, attribute)
+        return value.preview if value.__class__ is LazyBody else value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key: object) -> bool:
+        return key in _ATTRIBUTES
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(KEYS)
+
+    def __len__(self) -> int:
+        return len(KEYS)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SnippetRecord):
+            return self.__getstate__() == other.__getstate__()
+        return Mapping.__eq__(self, other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"SnippetRecord(file={self.file!r}, trigger={self.trigger!r}, index={self.index!r})"
+
+    def __getstate__(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state: Tuple[Any, ...]) -> None:
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+        self.file = sys.intern(self.file)
+
+    def content(self) -> Tuple[Any, ...]:
+        """Everything except the position in the file, for cheap change detection."""
+        return tuple(getattr(self, name) for name in self.__slots__ if name not in _POSITION)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {key: self[key] for key in KEYS}
+        data["triggers"] = list(self.triggers)
+        data["variables"] = [] if self.variables is EMPTY else self.variables
+        if self.replace.__class__ is LazyBody:
+            data["replaceLazy"] = True
+            data["replaceLength"] = self.replace.length
+        return data
+
+
+def as_dict(snippet: Mapping) -> Dict[str, Any]:
+    """A plain dict for the JS bridge (records are materialized, dicts pass through)."""
+    return snippet.to_dict() if isinstance(snippet, SnippetRecord) else snippet  # type: ignore[return-value]
+
+
+def as_dicts(snippets: Iterable[Mapping]) -> List[Dict[str, Any]]:
+    return [as_dict(snippet) for snippet in snippets]
+
+
+"""
+CHANGELOG
+2026-10-18 Codex
+- Added SnippetRecord (slotted, interned labels, shared empty sentinels, dict view on demand) to replace per-snippet dicts in the match cache.
+2026-10-18 Codex
+- A spilled `replace` reads as its preview; `to_dict` flags it with replaceLazy/replaceLength.
+"""
@@ -0,0 +1,174 @@
+"""Per-snippet revisions and tombstones so clients can sync the snippet cache by delta."""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .snippet_record import SnippetRecord, as_dict
+
+# Keys that only record where a snippet sits in its file; moving a snippet is not a change
+POSITION_KEYS = ("index", "line", "endLine")
+
+
+def snippet_id(file: str, trigger: str, occurrence: int = 0) -> str:
+    """Stable id of a snippet: its file and trigger (plus `#n` for repeats within the file)."""
+    base = f"{file}::{trigger}"
+    return f"{base}#{occurrence}" if occurrence else base
+
+
+def _content(record: Dict[str, Any]) -> Any:
+    if isinstance(record, SnippetRecord):
+        return record.content()
+    return {key: value for key, value in record.items() if key not in POSITION_KEYS}
+
+
+class SnippetRevisions:
+    """Versioned view of the snippet cache.
+
+    Every snippet carries the revision at which it last changed; removing one
+    leaves a tombstone with the removal's revision. `changes_since(r)` walks a
+    log ordered by revision, so it costs O(changes), not O(snippets). Only the
+    newest `tombstone_limit` tombstones are kept; a client older than that
+    gets a full reset instead of a delta. Swapped one file at a time, like the
+    search index and trigger trie.
+    """
+
+    def __init__(self, tombstone_limit: int = 5000) -> None:
+        self._lock = threading.RLock()
+        self._revision = 0
+        self._horizon = 0  # changes at or before this revision may be missing tombstones
+        self._tombstone_limit = tombstone_limit
+        self._live: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+        self._tombstones: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._log: "OrderedDict[str, int]" = OrderedDict()  # id -> revision, oldest first
+        self._files: Dict[str, List[str]] = {}
+
+    @property
+    def revision(self) -> int:
+        with self._lock:
+            return self._revision
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._live)
+
+    def keys(self) -> Set[str]:
+        with self._lock:
+            return set(self._files)
+
+    def replace_file(self, key: str, snippets: Iterable[Dict[str, Any]]) -> None:
+        """Record the current snippets of cache file `key`, bumping revisions only for real changes."""
+        incoming: Dict[str, Dict[str, Any]] = {}
+        seen: Dict[Tuple[str, str], int] = {}
+        for record in snippets:
+            identity = (str(record.get("file") or ""), str(record.get("trigger") or ""))
+            occurrence = seen.get(identity, 0)
+            seen[identity] = occurrence + 1
+            incoming[snippet_id(*identity, occurrence)] = record
+        with self._lock:
+            for item in self._files.get(key, ()):
+                if item not in incoming:
+                    self._remove(item)
+            for item, record in incoming.items():
+                current = self._live.get(item)
+                if current is None or _content(current[1]) != _content(record):
+                    self._bump(item)
+                    self._tombstones.pop(item, None)
+                    self._live[item] = (self._revision, record)
+                else:
+                    self._live[item] = (current[0], record)  # keep the revision, refresh positions
+            if incoming:
+                self._files[key] = list(incoming)
+            else:
+                self._files.pop(key, None)
+
+    def remove_file(self, key: str) -> None:
+        with self._lock:
+            for item in self._files.pop(key, ()):
+                self._remove(item)
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._files):
+                self.remove_file(key)
+
+    def changes_since(self, since: int, limit: Optional[int] = None) -> Dict[str, Any]:
+        """Snippets changed and tombstones created after revision `since`.
+
+        `reset` is True when `since` is 0, from the future, or older than the kept
+        tombstones; `changed` then holds every live snippet and the client should
+        drop its copy first. With `limit`, `truncated` says more changes exist.
+        """
+        with self._lock:
+            reset = since <= 0 or since > self._revision or since < self._horizon
+            if reset:
+                ids = list(self._live)
+            else:
+                ids = []
+                for item in reversed(self._log):
+                    if self._log[item] <= since:
+                        break
+                    ids.append(item)
+                ids.reverse()
+            truncated = limit is not None and not reset and len(ids) > limit
+            if truncated:
+                ids = ids[:limit]
+            changed: List[Dict[str, Any]] = []
+            removed: List[Dict[str, Any]] = []
+            revision = self._revision
+            for item in ids:
+                if item in self._live:
+                    item_revision, record = self._live[item]
+                    changed.append({**as_dict(record), "id": item, "revision": item_revision})
+                elif item in self._tombstones:
+                    removed.append(dict(self._tombstones[item]))
+            if truncated:
+                revision = self._log[ids[-1]]
+            return {"revision": revision, "reset": reset, "truncated": truncated, "changed": changed, "removed": removed}
+
+    def _bump(self, item: str) -> None:
+        self._revision += 1
+        self._log.pop(item, None)
+        self._log[item] = self._revision
+
+    def _remove(self, item: str) -> None:
+        _, record = self._live.pop(item)
+        self._bump(item)
+        self._tombstones.pop(item, None)
+        self._tombstones[item] = {
+            "id": item,
+            "file": record.get("file"),
+            "trigger": record.get("trigger"),
+            "revision": self._revision,
+        }
+        while len(self._tombstones) > self._tombstone_limit:
+            dropped, tombstone = self._tombstones.popitem(last=False)
+            self._log.pop(dropped, None)
+            self._horizon = max(self._horizon, tombstone["revision"])
+
+
+def merge_changes(first: Dict[str, Any], second: Dict[str, Any]) -> Dict[str, Any]:
+    """Fold two consecutive change sets (as pushed to the page) into one; the later state of an id wins."""
+    merged: Dict[str, Any] = {"from": first["from"], "revision": second["revision"]}
+    if "changed" not in first or "changed" not in second:
+        return merged  # one side was too large to inline; the page fetches changes_since(from)
+    state: "OrderedDict[str, Tuple[str, Dict[str, Any]]]" = OrderedDict()
+    for changes in (first, second):
+        for status in ("changed", "removed"):
+            for item in changes[status]:
+                state.pop(item["id"], None)
+                state[item["id"]] = (status, item)
+    merged["changed"] = [item for status, item in state.values() if status == "changed"]
+    merged["removed"] = [item for status, item in state.values() if status == "removed"]
+    return merged
+
+
+"""
+CHANGELOG
+2026-10-18 Codex
+- Added SnippetRevisions (per-snippet revisions, bounded tombstones, O(changes) changes_since) for delta sync of the snippet cache.
+2026-10-18 Codex
+- Compares SnippetRecords by their content tuple and materializes them when reporting changes.
+"""
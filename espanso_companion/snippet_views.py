@@ -0,0 +1,133 @@
+"""Paging, sorting and field projection for snippet lists sent over the JS bridge."""
+
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .snippet_record import as_dict
+
+SORT_KEYS = ("trigger", "label", "file", "enabled", "replace", "name")
+
+FIELD_PRESETS: Dict[str, Sequence[str]] = {
+    "summary": ("trigger", "label", "file", "enabled", "hasVars", "hasForm", "preview"),
+    "compact": ("trigger", "label", "file", "preview"),
+}
+
+DEFAULT_PREVIEW_CHARS = 80
+
+
+@dataclass
+class PageRequest:
+    offset: int = 0
+    limit: Optional[int] = None
+    sort: Optional[str] = None
+    descending: bool = False
+    fields: Optional[List[str]] = None
+    preview_chars: int = DEFAULT_PREVIEW_CHARS
+
+    @classmethod
+    def from_options(cls, options: Optional[Dict[str, Any]]) -> "PageRequest":
+        """Build a request from the loosely typed options dict the frontend sends."""
+        options = options or {}
+        return cls(
+            offset=max(0, _as_int(options.get("offset"), 0)),
+            limit=_as_limit(options.get("limit")),
+            sort=options.get("sort") if options.get("sort") in SORT_KEYS else None,
+            descending=str(options.get("order") or "asc").lower() == "desc",
+            fields=_as_fields(options.get("fields")),
+            preview_chars=max(1, _as_int(options.get("previewLength"), DEFAULT_PREVIEW_CHARS)),
+        )
+
+    @property
+    def is_default(self) -> bool:
+        return not self.offset and self.limit is None and self.sort is None and self.fields is None
+
+
+def _as_int(value: Any, default: int) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _as_limit(value: Any) -> Optional[int]:
+    if value in (None, "", 0, "0"):
+        return None
+    limit = _as_int(value, 0)
+    return limit if limit > 0 else None
+
+
+def _as_fields(value: Any) -> Optional[List[str]]:
+    if not value:
+        return None
+    if isinstance(value, str):
+        preset = FIELD_PRESETS.get(value)
+        return list(preset) if preset else [value]
+    return [str(item) for item in value]
+
+
+def _sort_key(name: str) -> Callable[[Dict[str, Any]], Any]:
+    if name == "enabled":
+        return lambda snippet: snippet.get("enabled", True) is not False
+    return lambda snippet: str(snippet.get(name) or "").lower()
+
+
+def preview_text(text: Any, limit: int) -> str:
+    if not isinstance(text, str):
+        return ""
+    flattened = " ".join(text.split())
+    return flattened if len(flattened) <= limit else flattened[: max(0, limit - 1)] + "…"
+
+
+def project(snippet: Dict[str, Any], fields: Sequence[str], preview_chars: int) -> Dict[str, Any]:
+    """Copy only the requested keys; `preview` is a whitespace-collapsed, truncated `replace`."""
+    projected: Dict[str, Any] = {}
+    for name in fields:
+        if name == "preview":
+            projected["preview"] = preview_text(snippet.get("replace"), preview_chars)
+        elif name in snippet:
+            projected[name] = snippet[name]
+    return projected
+
+
+def page_snippets(snippets: Sequence[Dict[str, Any]], request: PageRequest) -> Dict[str, Any]:
+    """Slice (and optionally sort/project) `snippets`, returning the page plus cursor metadata."""
+    total = len(snippets)
+    end = None if request.limit is None else request.offset + request.limit
+
+    if request.sort:
+        key = _sort_key(request.sort)
+        if end is not None and end < total // 4:
+            # Only the first `end` items are needed: O(n log k) instead of a full sort
+            picker = heapq.nlargest if request.descending else heapq.nsmallest
+            ordered: Sequence[Dict[str, Any]] = picker(end, snippets, key=key)
+        else:
+            ordered = sorted(snippets, key=key, reverse=request.descending)
+    else:
+        ordered = snippets
+
+    page = list(ordered[request.offset:end])
+    if request.fields is not None:
+        page = [project(snippet, request.fields, request.preview_chars) for snippet in page]
+    else:
+        page = [as_dict(snippet) for snippet in page]
+
+    next_offset = end if end is not None and end < total else None
+    return {
+        "results": page,
+        "count": total,
+        "offset": request.offset,
+        "limit": request.limit,
+        "nextOffset": next_offset,
+    }
+
+
+"""
+CHANGELOG
+2026-10-18 Codex
+- Added PageRequest/page_snippets so list and search responses can be paged, sorted server-side and projected to a few fields plus a preview.
+2026-10-18 Codex
+- Unprojected pages materialize SnippetRecords into plain dicts for the bridge.
+"""
@@ -0,0 +1,339 @@
+"""Character trie over match triggers for duplicate and shadowing analysis."""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# Espanso's default `word_separators`; a right-word-bounded trigger only fires
+# once one of these follows it, a left-word-bounded one only right after one.
+WORD_SEPARATORS = frozenset(" ,.?!\r\n\t;:\"')]}>")
+
+_END = ""  # node key holding the entries that terminate at a node (never a real character)
+
+
+@dataclass(frozen=True)
+class TriggerEntry:
+    trigger: str
+    file: str
+    key: str
+    word: bool = False
+    left_word: bool = False
+    right_word: bool = False
+
+    @property
+    def needs_left_boundary(self) -> bool:
+        return self.word or self.left_word
+
+    @property
+    def needs_right_boundary(self) -> bool:
+        return self.word or self.right_word
+
+
+@dataclass
+class TriggerConflict:
+    kind: str  # "duplicate", "prefix" or "infix" (`trigger` occurs inside `other`, not at its start)
+    trigger: str
+    entries: List[TriggerEntry]
+    other: Optional[str] = None
+    other_entries: List[TriggerEntry] = field(default_factory=list)
+    mitigated: bool = False
+
+    @property
+    def detail(self) -> str:
+        if self.kind == "duplicate":
+            files = sorted({entry.file for entry in self.entries})
+            return f"'{self.trigger}' is defined {len(self.entries)} times ({', '.join(files)})"
+        relation = "a prefix of" if self.kind == "prefix" else "inside"
+        if self.mitigated:
+            return f"'{self.trigger}' is {relation} '{self.other}' but only fires at a word boundary"
+        return f"'{self.trigger}' fires before '{self.other}' can be typed"
+
+
+def snippet_triggers(snippet: Dict[str, Any]) -> List[str]:
+    """Every trigger a snippet answers to (`trigger` plus any `triggers` list)."""
+    triggers: List[str] = []
+    for trigger in [snippet.get("trigger"), *(snippet.get("triggers") or [])]:
+        if isinstance(trigger, str) and trigger and trigger not in triggers:
+            triggers.append(trigger)
+    return triggers
+
+
+def shadow_is_mitigated(short: TriggerEntry, long_trigger: str, start: int = 0) -> bool:
+    """`short`, typed as part of `long_trigger` from `start`, only steals the expansion if no boundary stops it.
+
+    At `start == 0` the left boundary is whatever precedes the long trigger too,
+    so only a required right boundary can help; further in, a required left
+    boundary also does unless a word separator precedes the occurrence.
+    """
+    end = start + len(short.trigger)
+    if short.needs_right_boundary and end < len(long_trigger) and long_trigger[end] not in WORD_SEPARATORS:
+        return True
+    return short.needs_left_boundary and start > 0 and long_trigger[start - 1] not in WORD_SEPARATORS
+
+
+def inner_starts(short: str, long_trigger: str) -> List[int]:
+    """Positions after the first character where `short` occurs and ends before `long_trigger` does."""
+    starts: List[int] = []
+    position = long_trigger.find(short, 1)
+    while position != -1 and position + len(short) < len(long_trigger):
+        starts.append(position)
+        position = long_trigger.find(short, position + 1)
+    return starts
+
+
+class TriggerTrie:
+    """Enabled triggers keyed per source file, so reloads can swap one file at a time.
+
+    Exact lookups and "which triggers are prefixes of this one" walk a single
+    path, so checking a trigger costs O(len(trigger)) regardless of library size.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._root: Dict[str, Any] = {}
+        self._files: Dict[str, List[TriggerEntry]] = {}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(entries) for entries in self._files.values())
+
+    def keys(self) -> Set[str]:
+        with self._lock:
+            return set(self._files)
+
+    def replace_file(self, key: str, snippets: Iterable[Dict[str, Any]]) -> None:
+        """Swap the triggers that came from `key` (typically a file path) for those in `snippets`."""
+        entries = [
+            TriggerEntry(
+                trigger=trigger,
+                file=snippet.get("file") or "",
+                key=key,
+                word=bool(snippet.get("word")),
+                left_word=bool(snippet.get("left_word")),
+                right_word=bool(snippet.get("right_word")),
+            )
+            for snippet in snippets
+            if snippet.get("enabled", True) is not False
+            for trigger in snippet_triggers(snippet)
+        ]
+        with self._lock:
+            self._remove_entries(self._files.pop(key, []))
+            for entry in entries:
+                node = self._root
+                for char in entry.trigger:
+                    node = node.setdefault(char, {})
+                node.setdefault(_END, []).append(entry)
+            if entries:
+                self._files[key] = entries
+
+    def remove_file(self, key: str) -> None:
+        with self._lock:
+            self._remove_entries(self._files.pop(key, []))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._root = {}
+            self._files = {}
+
+    def lookup(self, trigger: str) -> List[TriggerEntry]:
+        """Entries defining exactly `trigger`."""
+        with self._lock:
+            node = self._find(trigger)
+            return list(node.get(_END, ())) if node is not None else []
+
+    def prefixes_of(self, trigger: str) -> List[TriggerEntry]:
+        """Entries whose trigger is a proper prefix of `trigger`, shortest first."""
+        found: List[TriggerEntry] = []
+        with self._lock:
+            node = self._root
+            for char in trigger[:-1]:
+                node = node.get(char)
+                if node is None:
+                    break
+                found.extend(node.get(_END, ()))
+        return found
+
+    def extensions_of(self, trigger: str, limit: Optional[int] = None) -> List[TriggerEntry]:
+        """Entries whose trigger starts with `trigger` (excluding `trigger` itself)."""
+        found: List[TriggerEntry] = []
+        with self._lock:
+            start = self._find(trigger)
+            if start is None:
+                return found
+            stack = [child for char, child in start.items() if char != _END]
+            while stack:
+                node = stack.pop()
+                found.extend(node.get(_END, ()))
+                if limit is not None and len(found) >= limit:
+                    return found[:limit]
+                stack.extend(child for char, child in node.items() if char != _END)
+        return found
+
+    def check(
+        self,
+        trigger: str,
+        *,
+        word: bool = False,
+        left_word: bool = False,
+        right_word: bool = False,
+        ignore: Optional[str] = None,
+        limit: int = 50,
+    ) -> List[TriggerConflict]:
+        """Conflicts a new or edited `trigger` would introduce (`ignore` is the trigger being replaced).
+
+        Prefix and duplicate checks walk one trie path; finding longer triggers
+        that contain `trigger` further in scans the distinct triggers once.
+        """
+        candidate = TriggerEntry(trigger=trigger, file="", key="", word=word, left_word=left_word, right_word=right_word)
+        conflicts: List[TriggerConflict] = []
+        duplicates = self.lookup(trigger)
+        if trigger == ignore:
+            duplicates = duplicates[1:]  # the definition being edited is not its own duplicate
+        if duplicates:
+            conflicts.append(TriggerConflict("duplicate", trigger, [candidate, *duplicates]))
+        by_trigger: Dict[str, List[TriggerEntry]] = {}
+        for entry in self.prefixes_of(trigger):
+            if entry.trigger != ignore:
+                by_trigger.setdefault(entry.trigger, []).append(entry)
+        for short, entries in by_trigger.items():
+            conflicts.append(
+                TriggerConflict(
+                    "prefix",
+                    short,
+                    entries,
+                    other=trigger,
+                    other_entries=[candidate],
+                    mitigated=all(shadow_is_mitigated(entry, trigger) for entry in entries),
+                )
+            )
+        by_trigger = {}
+        for entry in self.extensions_of(trigger, limit):
+            if entry.trigger != ignore:
+                by_trigger.setdefault(entry.trigger, []).append(entry)
+        for long_trigger, entries in sorted(by_trigger.items()):
+            conflicts.append(
+                TriggerConflict(
+                    "prefix",
+                    trigger,
+                    [candidate],
+                    other=long_trigger,
+                    other_entries=entries,
+                    mitigated=shadow_is_mitigated(candidate, long_trigger),
+                )
+            )
+        with self._lock:
+            for start, short, entries in self._inner_triggers(trigger):
+                entries = [entry for entry in entries if entry.trigger != ignore]
+                if entries:
+                    conflicts.append(self._infix(short, entries, trigger, [candidate], [start]))
+            longer: Dict[str, List[TriggerEntry]] = {}
+            for entries in self._files.values():
+                for entry in entries:
+                    if entry.trigger != ignore and trigger in entry.trigger:
+                        longer.setdefault(entry.trigger, []).append(entry)
+        for long_trigger, entries in sorted(longer.items()):
+            starts = inner_starts(trigger, long_trigger)
+            if starts:
+                conflicts.append(self._infix(trigger, [candidate], long_trigger, entries, starts))
+        return conflicts
+
+    def conflicts(self, *, include_mitigated: bool = True) -> List[TriggerConflict]:
+        """Every duplicate, prefix and infix collision in the library, grouped by the longer trigger."""
+        found: List[TriggerConflict] = []
+        with self._lock:
+            # (node, path, terminal ancestors as (trigger, entries))
+            stack: List[Tuple[Dict[str, Any], str, List[Tuple[str, List[TriggerEntry]]]]] = [(self._root, "", [])]
+            while stack:
+                node, path, ancestors = stack.pop()
+                entries = node.get(_END)
+                if entries:
+                    if len(entries) > 1:
+                        found.append(TriggerConflict("duplicate", path, list(entries)))
+                    for short, short_entries in ancestors:
+                        mitigated = all(shadow_is_mitigated(entry, path) for entry in short_entries)
+                        if mitigated and not include_mitigated:
+                            continue
+                        found.append(
+                            TriggerConflict(
+                                "prefix",
+                                short,
+                                list(short_entries),
+                                other=path,
+                                other_entries=list(entries),
+                                mitigated=mitigated,
+                            )
+                        )
+                    for start, short, short_entries in self._inner_triggers(path):
+                        conflict = self._infix(short, short_entries, path, list(entries), [start])
+                        if include_mitigated or not conflict.mitigated:
+                            found.append(conflict)
+                    ancestors = [*ancestors, (path, entries)]
+                for char in sorted((char for char in node if char != _END), reverse=True):
+                    stack.append((node[char], path + char, ancestors))
+        return found
+
+    def _inner_triggers(self, trigger: str) -> List[Tuple[int, str, List[TriggerEntry]]]:
+        """(start, trigger, entries) for each trigger occurring inside `trigger` past its first character."""
+        found: List[Tuple[int, str, List[TriggerEntry]]] = []
+        for start in range(1, len(trigger) - 1):
+            node: Optional[Dict[str, Any]] = self._root
+            for end in range(start, len(trigger) - 1):
+                node = node.get(trigger[end])
+                if node is None:
+                    break
+                if node.get(_END):
+                    found.append((start, trigger[start: end + 1], list(node[_END])))
+        return found
+
+    @staticmethod
+    def _infix(
+        short: str,
+        entries: List[TriggerEntry],
+        long_trigger: str,
+        long_entries: List[TriggerEntry],
+        starts: List[int],
+    ) -> TriggerConflict:
+        mitigated = all(shadow_is_mitigated(entry, long_trigger, start) for entry in entries for start in starts)
+        return TriggerConflict("infix", short, entries, other=long_trigger, other_entries=long_entries, mitigated=mitigated)
+
+    def _find(self, trigger: str) -> Optional[Dict[str, Any]]:
+        node: Optional[Dict[str, Any]] = self._root
+        for char in trigger:
+            node = node.get(char)
+            if node is None:
+                return None
+        return node
+
+    def _remove_entries(self, entries: Iterable[TriggerEntry]) -> None:
+        for entry in entries:
+            path: List[Tuple[Dict[str, Any], str]] = []
+            node = self._root
+            for char in entry.trigger:
+                child = node.get(char)
+                if child is None:
+                    break
+                path.append((node, char))
+                node = child
+            else:
+                owners = node.get(_END)
+                if owners is None:
+                    continue
+                owners[:] = [owner for owner in owners if owner is not entry]
+                if not owners:
+                    del node[_END]
+                # Prune the now-empty tail so deleted triggers do not leave dead branches
+                while path and not node:
+                    parent, char = path.pop()
+                    del parent[char]
+                    node = parent
+
+
+"""
+CHANGELOG
+2026-10-18 Codex
+- Added TriggerTrie so duplicate triggers and prefix shadowing (with word-boundary mitigation) can be reported and checked in O(len(trigger)).
+2026-10-18 Codex
+- Triggers that occur inside a longer trigger (not at its start) are reported as "infix" conflicts; `left_word`/`word` mitigate them when the occurrence does not follow a word separator.
+"""
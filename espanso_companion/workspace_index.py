@@ -0,0 +1,141 @@
+"""Cached index of YAML files across the Espanso config/match workspace."""
+
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+YAML_SUFFIXES = (".yml", ".yaml")
+
+
+@dataclass(frozen=True)
+class IndexedFile:
+    path: Path
+    loadable: bool  # False for `_`-prefixed files Espanso only pulls in via imports
+
+
+def is_hidden(name: str) -> bool:
+    return name.startswith(".")
+
+
+def is_import_only(name: str) -> bool:
+    """Espanso skips `_`-prefixed match files unless another file imports them."""
+    return name.startswith("_")
+
+
+def is_yaml_name(name: str) -> bool:
+    return name.lower().endswith(YAML_SUFFIXES)
+
+
+class WorkspaceIndex:
+    """Walks each root once with os.scandir and serves cached listings until invalidated.
+
+    Hidden files and directories are skipped entirely. `_`-prefixed entries are
+    indexed (imports, backups and the config tree still need them) but are not
+    loadable, so the match loader ignores them just like Espanso does.
+    """
+
+    def __init__(self, roots: Sequence[Path] = ()) -> None:
+        self._roots: List[Path] = []
+        self._files: Optional[List[IndexedFile]] = None
+        self._lock = threading.Lock()
+        self.set_roots(roots)
+
+    def set_roots(self, roots: Sequence[Path]) -> None:
+        with self._lock:
+            self._roots = self._collapse_roots(roots)
+            self._files = None
+
+    def invalidate(self) -> None:
+        """Drop the cached listing; the next query re-walks the tree."""
+        with self._lock:
+            self._files = None
+
+    def files(self, root: Optional[Path] = None, *, loadable_only: bool = False) -> List[Path]:
+        """Return indexed YAML files (optionally only under `root`), sorted by path."""
+        return [
+            item.path
+            for item in self._snapshot()
+            if (not loadable_only or item.loadable) and (root is None or self._is_under(item.path, root))
+        ]
+
+    def match_entries(self, match_root: Path) -> List[Tuple[Path, str]]:
+        """Loadable match files under `match_root` as (path, label) pairs sorted by label."""
+        entries = [(path, self.relative_label(path, match_root)) for path in self.files(match_root, loadable_only=True)]
+        entries.sort(key=lambda entry: entry[1])
+        return entries
+
+    def loadable_label(self, path: Path, match_root: Path) -> Optional[str]:
+        """Label for `path` if the match loader would pick it up, computed without a walk."""
+        if not is_yaml_name(path.name) or not self._is_under(path, match_root):
+            return None
+        try:
+            parts = path.relative_to(match_root).parts
+        except ValueError:
+            return None
+        if any(is_hidden(part) or is_import_only(part) for part in parts):
+            return None
+        return "/".join(parts)
+
+    @staticmethod
+    def relative_label(path: Path, root: Path) -> str:
+        try:
+            return path.relative_to(root).as_posix()
+        except ValueError:
+            return path.name
+
+    def _snapshot(self) -> List[IndexedFile]:
+        with self._lock:
+            if self._files is None:
+                files: List[IndexedFile] = []
+                for root in self._roots:
+                    files.extend(self._walk(root))
+                files.sort(key=lambda item: str(item.path))
+                self._files = files
+            return self._files
+
+    @staticmethod
+    def _walk(root: Path) -> Iterable[IndexedFile]:
+        stack: List[Tuple[str, bool]] = [(str(root), True)]
+        while stack:
+            directory, loadable = stack.pop()
+            try:
+                with os.scandir(directory) as iterator:
+                    for entry in iterator:
+                        name = entry.name
+                        if is_hidden(name):
+                            continue
+                        child_loadable = loadable and not is_import_only(name)
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append((entry.path, child_loadable))
+                            elif is_yaml_name(name) and entry.is_file():
+                                yield IndexedFile(Path(entry.path), child_loadable)
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+
+    @staticmethod
+    def _is_under(path: Path, root: Path) -> bool:
+        return path == root or root in path.parents
+
+    @classmethod
+    def _collapse_roots(cls, roots: Sequence[Path]) -> List[Path]:
+        """Drop roots nested inside another root so shared subtrees are walked once."""
+        unique = sorted({Path(root) for root in roots}, key=lambda root: len(root.parts))
+        collapsed: List[Path] = []
+        for root in unique:
+            if not any(cls._is_under(root, kept) for kept in collapsed):
+                collapsed.append(root)
+        return collapsed
+
+
+"""
+CHANGELOG
+2026-10-18 Codex
+- Added WorkspaceIndex so match loading, validation, backups and the config tree share one cached scandir walk covering .yml and .yaml files.
+"""
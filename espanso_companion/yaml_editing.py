@@ -0,0 +1,303 @@
+"""Span-based rewrites of a match file's `matches` list that leave untouched text alone."""
+
+from __future__ import annotations
+
+import difflib
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+
+from .yaml_processor import YamlProcessor
+
+
+@dataclass(frozen=True)
+class ItemSpan:
+    start: int  # start of the line holding the item's `-`
+    end: int  # just past the item's last line
+    column: int  # column of the `-`
+    line: int  # 1-based line of the `-`
+    end_line: int  # 1-based line the item's content ends on
+
+
+def _match_key(match: Any) -> str:
+    return json.dumps(match, sort_keys=True, default=str)
+
+
+def _text_digest(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _content_end(node: yaml.Node) -> int:
+    """End offset of a node's own content (block collections' end marks run into the next token)."""
+    if isinstance(node, yaml.MappingNode) and node.value and not node.flow_style:
+        return _content_end(node.value[-1][1])
+    if isinstance(node, yaml.SequenceNode) and node.value and not node.flow_style:
+        return _content_end(node.value[-1])
+    return node.end_mark.index
+
+
+def _item_span(text: str, node: yaml.Node) -> Optional[ItemSpan]:
+    dash = node.start_mark.index - 1
+    while dash >= 0 and text[dash] in " \t\r\n":
+        dash -= 1
+    if dash < 0 or text[dash] != "-":
+        return None
+    line_start = text.rfind("\n", 0, dash) + 1
+    if text[line_start:dash].strip():
+        return None  # the dash is not the first thing on its line (e.g. `- - nested`)
+
+    end = _content_end(node)
+    while end > dash and text[end - 1] in " \t\r\n":
+        end -= 1
+    line = node.start_mark.line + 1 - text.count("\n", dash, node.start_mark.index)
+    end_line = line + text.count("\n", dash, end)
+    newline = text.find("\n", end)
+    end = len(text) if newline == -1 else newline + 1
+    return ItemSpan(start=line_start, end=end, column=dash - line_start, line=line, end_line=end_line)
+
+
+def _matches_sequence(root: Optional[yaml.Node]) -> Optional[yaml.SequenceNode]:
+    if not isinstance(root, yaml.MappingNode) or root.flow_style:
+        return None
+    for key, value in root.value:
+        if isinstance(key, yaml.ScalarNode) and key.value == "matches":
+            if isinstance(value, yaml.SequenceNode) and not value.flow_style and value.value:
+                return value
+            return None
+    return None
+
+
+def _has_aliases(root: Optional[yaml.Node]) -> bool:
+    """True if any node is reached twice, i.e. the text uses `*alias` references."""
+    seen = set()
+    stack = [root] if root is not None else []
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            return True
+        seen.add(id(node))
+        if isinstance(node, yaml.MappingNode):
+            for key, value in node.value:
+                stack.extend((key, value))
+        elif isinstance(node, yaml.SequenceNode):
+            stack.extend(node.value)
+    return False
+
+
+def match_item_spans(text: str, root: Optional[yaml.Node]) -> List[Optional[ItemSpan]]:
+    """Source span of each `matches` item in a composed file (None where the layout is unusual)."""
+    sequence = _matches_sequence(root)
+    if sequence is None:
+        return []
+    return [_item_span(text, node) for node in sequence.value]
+
+
+@dataclass(frozen=True)
+class _Layout:
+    """What a splice needs from a file's text, kept so the next edit need not compose it again."""
+
+    keys: Tuple[str, ...]  # top-level keys in order
+    others: Dict[str, str]  # canonical JSON of every top-level value besides `matches`
+    match_keys: List[str]  # canonical JSON of each `matches` item
+    spans: List[Tuple[int, int]]  # (start, end) of each item's lines
+    column: int  # column of the items' `-`
+
+
+class MatchFileEditor:
+    """Rewrites only the `matches` items that changed, falling back to a full dump.
+
+    Items are aligned by content (difflib over canonical JSON), so unchanged
+    items keep their exact text, comments and scalar styles; changed, inserted
+    and removed items are spliced by their source line span. Only the spliced
+    items are parsed back to verify them. The layout (item spans and canonical
+    keys) of every text written is remembered, so editing a file again composes
+    nothing; a text not seen before (first edit, or changed on disk) is composed
+    once. Any structural change outside `matches`, an unusual layout, or a
+    spliced item that does not load back as intended triggers a full dump, and so
+    does a file using `*alias` references.
+    """
+
+    LAYOUT_CACHE_SIZE = 16
+
+    def __init__(self, processor: Optional[YamlProcessor] = None) -> None:
+        self._processor = processor or YamlProcessor()
+        self._layouts: "OrderedDict[str, _Layout]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def render(self, original_text: str, document: Dict[str, Any]) -> Tuple[str, bool]:
+        """Return (new text, True if it was a surgical edit) for writing `document` over `original_text`."""
+        try:
+            edited = self._splice(original_text, document)
+        except yaml.YAMLError:
+            edited = None
+        if edited is not None:
+            return edited, True
+        return self._processor.dumps(document), False
+
+    def _splice(self, text: str, document: Dict[str, Any]) -> Optional[str]:
+        new_matches = document.get("matches")
+        if not isinstance(new_matches, list) or not new_matches:
+            return None
+        layout = self._layout(text)
+        if layout is None or tuple(document) != layout.keys:
+            return None
+        if any(_match_key(document[key]) != value for key, value in layout.others.items()):
+            return None
+
+        spans = layout.spans
+        new_keys = [_match_key(match) for match in new_matches]
+        pieces: List[str] = [text[: spans[0][0]]]
+        position = spans[0][0]
+        new_spans: List[Tuple[int, int]] = []
+        last_end = spans[0][0]
+
+        def emit(piece: str) -> None:
+            nonlocal position
+            pieces.append(piece)
+            position += len(piece)
+
+        def emit_items(matches: List[Dict[str, Any]]) -> bool:
+            if not matches:
+                return True
+            rendered = [self._render_item(match, layout.column) for match in matches]
+            # Parse back just the new items; everything else is byte-for-byte the verified original
+            if self._processor.load_document("".join(rendered)) != matches:
+                return False
+            tail = next((piece for piece in reversed(pieces) if piece), "")
+            if tail and not tail.endswith("\n"):
+                emit("\n")
+            for item in rendered:
+                new_spans.append((position, position + len(item)))
+                emit(item)
+            return True
+
+        matcher = difflib.SequenceMatcher(a=layout.match_keys, b=new_keys, autojunk=False)
+        for tag, old_start, old_stop, new_start, new_stop in matcher.get_opcodes():
+            if old_start == old_stop:
+                if old_start < len(spans):
+                    # Insert before the next original item, after the text that precedes it
+                    emit(text[last_end: spans[old_start][0]])
+                    last_end = spans[old_start][0]
+                if not emit_items(new_matches[new_start:new_stop]):
+                    return None
+                continue
+            for index in range(old_start, old_stop):
+                start, end = spans[index]
+                emit(text[last_end:start])
+                if tag == "equal":
+                    new_spans.append((position, position + end - start))
+                    emit(text[start:end])
+                last_end = end
+            if tag != "equal" and not emit_items(new_matches[new_start:new_stop]):
+                return None
+        emit(text[last_end:])
+        edited = "".join(pieces)
+        self._remember(edited, _Layout(layout.keys, layout.others, new_keys, new_spans, layout.column))
+        return edited
+
+    def read_item(self, text: str, line: int, end_line: int) -> Optional[Tuple[ItemSpan, Dict[str, Any]]]:
+        """Parse only the `matches` item on source lines `line`..`end_line` (1-based, as in ItemSpan).
+
+        None when those lines do not hold exactly one block item free of anchors
+        and aliases, e.g. because the file changed since the lines were recorded.
+        """
+        lines = text.splitlines(keepends=True)
+        if not 1 <= line <= end_line <= len(lines):
+            return None
+        start = sum(len(item) for item in lines[: line - 1])
+        chunk = lines[line - 1: end_line]
+        column = len(chunk[0]) - len(chunk[0].lstrip(" "))
+        if not chunk[0][column:].startswith("-"):
+            return None
+        block: List[str] = []
+        for item in chunk:
+            if not item.strip():
+                block.append("\n")
+            elif item[:column].strip():
+                return None  # something outside the item (e.g. a less indented comment)
+            else:
+                block.append(item[column:])
+        source = "".join(block)
+        try:
+            for event in yaml.parse(source, Loader=yaml.SafeLoader):
+                if isinstance(event, yaml.AliasEvent) or getattr(event, "anchor", None):
+                    return None
+            loaded = self._processor.load_document(source)
+        except yaml.YAMLError:
+            return None
+        if not isinstance(loaded, list) or len(loaded) != 1 or not isinstance(loaded[0], dict):
+            return None
+        end = start + sum(len(item) for item in chunk)
+        return ItemSpan(start=start, end=end, column=column, line=line, end_line=end_line), loaded[0]
+
+    def replace_item(self, text: str, span: ItemSpan, match: Optional[Dict[str, Any]]) -> Optional[str]:
+        """`text` with the item at `span` replaced by `match` (removed if None); None if it would not load back."""
+        if match is None:
+            return text[: span.start] + text[span.end:]
+        rendered = self._render_item(match, span.column)
+        if self._processor.load_document(rendered) != [match]:
+            return None
+        if span.end == len(text) and not text.endswith("\n"):
+            rendered = rendered.rstrip("\n")
+        return text[: span.start] + rendered + text[span.end:]
+
+    def _layout(self, text: str) -> Optional[_Layout]:
+        """The remembered layout of `text`, else compose it once (None if it cannot be spliced)."""
+        digest = _text_digest(text)
+        with self._lock:
+            layout = self._layouts.get(digest)
+            if layout is not None:
+                self._layouts.move_to_end(digest)
+                return layout
+        root = self._processor.compose(text)
+        if _has_aliases(root):
+            return None  # copied text may reference an anchor in an item being replaced
+        sequence = _matches_sequence(root)
+        original = self._processor.construct(root)
+        if not isinstance(original, dict) or not isinstance(original.get("matches"), list):
+            return None
+        if sequence is None or len(sequence.value) != len(original["matches"]):
+            return None
+        spans = [_item_span(text, node) for node in sequence.value]
+        if any(span is None for span in spans):
+            return None
+        layout = _Layout(
+            keys=tuple(original),
+            others={key: _match_key(value) for key, value in original.items() if key != "matches"},
+            match_keys=[_match_key(match) for match in original["matches"]],
+            spans=[(span.start, span.end) for span in spans],
+            column=spans[0].column,
+        )
+        self._remember(text, layout, digest)
+        return layout
+
+    def _remember(self, text: str, layout: _Layout, digest: Optional[str] = None) -> None:
+        with self._lock:
+            self._layouts[digest or _text_digest(text)] = layout
+            while len(self._layouts) > self.LAYOUT_CACHE_SIZE:
+                self._layouts.popitem(last=False)
+
+    def _render_item(self, match: Dict[str, Any], column: int) -> str:
+        dumped = self._processor.dumps([match], literal_multiline=True)
+        indent = " " * column
+        return "".join(indent + line if line.strip() else line for line in dumped.splitlines(True))
+
+
+"""
+CHANGELOG
+2026-10-18 Codex
+- Added MatchFileEditor so snippet edits splice only the changed `matches` items by source span and keep comments and styles elsewhere.
+2026-10-18 Codex
+- ItemSpan carries line numbers and match_item_spans exposes per-item spans to the match loader.
+2026-10-18 Codex
+- MatchFileEditor remembers the layout of each text it reads or writes and verifies only the spliced items, so repeat edits skip composing and reloading the whole file.
+2026-10-18 Codex
+- Files with `*alias` references are fully dumped: a splice could keep an alias whose anchor lived in a replaced item.
+2026-10-18 Codex
+- Added read_item/replace_item so a single located item can be read and rewritten from its recorded source lines without parsing the whole file.
+"""
@@ -3,31 +3,79 @@
 from __future__ import annotations
 
 import yaml
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+from .atomic_io import atomic_write_text
+
+try:
+    from yaml import CSafeDumper as _SafeDumper, CSafeLoader as _SafeLoader
+
+    YAML_BACKEND = "libyaml"
+except ImportError:  # pragma: no cover - PyYAML built without libyaml
+    from yaml import SafeDumper as _SafeDumper, SafeLoader as _SafeLoader
+
+    YAML_BACKEND = "python"
+
+
+class _LiteralDumper(_SafeDumper):
+    """Dumps multi-line strings as `|` block scalars, the way people write them by hand."""
+
+
+def _represent_str(dumper: yaml.SafeDumper, value: str) -> yaml.ScalarNode:
+    style = "|" if "\n" in value else None
+    return dumper.represent_scalar("tag:yaml.org,2002:str", value, style=style)
+
+
+_LiteralDumper.add_representer(str, _represent_str)
+
 
 class YamlProcessor:
-    """Wraps safe loading/dumping plus lightweight validation."""
+    """Single YAML gateway: safe loading/dumping (libyaml when available) plus validation."""
+
+    backend = YAML_BACKEND
 
     def load(self, source: Path) -> Dict[str, Any]:
         """Load YAML from disk and return a dict."""
         with source.open("r", encoding="utf-8") as handle:
-            data = yaml.safe_load(handle) or {}
+            data = yaml.load(handle, Loader=_SafeLoader) or {}
         return self._normalize(data)
 
     def load_str(self, text: str) -> Dict[str, Any]:
         """Load YAML content from a string."""
-        data = yaml.safe_load(text) or {}
+        data = yaml.load(text, Loader=_SafeLoader) or {}
         return self._normalize(data)
 
+    def load_document(self, text: str) -> Any:
+        """Load YAML content from a string without coercing the top level to a dict."""
+        return yaml.load(text, Loader=_SafeLoader)
+
+    def compose(self, text: str) -> Optional[yaml.Node]:
+        """Parse to the node graph, whose marks give each node's source span."""
+        return yaml.compose(text, Loader=_SafeLoader)
+
+    def construct(self, node: Optional[yaml.Node]) -> Any:
+        """Build Python data from a composed node (same result as loading its source)."""
+        if node is None:
+            return None
+        return yaml.constructor.SafeConstructor().construct_document(node)
+
+    def dumps(self, data: Any, *, literal_multiline: bool = False) -> str:
+        """Serialize to block-style YAML, keeping key order and unicode intact."""
+        return yaml.dump(
+            data,
+            Dumper=_LiteralDumper if literal_multiline else _SafeDumper,
+            sort_keys=False,
+            allow_unicode=True,
+            default_flow_style=False,
+        )
+
     def dump(self, data: Dict[str, Any], target: Path, *, schema_version: Optional[str] = None) -> None:
         """Persist YAML while preserving order and optional schema metadata."""
         if schema_version:
             data.setdefault("schema_version", schema_version)
-        with target.open("w", encoding="utf-8") as handle:
-            yaml.safe_dump(data, handle, sort_keys=False)
+        atomic_write_text(target, self.dumps(data), fsync_dir=True)
 
     def validate(self, data: Dict[str, Any], required_keys: Sequence[str]) -> Tuple[bool, List[str]]:
         """Check for required keys, return (ok, missing)."""
@@ -57,6 +105,7 @@ class YamlProcessor:
                     word=bool(raw.get("word", False)),
                     propagate_case=bool(raw.get("propagate_case", False)),
                     form=raw.get("form"),
+                    triggers=[item for item in raw.get("triggers") or [] if isinstance(item, str)],
                 )
             )
         return matches
@@ -83,9 +132,18 @@ class MatchDefinition:
     word: bool = False
     propagate_case: bool = False
     form: Any = None
+    triggers: List[str] = field(default_factory=list)
 
 """
 CHANGELOG
 2025-11-14 Codex
 - Added support for Phase 5 snippet fields (label, backend, delay, word boundaries, uppercase style, image path) to keep match normalization aligned with Espanso's schema.
+2026-10-18 Codex
+- Switched to libyaml CSafeLoader/CSafeDumper when available (pure-Python fallback) and added dumps/load_document so callers stop using yaml directly.
+2026-10-18 Codex
+- MatchDefinition now carries the `triggers` list so multi-trigger matches take part in conflict checks.
+2026-10-18 Codex
+- Added compose()/construct() and a literal-block option to dumps() for span-based editing.
+2026-10-18 Codex
+- dump() now replaces the target atomically (temp file, fsync, rename) instead of truncating it in place.
 """
@@ -5,14 +5,16 @@ from __future__ import annotations
 import atexit
 import base64
 import json
+import multiprocessing
+import os
 import re
 import threading
+import time
 import uuid
-import yaml
 from collections import deque
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 import webview
 
@@ -30,12 +32,32 @@ except Exception:  # pragma: no cover - optional dependency
     SnippetSenseEngine = None  # type: ignore
     SnippetSenseUnavailable = RuntimeError
 
+from espanso_companion.atomic_io import CoalescingWriter, atomic_write_files, atomic_write_text
+from espanso_companion.backup_retention import BackupJanitor, RetentionPolicy, prune_archives
+from espanso_companion.backup_store import BackupStore, SnapshotSource
+from espanso_companion.body_store import BodyStore, DEFAULT_THRESHOLD as DEFAULT_LAZY_REPLACE_CHARS
 from espanso_companion.cli_integration import EspansoCLI
 from espanso_companion.config_loader import ConfigLoader
 from espanso_companion.config_tree import ConfigTreeBuilder
+from espanso_companion.event_channel import EventChannel
 from espanso_companion.feature_catalog import FeatureCatalog, CatalogSection
 from espanso_companion.file_watcher import FileWatcher, WatchEvent
+from espanso_companion.health_monitor import HealthMonitor
+from espanso_companion.match_cache import MatchFileCache, fingerprint_file
+from espanso_companion.match_snapshot import SnapshotWriter, load_snapshot, save_snapshot
+from espanso_companion.reload_pipeline import ReloadPipeline
+from espanso_companion.restart_scheduler import RestartScheduler
+from espanso_companion.restore_plan import BackupEntry, RestorePlan, apply_restore, folder_entries, plan_restore, snapshot_entries
+from espanso_companion.search_index import SnippetSearchIndex
+from espanso_companion.snippet_batch import BatchConflict, BatchOperation, SnippetBatch, SourceItem, defines
+from espanso_companion.snippet_locator import SnippetLocator
+from espanso_companion.snippet_record import as_dicts
+from espanso_companion.snippet_revisions import SnippetRevisions, merge_changes
+from espanso_companion.snippet_views import PageRequest, page_snippets, project
+from espanso_companion.trigger_trie import TriggerConflict, TriggerEntry, TriggerTrie
+from espanso_companion.workspace_index import WorkspaceIndex, is_hidden, is_yaml_name
 from espanso_companion.variable_engine import VariableEngine
+from espanso_companion.yaml_editing import MatchFileEditor
 from espanso_companion.yaml_processor import YamlProcessor
 from espanso_companion.platform_support import PLATFORM, PlatformInfo
 
@@ -49,22 +71,62 @@ def _section_to_dict(section: CatalogSection) -> Dict[str, Any]:
     }
 
 
+def _trigger_entry_to_dict(entry: TriggerEntry) -> Dict[str, Any]:
+    return {
+        "trigger": entry.trigger,
+        "file": entry.file,
+        "word": entry.word,
+        "leftWord": entry.left_word,
+        "rightWord": entry.right_word,
+    }
+
+
+def _conflict_to_dict(conflict: TriggerConflict) -> Dict[str, Any]:
+    return {
+        "kind": conflict.kind,
+        "trigger": conflict.trigger,
+        "other": conflict.other,
+        "entries": [_trigger_entry_to_dict(entry) for entry in conflict.entries],
+        "otherEntries": [_trigger_entry_to_dict(entry) for entry in conflict.other_entries],
+        "mitigated": conflict.mitigated,
+        "detail": conflict.detail,
+    }
+
+
 class EspansoAPI:
     """Exposes the backend surface to the JavaScript dashboard."""
 
     def __init__(self) -> None:
         self.loader = ConfigLoader()
         self.yaml_processor = YamlProcessor()
+        self._match_editor = MatchFileEditor(self.yaml_processor)
         self.variable_engine = VariableEngine()
         self.cli = EspansoCLI()
         self.platform = PLATFORM
         self._events: deque[Dict[str, Any]] = deque(maxlen=60)
         self._event_lock = threading.Lock()
         self._match_cache: List[Dict[str, Any]] = []
+        self._match_files: Optional[MatchFileCache] = None
+        self._match_lock = threading.RLock()
+        self._workspace = WorkspaceIndex()
+        self._bodies = BodyStore()
+        self._search_index = SnippetSearchIndex(self._bodies)
+        self._trigger_trie = TriggerTrie()
+        self._snippet_locator = SnippetLocator()
+        self._snippet_revisions = SnippetRevisions()
+        self._reload_pipeline = ReloadPipeline(self._reload_match_paths)
         self._yaml_errors: List[Dict[str, Any]] = []
-        self._connection_steps: List[Dict[str, Any]] = []
+        self._event_channel = EventChannel()
+        self._service_stopped_by_user = False
+        self._health = HealthMonitor(
+            self._connection_probes(), on_change=self._push_health, bootstrap=self._bootstrap_espanso
+        )
         self._watcher: Optional[FileWatcher] = None
         self._ready = False  # Track initialization completion
+        self._state_writer = CoalescingWriter()
+        self._backups: Optional[BackupStore] = None
+        self._backup_janitor = BackupJanitor(self._prune_backups)
+        self._match_snapshot = SnapshotWriter(self._save_match_snapshot)
         self._preferences = self._load_preferences()
         self._snippetsense_settings = self._preferences.get("snippetsense", self._default_snippetsense_settings())
         self._snippetsense_settings.setdefault("blocked", [])
@@ -80,8 +142,24 @@ class EspansoAPI:
             getattr(SnippetSenseEngine, "APP_DETECTION_SUPPORTED", False) if SnippetSenseEngine else False
         )
         self._snippetsense_lock = threading.Lock()
+        self._bodies.threshold = self._lazy_replace_chars()
+        self._match_files = MatchFileCache(
+            hash_content=bool(self._preferences.get("verifyMatchContent", False)),
+            workers=self._match_loader_workers(),
+            bodies=self._bodies,
+        )
+        self._restart_scheduler = RestartScheduler(
+            self.cli.reload,
+            quiet_seconds=self._restart_quiet_seconds(),
+            skip_when=self._espanso_auto_restarts,
+        )
         self._config_override = self._coerce_override(self._preferences.get("configOverride"))
         self._initialize_paths(self._config_override)
+        self._event_channel.start()
+        self._restart_scheduler.start()
+        self._health.start()
+        self._backup_janitor.start()
+        self._match_snapshot.start()
         if self._snippetsense_settings.get("enabled"):
             self._start_snippetsense_engine()
         self._ready = True
@@ -91,6 +169,17 @@ class EspansoAPI:
     def shutdown(self) -> None:
         """Shutdown resources with proper error logging."""
         self._stop_snippetsense_engine()
+        self._reload_pipeline.stop()
+        self._restart_scheduler.stop()
+        self._health.stop()
+        self._backup_janitor.stop()
+        self._event_channel.stop()
+        self.cli.close()
+        self._state_writer.close()
+        self._match_snapshot.stop()
+        if self._match_files is not None:
+            self._match_files.close()
+        self._bodies.close()
         watcher = getattr(self, "_watcher", None)
         if not watcher:
             return
@@ -101,8 +190,158 @@ class EspansoAPI:
             # In production, this could be logged to a file
             print(f"Warning: Error stopping file watcher: {exc}", flush=True)
 
+    _RECORDED_EVENT_TYPES = {"created", "modified", "deleted", "moved"}
+    _RELOAD_EVENT_TYPES = {"created", "modified", "deleted", "moved", "closed"}
+    _LISTING_EVENT_TYPES = {"created", "deleted", "moved"}
+
+    def _handle_watch_event(self, event: WatchEvent) -> None:
+        """Record the event and queue affected match files for an incremental reload."""
+        if event.event_type not in self._RELOAD_EVENT_TYPES:
+            return
+        if not event.is_directory and not self._is_temp_write(event):
+            self._capture_event(event)
+        if self._changes_listing(event):
+            self._workspace.invalidate()
+        for path in (event.src_path, event.dest_path):
+            if path is None:
+                continue
+            if event.is_directory:
+                if event.event_type != "modified" and self._is_within_match_dir(path):
+                    self._reload_pipeline.submit(self._paths.match)
+            elif self._match_file_label(path) is not None:
+                self._reload_pipeline.submit(path)
+
+    @staticmethod
+    def _is_temp_write(event: WatchEvent) -> bool:
+        """Events on the hidden temp files atomic saves create and rename away."""
+        return is_hidden(event.src_path.name) and (event.dest_path is None or is_hidden(event.dest_path.name))
+
+    def _changes_listing(self, event: WatchEvent) -> bool:
+        if event.event_type not in self._LISTING_EVENT_TYPES:
+            return False
+        if event.is_directory:
+            return True
+        if event.event_type == "moved" and event.dest_path is not None and not is_yaml_name(event.src_path.name):
+            # An atomic save renames a temp file over the target; only a new name changes the listing
+            return event.dest_path not in self._workspace.files()
+        return is_yaml_name(event.src_path.name) or event.dest_path is not None
+
+    def _match_loader_workers(self) -> int:
+        """Process count for parallel cold loads; `matchLoaderWorkers: 0` keeps loading sequential."""
+        configured = self._coerce_int(self._preferences.get("matchLoaderWorkers"))
+        if configured is not None:
+            return max(0, configured)
+        return min(os.cpu_count() or 1, 8)
+
+    def _lazy_replace_chars(self) -> int:
+        """Replace bodies longer than this stay out of the cache until opened (`lazyReplaceChars`, 0 = never)."""
+        configured = self._coerce_int(self._preferences.get("lazyReplaceChars"))
+        return max(0, configured if configured is not None else DEFAULT_LAZY_REPLACE_CHARS)
+
+    def _restart_quiet_seconds(self) -> float:
+        """Quiet window before a queued restart fires (`restartQuietMs`, default 1500)."""
+        configured = self._coerce_int(self._preferences.get("restartQuietMs"))
+        return max(0, configured if configured is not None else 1500) / 1000
+
+    def _espanso_auto_restarts(self) -> bool:
+        """True when restarts may be skipped: `skipRestartWhenAutoReload` is on (default off)
+        and `default.yml` parses with `auto_restart: true` set explicitly."""
+        if not self._preferences.get("skipRestartWhenAutoReload", False):
+            return False
+        config_file = self._paths.config / "config" / "default.yml"
+        try:
+            return self.yaml_processor.load(config_file).get("auto_restart") is True
+        except Exception:
+            return False
+
+    def _is_within_match_dir(self, path: Path) -> bool:
+        match_dir = self._paths.match
+        return path == match_dir or match_dir in path.parents
+
+    def _match_file_label(self, path: Path) -> Optional[str]:
+        """Return the cache label for a match file, or None if the loader ignores it."""
+        return self._workspace.loadable_label(path, self._paths.match)
+
+    def _reload_match_paths(self, paths: List[Path]) -> None:
+        """Re-parse only the files behind coalesced watcher events (runs on the pipeline thread)."""
+        with self._match_lock:
+            if self._paths.match in paths:
+                self._populate_matches()
+                return
+            changed: List[Path] = []
+            for path in paths:
+                label = self._match_file_label(path)
+                if label is not None and self._match_files.update(path, label):
+                    changed.append(path)
+            if changed:
+                self._publish_match_changes(changed)
+                print(f"[INFO] Reloaded {len(changed)} changed match file(s) from watcher", flush=True)
+
+    def _publish_match_changes(self, paths: Iterable[Path], *, persist: bool = True) -> None:
+        """Propagate per-file cache changes to the snippet list and the indexes derived from it."""
+        indexes = (self._search_index, self._trigger_trie, self._snippet_locator, self._snippet_revisions)
+        since = self._snippet_revisions.revision
+        for path in paths:
+            entry = self._match_files.entry(path)
+            for index in indexes:
+                if entry is None:
+                    index.remove_file(str(path))
+                else:
+                    index.replace_file(str(path), entry.snippets)
+        live = {str(path) for path in self._match_files.files()}
+        for index in indexes:
+            for key in index.keys() - live:
+                index.remove_file(key)
+        self._match_cache = self._match_files.snippets()
+        self._yaml_errors = self._match_files.errors()
+        self._push_snippet_changes(since)
+        if persist:
+            self._match_snapshot.request()
+
+    _PUSH_CHANGE_LIMIT = 500
+
+    def _push_snippet_changes(self, since: int) -> None:
+        """Push what changed after revision `since`; large change sets only announce the new revision."""
+        revision = self._snippet_revisions.revision
+        if revision == since:
+            return
+        payload: Dict[str, Any] = {"from": since, "revision": revision}
+        if since == 0:
+            # First load: the page pulls the full list itself; don't materialize every record here
+            self._event_channel.publish("snippets", payload, merge=merge_changes)
+            self._event_channel.publish("stats", {"snippetCount": len(self._match_cache), "yamlErrors": len(self._yaml_errors)})
+            return
+        changes = self._snippet_revisions.changes_since(since, limit=self._PUSH_CHANGE_LIMIT)
+        if not changes["truncated"]:
+            payload["changed"] = changes["changed"]
+            payload["removed"] = changes["removed"]
+        channel = self._event_channel
+        channel.publish("snippets", payload, merge=merge_changes)
+        files = {item["file"] for item in changes["changed"] + changes["removed"]}
+        errors = {error.get("file"): error.get("error") for error in self._yaml_errors}
+        for file in sorted(files, key=str):
+            channel.publish("file", {"file": file, "error": errors.get(file)}, key=file)
+        channel.publish("stats", {"snippetCount": len(self._match_cache), "yamlErrors": len(self._yaml_errors)})
+
+    def _push_health(self, steps: List[Dict[str, Any]]) -> None:
+        service = next((step for step in steps if step["label"] == self._SERVICE_PROBE), {})
+        self._event_channel.publish("health", {"steps": steps, "connected": service.get("status") == "success"})
+
+    def _attach_window(self, window: Any) -> None:
+        """Let the event channel push into `window` once its page subscribes."""
+        self._event_channel.attach(window.evaluate_js)
+        events = getattr(window, "events", None)
+        if events is not None and hasattr(events, "closing"):
+            # Don't leave coalesced state writes to atexit, which a killed process never reaches
+            events.closing += self._flush_state
+
+    def _flush_state(self) -> None:
+        self._state_writer.flush()
+
     def _capture_event(self, event: WatchEvent) -> None:
         """Capture filesystem events with error handling."""
+        if event.event_type not in self._RECORDED_EVENT_TYPES:
+            return
         try:
             entry = {
                 "type": event.event_type,
@@ -121,9 +360,14 @@ class EspansoAPI:
         print(f"[INFO] Config: {self._paths.config}, Match: {self._paths.match}", flush=True)
         self._ensure_directories()
         self._ensure_base_yaml()
+        self._workspace.set_roots([self._paths.config, self._paths.match])
         self._apply_cli_config()
         self._restart_watcher()
-        self.refresh_files()
+        if self._restore_match_snapshot():
+            # Show the snapshot now; the reload thread re-checks fingerprints, builds the indexes and pushes changes
+            self._reload_pipeline.submit(self._paths.match)
+        else:
+            self.refresh_files()
 
     def _ensure_directories(self) -> None:
         for path in (self._paths.config, self._paths.match, self._paths.packages, self._paths.runtime):
@@ -144,7 +388,7 @@ matches:
     replace: "Hello from Espanso!"
 """
         try:
-            base_file.write_text(default_content, encoding="utf-8")
+            atomic_write_text(base_file, default_content, fsync_dir=True)
             print(f"[INFO] Created default base.yml", flush=True)
         except Exception as exc:
             # Log error but don't fail initialization
@@ -198,6 +442,7 @@ matches:
             if len(self._snippetsense_pending) > 50:
                 self._snippetsense_pending = self._snippetsense_pending[-50:]
             self._save_snippetsense_pending()
+        self._event_channel.publish("suggestion", suggestion, key=suggestion["id"])
 
     def _generate_snippetsense_trigger(self, phrase: str) -> str:
         cleaned = "".join(ch for ch in phrase.lower() if ch.isalnum() or ch.isspace()).strip()
@@ -222,8 +467,9 @@ matches:
             except Exception:
                 pass
         self._watcher = FileWatcher([self._paths.match, self._paths.config])
-        self._watcher.register_callback(self._capture_event)
+        self._watcher.register_callback(self._handle_watch_event)
         self._watcher.start()
+        self._reload_pipeline.start()
 
     def _apply_cli_config(self) -> None:
         try:
@@ -345,6 +591,42 @@ matches:
         path.mkdir(parents=True, exist_ok=True)
         return path
 
+    def _backup_store(self) -> BackupStore:
+        """Content-addressed store for config, editor and archive snapshots (follows storageRoot)."""
+        root = self._data_root() / "backup_store"
+        store = self._backups
+        if store is None or store.root != root:
+            store = self._backups = BackupStore(root)
+        return store
+
+    def _snapshot_match_files(self, paths: Iterable[Path], note: str) -> None:
+        """Editor backup of match files about to be rewritten (only changed chunks are stored)."""
+        sources = [
+            SnapshotSource(name=self._workspace.relative_label(path, self._paths.config), path=path)
+            for path in paths
+            if path.exists()
+        ]
+        if sources:
+            self._backup_store().snapshot("editor", sources, note=note)
+            self._backup_janitor.request()
+
+    def _backup_retention(self) -> RetentionPolicy:
+        return RetentionPolicy.from_dict(self._preferences.get("backupRetention"))
+
+    def _prune_backups(self) -> Dict[str, Any]:
+        """Janitor callback: apply the retention policy to the store and to exported archives.
+
+        Legacy `.bak` copies and JSON archives from before the store are never touched.
+        """
+        policy = self._backup_retention()
+        result = self._backup_store().prune(policy)
+        result["removedExports"] = len(prune_archives(self._exported_archives(), policy))
+        return result
+
+    def _exported_archives(self) -> List[Path]:
+        directory = self._archive_backup_dir()
+        return [*directory.glob("*.tar.zst"), *directory.glob("*.tar.gz")]
+
     def _load_preferences(self) -> Dict[str, Any]:
         path = self._preferences_path()
         if not path.exists():
@@ -354,9 +636,13 @@ matches:
         except Exception:
             return {}
 
-    def _save_preferences(self) -> None:
+    def _save_preferences(self, *, durable: bool = False) -> None:
+        # Bursts of preference updates collapse into one atomic write; shutdown flushes.
+        # `durable` settings (paths, backup and user-saved settings) are written before returning.
         path = self._preferences_path()
-        path.write_text(json.dumps(self._preferences, indent=2), encoding="utf-8")
+        self._state_writer.schedule(path, json.dumps(self._preferences, indent=2))
+        if durable:
+            self._state_writer.flush(path)
 
     def _default_snippetsense_settings(self) -> Dict[str, Any]:
         return {
@@ -388,7 +674,7 @@ matches:
     def _save_snippetsense_pending(self) -> None:
         path = self._snippetsense_state_path()
         try:
-            path.write_text(json.dumps(self._snippetsense_pending, indent=2), encoding="utf-8")
+            self._state_writer.schedule(path, json.dumps(self._snippetsense_pending, indent=2))
         except Exception:
             pass
 
@@ -426,97 +712,74 @@ matches:
             else:
                 shutil.copy2(item, target)
 
+    def _match_snapshot_path(self) -> Path:
+        return self._data_root() / "match_snapshot.pickle"
+
+    def _restore_match_snapshot(self) -> bool:
+        """Fill an empty match cache from the last session's snapshot (`matchSnapshot: false` disables)."""
+        if not self._preferences.get("matchSnapshot", True) or self._match_files.files():
+            return False
+        started = time.perf_counter()
+        files = load_snapshot(self._match_snapshot_path(), self._paths.match)
+        if not files:
+            return False
+        with self._match_lock:
+            if not self._match_files.seed(files):
+                return False
+            # Indexes are built here from the seeded records, so search and CRUD see them at once
+            self._publish_match_changes(self._match_files.files(), persist=False)
+        print(
+            f"[INFO] Restored {len(self._match_cache)} snippets from snapshot in "
+            f"{(time.perf_counter() - started) * 1000:.0f} ms; validating in background",
+            flush=True,
+        )
+        return True
+
+    def _save_match_snapshot(self) -> int:
+        """SnapshotWriter callback: persist the current match cache for the next start."""
+        if not self._preferences.get("matchSnapshot", True):
+            return 0
+        return save_snapshot(self._match_snapshot_path(), self._paths.match, self._match_files.export(), self._bodies)
+
     def _populate_matches(self) -> None:
-        """Load and parse all match files with error tracking."""
-        matches: List[Dict[str, Any]] = []
+        """Sync the match cache with disk, re-parsing only files that changed."""
+        with self._match_lock:
+            self._sync_match_cache()
+
+    def _sync_match_cache(self) -> None:
         match_dir = self._paths.match
 
         if not match_dir.exists():
             print(f"[WARNING] Match directory does not exist: {match_dir}", flush=True)
-            self._match_cache = matches
+            self._match_files.invalidate()
+            self._publish_match_changes([])
             return
 
-        yaml_files = list(match_dir.glob("*.yml"))
-
-        yaml_errors = []
-        for file in yaml_files:
-            try:
-                data = self.yaml_processor.load(file)
-            except Exception as exc:
-                # Track YAML errors for diagnostics but continue processing
-                print(f"[ERROR] Failed to load {file.name}: {exc}", flush=True)
-                yaml_errors.append({"file": file.name, "error": str(exc)})
-                continue
-
-            try:
-                flattened = self.yaml_processor.flatten_matches(data)
-                for match in flattened:
-                    delay_value = self._sanitize_delay_value(match.delay)
-                    has_form = bool(match.form)
-                    has_vars = bool(match.variables)
-                    matches.append(
-                        {
-                            "name": match.name,
-                            "trigger": match.trigger,
-                            "replace": match.replace,
-                            "variables": match.variables,
-                            "enabled": match.enabled,
-                            "file": file.name,
-                            "label": match.label or "",
-                            "backend": match.backend or "",
-                            "delay": delay_value,
-                            "left_word": match.left_word,
-                            "right_word": match.right_word,
-                            "uppercase_style": match.uppercase_style or "",
-                            "image_path": match.image_path or "",
-                            "word": match.word,
-                            "propagate_case": match.propagate_case,
-                            "form": match.form,
-                            "hasForm": has_form,
-                            "hasVars": has_vars,
-                        }
-                    )
-            except Exception as exc:
-                # Track processing errors
-                print(f"[ERROR] Failed to process matches in {file.name}: {exc}", flush=True)
-                yaml_errors.append({"file": file.name, "error": f"Processing error: {exc}"})
-
-        self._match_cache = matches
-        print(f"[INFO] Loaded {len(matches)} snippets from {len(yaml_files)} files", flush=True)
-        # Store errors for diagnostics (could be exposed to UI later)
-        self._yaml_errors = yaml_errors
+        yaml_files = self._workspace.match_entries(match_dir)
+        result = self._match_files.sync(yaml_files)
+        if result.changed or not self._match_cache:
+            self._publish_match_changes(result.reparsed + result.removed)
+        print(
+            f"[INFO] Loaded {len(self._match_cache)} snippets from {len(yaml_files)} files "
+            f"({len(result.reparsed)} re-parsed, {result.reused} cached)",
+            flush=True,
+        )
 
     def _get_event_snapshot(self) -> List[Dict[str, Any]]:
         with self._event_lock:
             return list(self._events)
 
-    def _run_connection_sequence(self) -> None:
-        self._connection_steps = []
-        steps: List[Tuple[str, Callable[[], Tuple[str, str]]]] = [
-            ("Ensure Espanso CLI", self._ensure_espanso_installed),
-            ("Espanso service running", self._start_espanso_service),
+    _SERVICE_PROBE = "Espanso service running"
+
+    def _connection_probes(self) -> List[Tuple[str, Callable[[], Tuple[str, str]]]]:
+        return [
+            ("Ensure Espanso CLI", self._check_espanso_installed),
+            (self._SERVICE_PROBE, self._check_espanso_service),
             ("Check Espanso version", self._check_cli_available),
             ("Detect configuration paths", self._verify_paths),
             ("Validate YAML structure", self._validate_yaml),
             ("Ensure watcher ping", self._check_watcher),
         ]
-        for label, action in steps:
-            self._record_step(label, action)
-
-    def _record_step(self, label: str, action: Callable[[], Tuple[str, str]]) -> None:
-        try:
-            status, detail = action()
-        except Exception as exc:
-            status = "error"
-            detail = str(exc)
-        self._connection_steps.append(
-            {
-                "label": label,
-                "status": status,
-                "detail": detail,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-            }
-        )
 
     def _check_cli_available(self) -> Tuple[str, str]:
         result = self.cli.run(["--version"])
@@ -525,6 +788,39 @@ matches:
             return "success", message
         return "error", result.stderr.strip() or result.stdout.strip() or "Espanso CLI missing"
 
+    def _bootstrap_espanso(self) -> None:
+        """Once per launch (before the first probe cycle): install/start Espanso unless the user opted out."""
+        if not self._preferences.get("autoStartEspanso", True):
+            return
+        status, detail = self._ensure_espanso_installed()
+        if status != "success":
+            print(f"[WARNING] {detail}", flush=True)
+            return
+        if self._service_stopped_by_user:
+            return
+        status, detail = self._start_espanso_service()
+        if status != "success":
+            print(f"[WARNING] Could not start Espanso: {detail}", flush=True)
+
+    @staticmethod
+    def _reports_running(returncode: int, output: str) -> bool:
+        state = output.lower()
+        return returncode == 0 and "running" in state and "not running" not in state
+
+    def _check_espanso_installed(self) -> Tuple[str, str]:
+        """Probe: is the CLI on PATH (read-only; installing happens only in the bootstrap)."""
+        if shutil.which("espanso"):
+            return "success", "Espanso CLI already present"
+        return "error", "Espanso CLI not found on PATH"
+
+    def _check_espanso_service(self) -> Tuple[str, str]:
+        """Probe: is the daemon running (read-only, so a user's stop is never undone)."""
+        result = self.cli.run(["status"], fresh=True)
+        output = (result.stdout or result.stderr or "").strip()
+        if self._reports_running(result.returncode, output):
+            return "success", output or "Espanso running"
+        return "error", output or "Espanso is not running"
+
     def _ensure_espanso_installed(self) -> Tuple[str, str]:
         if shutil.which("espanso"):
             return "success", "Espanso CLI already present"
@@ -564,9 +860,9 @@ matches:
 
     def _start_espanso_service(self) -> Tuple[str, str]:
         """Ensure the Espanso daemon is running without spamming start commands."""
-        status_result = self.cli.run(["status"])
+        status_result = self.cli.run(["status"], fresh=True)
         status_output = (status_result.stdout or status_result.stderr or "").strip()
-        if status_result.returncode == 0 and "running" in status_output.lower():
+        if self._reports_running(status_result.returncode, status_output):
             return "success", status_output or "Espanso already running"
 
         result = self.cli.run(["start"])
@@ -586,12 +882,13 @@ matches:
         return "success", details
 
     def _validate_yaml(self) -> Tuple[str, str]:
-        match_files = list(self._paths.match.glob("*.yml"))
+        match_files = self._workspace.match_entries(self._paths.match)
         if not match_files:
             return "warning", "No match files yet; waiting for snippets."
+        first_file, first_label = match_files[0]
         try:
-            self.yaml_processor.load(match_files[0])
-            return "success", f"Parsed {match_files[0].name}"
+            self.yaml_processor.load(first_file)
+            return "success", f"Parsed {first_label} ({self.yaml_processor.backend} backend)"
         except Exception as exc:
             return "error", f"YAML parse failed: {exc}"
 
@@ -624,14 +921,25 @@ matches:
         status = "success" if result.returncode == 0 else "error"
         return {"status": status, "detail": detail or f"Command {' '.join(args)} completed"}
 
+    _HEALTH_FIRST_WAIT = 15.0
+
+    def refresh_health(self, wait: bool = False) -> Dict[str, Any]:
+        """Re-run the connection probes now (optionally waiting) instead of on the adaptive schedule."""
+        self._health.refresh(wait=self._HEALTH_FIRST_WAIT if wait else None)
+        snapshot = self._health.snapshot()
+        return {"status": "success", "connectionSteps": snapshot.pop("steps"), "health": snapshot}
+
     def get_dashboard(self) -> Dict[str, Any]:
         """Get dashboard data with defensive initialization."""
         # Only repopulate if cache is empty (don't reload on every call)
         if not self._match_cache:
             self._populate_matches()
 
-        status = self.cli.status()
-        self._run_connection_sequence()
+        # Probes run on the health monitor thread; only the very first load waits for them
+        self._health.wait_first(timeout=self._HEALTH_FIRST_WAIT)
+        health = self._health.snapshot()
+        service = self._health.step(self._SERVICE_PROBE) or {}
+        connected = service.get("status") == "success"
 
         # Use cached data with fallbacks
         matches = self._match_cache if self._match_cache else []
@@ -642,19 +950,22 @@ matches:
         # Count match files safely
         match_files = 0
         if self._paths and self._paths.match and self._paths.match.exists():
-            match_files = len(list(self._paths.match.glob("*.yml")))
+            match_files = len(self._workspace.match_entries(self._paths.match))
 
         return {
             "configPath": str(self._paths.config) if self._paths else "Not configured",
-            "statusMessage": "Connected" if status["returncode"] == 0 else "CLI unavailable",
-            "cliStatus": status["stdout"] or status["stderr"] or "Ready",
+            "statusMessage": "Connected" if connected else ("Checking..." if not service else "CLI unavailable"),
+            "cliStatus": service.get("detail") or "Ready",
             "snippetCount": len(matches),
             "matchFileCount": match_files,
             "formSnippets": form_snippets,
             "variableSnippets": var_snippets,
             "eventCount": len(recent_events),
+            "yamlBackend": self.yaml_processor.backend,
+            "restart": self._restart_scheduler.state(),
             "recentEvents": recent_events[:10] if recent_events else [],
-            "connectionSteps": self._connection_steps if self._connection_steps else [],
+            "connectionSteps": health["steps"],
+            "health": {key: value for key, value in health.items() if key != "steps"},
         }
 
     def ping(self) -> Dict[str, Any]:
@@ -665,8 +976,21 @@ matches:
             "snippetCount": len(self._match_cache or []),
             "configPath": str(self._paths.config) if self._paths else "",
             "platform": self.platform.system,
+            "yamlBackend": self.yaml_processor.backend,
         }
 
+    def subscribe_events(self) -> Dict[str, Any]:
+        """Called once the page's event receiver is installed; pushes start after the returned `seq`."""
+        return {"status": "success", "seq": self._event_channel.subscribe()}
+
+    def get_events_since(self, seq: int) -> Dict[str, Any]:
+        """Missed events after `seq` (when the page sees a sequence gap); `resync` means reload everything."""
+        try:
+            result = self._event_channel.since(int(seq))
+        except (TypeError, ValueError):
+            return {"status": "error", "detail": f"Invalid sequence number: {seq}"}
+        return {"status": "success", **result}
+
     def get_settings(self) -> Dict[str, Any]:
         status = self.cli.status()
         autostart = self._autostart_status()
@@ -695,6 +1019,7 @@ matches:
             "editorBackups": str(editor_backup),
             "manualBackups": str(manual_backup),
             "archiveBackups": str(archive_backup),
+            "backupStore": str(self._backup_store().root),
         }
 
     def set_config_override(self, new_path: str) -> Dict[str, Any]:
@@ -703,7 +1028,7 @@ matches:
             return {"status": "error", "detail": f"Config directory not found: {new_path}"}
         self._config_override = target
         self._preferences["configOverride"] = str(target)
-        self._save_preferences()
+        self._save_preferences(durable=True)
         self._initialize_paths(self._config_override)
         return {"status": "success", "detail": f"Config directory set to {target}", "paths": self.get_path_settings()}
 
@@ -723,7 +1048,7 @@ matches:
         self._config_override = None
         if "configOverride" in self._preferences:
             self._preferences.pop("configOverride")
-            self._save_preferences()
+            self._save_preferences(durable=True)
         self._initialize_paths(self._config_override)
         return {"status": "success", "detail": "Reverted to auto-detected Espanso paths", "paths": self.get_path_settings()}
 
@@ -737,7 +1062,7 @@ matches:
             if migrate and old_root.exists() and old_root != target:
                 self._copy_directory_contents(old_root, target)
             self._preferences["storageRoot"] = str(target)
-            self._save_preferences()
+            self._save_preferences(durable=True)
             return {"status": "success", "detail": f"Backups will now use {target}", "paths": self.get_path_settings()}
         except Exception as exc:
             return {"status": "error", "detail": f"Failed to update backup directory: {exc}"}
@@ -745,11 +1070,16 @@ matches:
     def clear_storage_root(self) -> Dict[str, Any]:
         if "storageRoot" in self._preferences:
             self._preferences.pop("storageRoot")
-            self._save_preferences()
+            self._save_preferences(durable=True)
         return {"status": "success", "detail": "Backups now stored in the default profile directory", "paths": self.get_path_settings()}
 
     def get_config_tree(self) -> Dict[str, Any]:
-        builder = ConfigTreeBuilder(self._paths.config, self._paths.match, self.yaml_processor)
+        builder = ConfigTreeBuilder(
+            self._paths.config,
+            self._paths.match,
+            self.yaml_processor,
+            workspace_index=self._workspace,
+        )
         return builder.describe()
 
     def pick_path_dialog(self, prompt: str = "Select a file", directory: bool = False) -> Dict[str, Any]:
@@ -810,21 +1140,26 @@ matches:
         return self._run_package_command(["package", "install", name])
 
     def start_service(self) -> Dict[str, str]:
+        self._service_stopped_by_user = False
         result = self.cli.run(["start"])
         detail = result.stdout.strip() or result.stderr.strip()
         status = "success" if result.returncode == 0 else "warning"
+        self._health.refresh()
         return {"status": status, "detail": detail or "Espanso start requested"}
 
     def stop_service(self) -> Dict[str, str]:
+        self._service_stopped_by_user = True
         result = self.cli.run(["stop"])
         detail = result.stdout.strip() or result.stderr.strip()
         status = "success" if result.returncode == 0 else "warning"
+        self._health.refresh()
         return {"status": status, "detail": detail or "Espanso stop requested"}
 
     def restart_service(self) -> Dict[str, str]:
-        result = self.cli.reload()
+        result = self._restart_scheduler.run_now("manual")
         detail = result.stdout.strip() or result.stderr.strip()
         status = "success" if result.returncode == 0 else "warning"
+        self._health.refresh()
         return {"status": status, "detail": detail or "Espanso restart issued"}
 
     def test_shell_command(self, command: str, timeout: int = 5, use_shell: bool = True) -> Dict[str, Any]:
@@ -898,7 +1233,7 @@ matches:
                     content += f'filter_title: "{filter_title}"\n'
                 content += "\nmatches:\n  - trigger: \":example\"\n    replace: \"App-specific snippet\"\n"
 
-            config_file.write_text(content, encoding="utf-8")
+            atomic_write_text(config_file, content, fsync_dir=True)
             return {"status": "success", "detail": f"Created {app_name}.yml"}
         except Exception as e:
             return {"status": "error", "detail": str(e)}
@@ -963,76 +1298,154 @@ matches:
             return {"status": "error", "matched": False, "detail": str(e)}
 
     def backup_config(self) -> Dict[str, str]:
-        """Create manual backup of entire config directory."""
+        """Snapshot the entire config directory into the backup store."""
         try:
-            import shutil
-            from datetime import datetime
-
-            backup_dir = self._manual_backup_dir()
-
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_name = f"config_backup_{timestamp}"
-            backup_path = backup_dir / backup_name
+            manifest = self._backup_store().snapshot_tree("config", self._paths.config, note="manual")
+            self._backup_janitor.request()
+            return {
+                "status": "success",
+                "detail": f"Backup created: {manifest['id']} ({manifest['storedBytes']} new bytes)",
+                "path": str(self._backup_store().root),
+                "id": manifest["id"],
+                "storedBytes": manifest["storedBytes"],
+            }
+        except Exception as e:
+            return {"status": "error", "detail": str(e)}
 
-            config_dir = self._paths.config
-            shutil.copytree(config_dir, backup_path)
+    def _restore_entries(self, backup_name: str) -> Tuple[Dict[str, BackupEntry], bool]:
+        """Files of a backup, and whether restoring it should delete files the backup lacks.
+
+        Config snapshots and legacy folders are whole-tree copies; editor and archive
+        snapshots hold only some files, so restoring them never deletes anything.
+        """
+        store = self._backup_store()
+        if backup_name and store.has_snapshot(backup_name):
+            return snapshot_entries(store, backup_name), store.manifest(backup_name).get("kind") == "config"
+        backup_path = self._manual_backup_dir() / backup_name
+        if not backup_name or not backup_path.is_dir() or backup_path.parent != self._manual_backup_dir():
+            raise FileNotFoundError(f"Backup not found: {backup_name}")
+        return folder_entries(backup_path), True
+
+    def _plan_restore(self, backup_name: str, options: Optional[Dict[str, Any]]) -> Tuple[RestorePlan, Dict[str, BackupEntry]]:
+        options = options or {}
+        entries, delete_extra = self._restore_entries(backup_name)
+        if options.get("deleteExtra") is not None:
+            delete_extra = bool(options["deleteExtra"])
+        plan = plan_restore(
+            entries.values(),
+            self._paths.config,
+            delete_extra=delete_extra,
+            include_diff=bool(options.get("includeDiff")),
+            max_diff_lines=self._coerce_int(options.get("maxDiffLines")) or 200,
+        )
+        return plan, entries
 
-            return {"status": "success", "detail": f"Backup created: {backup_name}", "path": str(backup_path)}
+    def preview_restore(self, backup_name: str, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Dry run of restore_config: which files would be added, overwritten or deleted (with diffs if `includeDiff`)."""
+        try:
+            plan, _ = self._plan_restore(backup_name, options)
+            return {"status": "success", "detail": self._restore_summary(plan), "plan": plan.to_dict()}
         except Exception as e:
             return {"status": "error", "detail": str(e)}
 
-    def restore_config(self, backup_name: str) -> Dict[str, str]:
-        """Restore config from backup."""
+    def restore_config(self, backup_name: str, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Restore config from a store snapshot (or a legacy copied backup folder), rewriting only files that differ."""
+        options = options or {}
+        if options.get("dryRun"):
+            return self.preview_restore(backup_name, options)
         try:
-            import shutil
-
-            backup_dir = self._manual_backup_dir()
-            backup_path = backup_dir / backup_name
-
-            if not backup_path.exists():
-                return {"status": "error", "detail": f"Backup not found: {backup_name}"}
-
-            config_dir = self._paths.config
-            temp_backup = config_dir.parent / f"{config_dir.name}_temp_backup"
-
-            if config_dir.exists():
-                shutil.move(str(config_dir), str(temp_backup))
-
-            try:
-                shutil.copytree(backup_path, config_dir)
-                if temp_backup.exists():
-                    shutil.rmtree(temp_backup)
-                self._match_cache = []
-                self._populate_matches()
-                return {"status": "success", "detail": f"Restored from: {backup_name}"}
-            except Exception as e:
-                if temp_backup.exists():
-                    if config_dir.exists():
-                        shutil.rmtree(config_dir)
-                    shutil.move(str(temp_backup), str(config_dir))
-                raise e
+            plan, entries = self._plan_restore(backup_name, options)
+            if not plan.changes:
+                return {"status": "success", "detail": f"Already matches {backup_name}", "plan": plan.to_dict()}
+
+            # Keep the current state restorable before overwriting anything
+            self._backup_store().snapshot_tree("config", self._paths.config, note=f"before restore of {backup_name}")
+            self._backup_janitor.request()
+            touched = apply_restore(plan, entries, self._paths.config)
+
+            if plan.count("added") or plan.count("removed"):
+                self._workspace.invalidate()
+            match_paths = [path for path in touched if self._match_file_label(path) is not None]
+            with self._match_lock:
+                for path in match_paths:
+                    if path.exists():
+                        self._match_files.invalidate(path)
+                self._reload_match_paths(match_paths)
+            return {
+                "status": "success",
+                "detail": f"Restored from {backup_name}: {self._restore_summary(plan)}",
+                "plan": plan.to_dict(),
+            }
         except Exception as e:
             return {"status": "error", "detail": str(e)}
 
+    @staticmethod
+    def _restore_summary(plan: RestorePlan) -> str:
+        return (
+            f"{plan.count('added')} added, {plan.count('changed')} changed, "
+            f"{plan.count('removed')} removed, {plan.unchanged} unchanged"
+        )
+
     def list_backups(self) -> Dict[str, Any]:
-        """List available manual backups."""
+        """List config backups from the store's manifests, plus legacy copied folders."""
         try:
-            backup_dir = self._manual_backup_dir()
-            if not backup_dir.exists():
-                return {"status": "success", "backups": []}
-
             backups = []
-            for item in sorted(backup_dir.iterdir(), reverse=True):
+            for snapshot in self._backup_store().snapshots("config"):
+                backups.append({
+                    "name": snapshot["id"],
+                    "path": snapshot["path"],
+                    "created": datetime.fromisoformat(snapshot["created"]).timestamp(),
+                    "files": snapshot["files"],
+                    "totalBytes": snapshot["totalBytes"],
+                    "storedBytes": snapshot["storedBytes"],
+                })
+            backup_dir = self._manual_backup_dir()
+            for item in backup_dir.iterdir():
                 if item.is_dir():
                     backups.append({
                         "name": item.name,
                         "path": str(item),
-                        "created": item.stat().st_mtime
+                        "created": item.stat().st_mtime,
+                        "legacy": True,
                     })
+            backups.sort(key=lambda item: item["created"], reverse=True)
             return {"status": "success", "backups": backups}
         except Exception as e:
             return {"status": "error", "backups": [], "detail": str(e)}
 
+    def get_backup_settings(self) -> Dict[str, Any]:
+        """Retention policy, store usage and the last pruning run."""
+        try:
+            return {
+                "status": "success",
+                "retention": self._backup_retention().to_dict(),
+                "usage": self._backup_store().usage(),
+                "lastPrune": self._backup_janitor.last(),
+            }
+        except Exception as e:
+            return {"status": "error", "detail": str(e)}
+
+    def save_backup_retention(self, settings: Dict[str, Any]) -> Dict[str, Any]:
+        """Persist {keepRecent, keepDaily, keepWeekly, maxBytes} and prune in the background."""
+        policy = RetentionPolicy.from_dict(settings or {})
+        self._preferences["backupRetention"] = policy.to_dict()
+        self._save_preferences(durable=True)
+        self._backup_janitor.request()
+        return {"status": "success", "detail": "Backup retention saved", "retention": policy.to_dict()}
+
+    def prune_backups(self) -> Dict[str, Any]:
+        """Apply the retention policy now."""
+        return self._backup_janitor.run_now()
+
+    def export_backup(self, backup_name: str) -> Dict[str, Any]:
+        """Stream a stored backup into a compressed tar in the archive folder."""
+        try:
+            target = self._backup_store().export_archive(backup_name, self._archive_backup_dir())
+            self._backup_janitor.request()
+            return {"status": "success", "detail": f"Exported to {target}", "path": str(target)}
+        except Exception as e:
+            return {"status": "error", "detail": str(e)}
+
     def get_snippetsense_state(self) -> Dict[str, Any]:
         status = {
             "available": self._snippetsense_available,
@@ -1063,7 +1476,7 @@ matches:
             })
             self._snippetsense_settings = sanitized
             self._preferences["snippetsense"] = sanitized
-            self._save_preferences()
+            self._save_preferences(durable=True)
             if sanitized["enabled"]:
                 self._start_snippetsense_engine()
             else:
@@ -1137,6 +1550,47 @@ matches:
         self._mark_snippetsense_handled(phrase_hash)
         return {"status": "success", "detail": "Suggestion dismissed"}
 
+    _JOB_OPERATIONS = {
+        "doctor": ("doctor",),
+        "log": ("log",),
+        "package-install": ("package", "install"),
+        "package-uninstall": ("package", "uninstall"),
+        "package-update": ("package", "update"),
+    }
+
+    def start_cli_job(self, operation: str, argument: str = "") -> Dict[str, Any]:
+        """Run a long espanso command in the background; poll it with get_cli_job.
+
+        `operation` is one of doctor, log, package-install, package-uninstall or
+        package-update (`argument` names the package; update without one updates all).
+        """
+        try:
+            base = self._JOB_OPERATIONS.get(str(operation or "").lower())
+            if base is None:
+                return {"status": "error", "detail": f"Unsupported job '{operation}'"}
+            argument = (argument or "").strip()
+            if base[-1] in ("install", "uninstall") and not argument:
+                return {"status": "error", "detail": "Package name is required"}
+            args = [*base, argument] if argument and base[0] == "package" else list(base)
+            return {"status": "success", "job": self.cli.submit(args)}
+        except Exception as exc:
+            return {"status": "error", "detail": f"Failed to start job: {exc}"}
+
+    def get_cli_job(self, job_id: str, cursor: int = 0) -> Dict[str, Any]:
+        """Job state plus output chunks after `cursor` (pass back the returned cursor to stream)."""
+        snapshot = self.cli.jobs.snapshot(job_id, self._coerce_int(cursor) or 0)
+        if snapshot is None:
+            return {"status": "error", "detail": f"Unknown job: {job_id}"}
+        return {"status": "success", "job": snapshot}
+
+    def cancel_cli_job(self, job_id: str) -> Dict[str, Any]:
+        if self.cli.jobs.cancel(job_id):
+            return {"status": "success", "detail": "Cancellation requested"}
+        return {"status": "error", "detail": "Job not found or already finished"}
+
+    def list_cli_jobs(self) -> Dict[str, Any]:
+        return {"status": "success", "jobs": self.cli.jobs.jobs()}
+
     def doctor_diagnostics(self) -> Dict[str, Any]:
         """Run espanso doctor to get diagnostics."""
         try:
@@ -1212,18 +1666,21 @@ matches:
             if file_path.endswith('.json'):
                 snippets = json.loads(content)
             else:
-                snippets = yaml.safe_load(content)
+                snippets = self.yaml_processor.load_document(content)
 
             if not isinstance(snippets, list):
                 snippets = snippets.get('matches', [])
 
-            count = 0
-            for snippet in snippets:
-                if 'trigger' in snippet and 'replace' in snippet:
-                    self.create_snippet(snippet)
-                    count += 1
-
-            return {"status": "success", "detail": f"Imported {count} snippets"}
+            operations = [
+                {"op": "create", "snippet": snippet}
+                for snippet in snippets
+                if isinstance(snippet, dict) and 'trigger' in snippet and 'replace' in snippet
+            ]
+            result = self._run_snippet_batch(operations, skip_conflicts=True)
+            detail = f"Imported {result['applied']} snippets"
+            if result["skipped"]:
+                detail += f" ({result['skipped']} skipped)"
+            return {"status": "success", "detail": detail, "skipped": result["skipped"]}
         except Exception as e:
             return {"status": "error", "detail": str(e)}
 
@@ -1237,8 +1694,7 @@ matches:
                 if snippet.get('status') == 'success':
                     snippets.append(snippet.get('snippet', {}))
 
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(snippets, f, indent=2, ensure_ascii=False)
+            atomic_write_text(file_path, json.dumps(snippets, indent=2, ensure_ascii=False))
 
             return {"status": "success", "detail": f"Exported {len(snippets)} snippets"}
         except Exception as e:
@@ -1251,8 +1707,7 @@ matches:
             if not base_file.exists():
                 return {"status": "success", "variables": []}
 
-            with open(base_file, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f) or {}
+            data = self.yaml_processor.load(base_file)
 
             normalized: List[Dict[str, Any]] = []
             for raw in data.get('global_vars', []) or []:
@@ -1276,8 +1731,7 @@ matches:
             if not base_file.exists():
                 return {"status": "error", "detail": "base.yml not found"}
 
-            with open(base_file, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f) or {}
+            data = self.yaml_processor.load(base_file)
 
             sanitized: List[Dict[str, Any]] = []
             for item in variables or []:
@@ -1293,8 +1747,7 @@ matches:
 
             data['global_vars'] = sanitized
 
-            with open(base_file, 'w', encoding='utf-8') as f:
-                yaml.dump(data, f, default_flow_style=False, allow_unicode=True, sort_keys=False)
+            atomic_write_text(base_file, self.yaml_processor.dumps(data), fsync_dir=True)
 
             return {"status": "success", "detail": "Global variables updated"}
         except Exception as e:
@@ -1388,67 +1841,150 @@ matches:
         except Exception as e:
             return {"status": "error", "detail": str(e)}
 
-    def list_snippets(self) -> List[Dict[str, Any]]:
-        """Return cached snippets, populating if necessary."""
+    def list_snippets(self, options: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Return cached snippets, populating if necessary.
+
+        `options` accepts offset/limit/sort/order/fields/previewLength to return a single
+        sorted, projected page instead of the whole cache.
+        """
         if not self._match_cache:
             self._populate_matches()
-        return self._match_cache if self._match_cache else []
-
-    def _snippet_matches_filters(self, snippet: Dict[str, Any], query: str, filters: Dict[str, Any]) -> bool:
-        file_filter = (filters.get("file") or "").strip().lower()
-        if file_filter and (snippet.get("file") or "").lower() != file_filter:
-            return False
-
-        enabled_filter = (filters.get("enabled") or "").strip().lower()
-        enabled_value = snippet.get("enabled", True)
-        if enabled_filter == "enabled" and enabled_value is False:
-            return False
-        if enabled_filter == "disabled" and not (enabled_value is False):
-            return False
-
-        if self._interpret_filter_bool(filters.get("hasVars")) and not snippet.get("hasVars"):
-            return False
-        if self._interpret_filter_bool(filters.get("hasForm")) and not snippet.get("hasForm"):
-            return False
-
-        label_filter = (filters.get("label") or "").strip().lower()
-        if label_filter and label_filter not in (snippet.get("label") or "").lower():
-            return False
-
-        if query:
-            haystack_parts = [
-                snippet.get("trigger") or "",
-                snippet.get("replace") or "",
-                snippet.get("label") or "",
-                snippet.get("file") or "",
-            ]
-            haystack = " ".join(haystack_parts).lower()
-            if query not in haystack:
-                return False
+        snippets = self._match_cache if self._match_cache else []
+        request = PageRequest.from_options(options)
+        if request.is_default:
+            return as_dicts(snippets)
+        return page_snippets(snippets, request)["results"]
+
+    def get_snippet_changes(self, since_revision: int = 0, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Snippets added/updated and tombstones of removed ones after `since_revision`.
+
+        Each record carries `id` and `revision`; keep the returned `revision` for the next
+        call. `reset` means the response is a full copy (first call, or too far behind).
+        `options` accepts `fields`/`previewLength` (as in list_snippets) and `limit`.
+        """
+        if not self._match_cache:
+            self._populate_matches()
+        try:
+            since = int(since_revision or 0)
+        except (TypeError, ValueError):
+            return {"status": "error", "detail": f"Invalid revision: {since_revision}"}
+        request = PageRequest.from_options(options)
+        changes = self._snippet_revisions.changes_since(since, limit=request.limit)
+        if request.fields:
+            keep = [*request.fields, "id", "revision"]
+            changes["changed"] = [project(record, keep, request.preview_chars) for record in changes["changed"]]
+        return {"status": "success", **changes}
+
+    def search_snippets(
+        self,
+        query: str = "",
+        filters: Optional[Dict[str, Any]] = None,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Search snippets with optional filters and paging/sort/projection `options`.
+
+        `options["mode"]` selects "substring" (default), "prefix" (trigger starts with the
+        query) or "fuzzy" (ranked, typo-tolerant; `scores` lists each result's rank tier).
+        """
+        try:
+            if not self._match_cache:
+                self._populate_matches()
+            snippets = self._match_cache if self._match_cache else []
+            request = PageRequest.from_options(options)
+            mode = str((options or {}).get("mode") or "substring").lower()
+            scores: Optional[List[int]] = None
+            if mode == "fuzzy":
+                ranked = self._search_index.search_ranked(
+                    query,
+                    filters or {},
+                    interpret_bool=self._interpret_filter_bool,
+                    max_distance=self._coerce_int((options or {}).get("maxDistance")),
+                )
+                results = [snippet for snippet, _ in ranked]
+                scores = [rank for _, rank in ranked]
+            else:
+                results = self._search_index.search(
+                    query,
+                    filters or {},
+                    interpret_bool=self._interpret_filter_bool,
+                    prefix=mode == "prefix",
+                )
+            if request.is_default:
+                response = {
+                    "status": "success",
+                    "results": as_dicts(results),
+                    "count": len(results),
+                    "total": len(snippets),
+                }
+                if scores is not None:
+                    response["scores"] = scores
+                return response
+            if scores is not None and request.sort is None:
+                end = None if request.limit is None else request.offset + request.limit
+                scores = scores[request.offset:end]
+            else:
+                scores = None
+            page = page_snippets(results, request)
+            page.update({"status": "success", "total": len(snippets)})
+            if scores is not None:
+                page["scores"] = scores
+            return page
+        except Exception as exc:
+            return {"status": "error", "detail": f"Failed to search snippets: {exc}"}
 
-        return True
+    def get_trigger_conflicts(self, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Report duplicate triggers and triggers that shadow longer ones as you type.
 
-    def search_snippets(self, query: str = "", filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Search snippets with optional filters."""
+        `options["includeMitigated"]` (default True) keeps prefix/infix pairs where the shorter
+        trigger needs a word boundary that the longer one never provides; `kind` keeps only
+        "duplicate", "prefix" or "infix" entries and `limit` caps the returned list (counts stay whole).
+        """
         try:
             if not self._match_cache:
                 self._populate_matches()
-            snippets = self._match_cache if self._match_cache else []
-            normalized_query = (query or "").strip().lower()
-            filters = filters or {}
-            results = [
-                snippet
-                for snippet in snippets
-                if self._snippet_matches_filters(snippet, normalized_query, filters)
-            ]
+            options = options or {}
+            include_mitigated = self._interpret_filter_bool(options.get("includeMitigated", True))
+            conflicts = self._trigger_trie.conflicts(include_mitigated=include_mitigated)
+            kind = options.get("kind")
+            if kind:
+                conflicts = [conflict for conflict in conflicts if conflict.kind == kind]
+            limit = self._coerce_int(options.get("limit"))
+            shown = conflicts[:limit] if limit and limit > 0 else conflicts
             return {
                 "status": "success",
-                "results": results,
-                "count": len(results),
-                "total": len(snippets),
+                "conflicts": [_conflict_to_dict(conflict) for conflict in shown],
+                "count": len(conflicts),
+                "duplicates": sum(1 for conflict in conflicts if conflict.kind == "duplicate"),
+                "shadowed": sum(1 for conflict in conflicts if conflict.kind != "duplicate" and not conflict.mitigated),
             }
         except Exception as exc:
-            return {"status": "error", "detail": f"Failed to search snippets: {exc}"}
+            return {"status": "error", "detail": f"Failed to analyze triggers: {exc}"}
+
+    def check_trigger(self, trigger: str, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Check a trigger being typed in the editor against the whole library.
+
+        `options` may carry `word`/`left_word`/`right_word` for the snippet being edited and
+        `originalTrigger` so an edit is not reported as a duplicate of itself.
+        """
+        try:
+            trigger = (trigger or "").strip()
+            if not trigger:
+                return {"status": "success", "conflicts": [], "count": 0}
+            options = options or {}
+            conflicts = self._trigger_trie.check(
+                trigger,
+                word=bool(options.get("word")),
+                left_word=bool(options.get("left_word")),
+                right_word=bool(options.get("right_word")),
+                ignore=options.get("originalTrigger") or None,
+            )
+            return {
+                "status": "success",
+                "conflicts": [_conflict_to_dict(conflict) for conflict in conflicts],
+                "count": len(conflicts),
+            }
+        except Exception as exc:
+            return {"status": "error", "detail": f"Failed to check trigger: {exc}"}
 
     def refresh_files(self) -> Dict[str, Any]:
         self._populate_matches()
@@ -1474,21 +2010,19 @@ matches:
             self.yaml_processor.load_str(content)
 
             # Create backup before saving
-            if base_file.exists():
-                backup_dir = self._editor_backup_dir()
-                backup_file = backup_dir / f"base.yml.{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')}.bak"
-                backup_file.write_text(base_file.read_text(encoding="utf-8"), encoding="utf-8")
+            self._snapshot_match_files([base_file], "base.yml saved")
 
             # Save new content
-            base_file.write_text(content, encoding="utf-8")
+            atomic_write_text(base_file, content, fsync_dir=True)
 
             # Refresh snippets cache
+            self._match_files.invalidate(base_file)
             self.refresh_files()
 
-            # Reload espanso to apply changes
-            self.cli.run(["restart"])
+            # Reload espanso to apply changes (debounced, off the bridge thread)
+            restart_state = self._restart_scheduler.request("base.yml saved")
 
-            return {"status": "success", "detail": f"Saved and reloaded Espanso"}
+            return {"status": "success", "detail": "Saved; Espanso reload scheduled", "restart": restart_state}
         except Exception as exc:
             return {"status": "error", "detail": f"Failed to save: {exc}"}
 
@@ -1551,178 +2085,231 @@ matches:
         else:
             match.pop("enabled", None)
 
-    def create_snippet(self, snippet_data: Dict[str, Any]) -> Dict[str, str]:
-        """Create a new snippet in base.yml."""
-        try:
-            trigger = (snippet_data.get("trigger") or "").strip()
+    def _build_match(self, snippet_data: Dict[str, Any], existing: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build the match dict for a create/update, keeping unknown keys of `existing`."""
+        trigger = (snippet_data.get("trigger") or "").strip()
+        if snippet_data.get("replaceLazy") and existing and isinstance(existing.get("replace"), str):
+            # A list record only carries the preview of a long body; keep the one on disk
+            replace = existing["replace"]
+        else:
             replace = self._normalize_replace_text(
                 snippet_data.get("replace", ""),
                 prefer_windows_line_endings=self.platform.is_windows,
             )
-            if not trigger or not replace.strip():
-                return {"status": "error", "detail": "Trigger and replacement are required"}
-
-            base_file = self._paths.match / "base.yml"
-
-            # Load existing content
-            if base_file.exists():
-                data = self.yaml_processor.load(base_file)
-            else:
-                data = {"matches": []}
-
-            # Ensure match list exists
-            matches = data.setdefault("matches", [])
-            if any(match.get("trigger") == trigger for match in matches):
-                return {"status": "error", "detail": f"Snippet '{trigger}' already exists"}
-
-            # Build new match object
-            new_match = {"trigger": trigger, "replace": replace}
-            self._assign_snippet_optional_fields(new_match, snippet_data)
+        if not trigger or not replace.strip():
+            raise ValueError("Trigger and replacement are required")
+        match = dict(existing) if existing else {}
+        match["trigger"] = trigger
+        match["replace"] = replace
+        self._assign_snippet_optional_fields(match, snippet_data)
+        return match
+
+    def _trigger_files(self, trigger: str) -> List[str]:
+        return [location.file for location in self._snippet_locator.locate(trigger)]
+
+    def _read_source_item(self, path: Path, trigger: str) -> Optional[SourceItem]:
+        """The item defining `trigger` in `path`, read from the source lines the cache recorded.
+
+        None when the file's fingerprint no longer matches the cached parse (the
+        batch then loads and scans the whole file).
+        """
+        entry = self._match_files.entry(path)
+        location = self._snippet_locator.first(trigger, entry.label) if entry else None
+        if location is None or location.line is None or location.end_line is None:
+            return None
+        try:
+            text = path.read_text(encoding="utf-8")
+            if not fingerprint_file(path).same_stat(entry.fingerprint):
+                return None
+        except OSError:
+            return None
+        found = self._match_editor.read_item(text, location.line, location.end_line)
+        if found is None or not defines(found[1], trigger):
+            return None
+        span, match = found
+        return SourceItem(
+            match=match,
+            rewrite=lambda updated: self._match_editor.replace_item(text, span, updated),
+            only=len(entry.snippets) == 1,
+        )
 
-            matches.append(new_match)
+    def _run_snippet_batch(
+        self,
+        operations: Iterable[Any],
+        *,
+        skip_conflicts: bool = False,
+        restart: bool = True,
+    ) -> Dict[str, Any]:
+        """Validate every operation in memory, then write each touched file once and restart once."""
+        batch = SnippetBatch(
+            self._paths.match,
+            self.yaml_processor.load,
+            self._build_match,
+            self._trigger_files,
+            read_item=self._read_source_item,
+        )
+        results: List[Dict[str, Any]] = []
+        saved: List[str] = []
+        for index, raw in enumerate(operations or []):
+            try:
+                operation = BatchOperation.from_dict(raw)
+                results.append({"index": index, "status": "success", "detail": batch.apply(operation)})
+                if operation.op in ("create", "update"):
+                    saved.append(str(operation.snippet.get("trigger") or operation.trigger).strip())
+                else:
+                    saved.append("")
+            except BatchConflict as exc:
+                if not skip_conflicts:
+                    return {"status": "error", "detail": str(exc), "index": index, "applied": 0}
+                results.append({"index": index, "status": "skipped", "detail": str(exc)})
+                saved.append("")
+
+        touched = batch.touched
+        restart_state = None
+        if touched:
+            self._commit_snippet_batch(batch)
+            if restart:
+                restart_state = self._restart_scheduler.request("snippet edit")
+
+        for result, trigger in zip(results, saved):
+            if not trigger:
+                continue
+            warnings = [
+                conflict.detail
+                for conflict in self._trigger_trie.check(trigger, ignore=trigger)
+                if conflict.kind != "duplicate" and not conflict.mitigated
+            ]
+            if warnings:
+                result["warnings"] = warnings
 
-            # Save back to file
-            backup_dir = self._editor_backup_dir()
-            backup_file = backup_dir / f"base.yml.{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')}.bak"
-            if base_file.exists():
-                backup_file.write_text(base_file.read_text(encoding="utf-8"), encoding="utf-8")
+        applied = sum(1 for result in results if result["status"] == "success")
+        return {
+            "status": "success",
+            "detail": f"Applied {applied} operation(s) across {len(touched)} file(s)",
+            "applied": applied,
+            "skipped": len(results) - applied,
+            "files": [batch.label(path) for path in touched],
+            "results": results,
+            "restart": restart_state,
+        }
 
-            import yaml
+    def _commit_snippet_batch(self, batch: SnippetBatch) -> None:
+        """Back up the touched files as one snapshot, write them all or none, then reload just those files."""
+        originals: Dict[Path, str] = {}
+        raw: Dict[Path, bytes] = {}
+        for path in batch.touched:
+            if batch.existed(path) and path.exists():
+                raw[path] = path.read_bytes()
+                originals[path] = path.read_text(encoding="utf-8")
+        self._snapshot_match_files(originals, "snippet edit")
+        contents: Dict[Path, str] = {}
+        for path in batch.touched:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            original = originals.get(path)
+            if batch.text(path) is not None:
+                contents[path] = batch.text(path)
+            elif original is None:
+                contents[path] = self.yaml_processor.dumps(batch.document(path))
+            else:
+                # Splice only the changed match items so comments and formatting survive
+                contents[path], _ = self._match_editor.render(original, batch.document(path))
+        # A cross-file move must never land in only one of its files
+        atomic_write_files(contents, raw, fsync_dir=True)
+
+        if not all(batch.existed(path) for path in batch.touched):
+            self._workspace.invalidate()
+        with self._match_lock:
+            for path in batch.touched:
+                self._match_files.invalidate(path)
+            self._reload_match_paths(batch.touched)
 
-            base_file.write_text(
-                yaml.safe_dump(data, sort_keys=False, allow_unicode=True),
-                encoding="utf-8",
+    @staticmethod
+    def _single_batch_response(result: Dict[str, Any]) -> Dict[str, Any]:
+        if result["status"] != "success":
+            return {"status": "error", "detail": result["detail"]}
+        outcome = result["results"][0]
+        response = {"status": "success", "detail": outcome["detail"]}
+        if outcome.get("warnings"):
+            response["warnings"] = outcome["warnings"]
+        return response
+
+    def apply_snippet_batch(self, operations: list, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Apply many create/update/delete/move operations as one transaction.
+
+        Each operation is `{op, trigger?, snippet?, file?, target?}` with `file`/`target`
+        relative to the match directory (default base.yml). Nothing is written if any
+        operation fails, unless `options["onConflict"] == "skip"`; touched files are
+        backed up and written once and a single debounced restart is queued (`options["restart"]`).
+        """
+        try:
+            options = options or {}
+            return self._run_snippet_batch(
+                operations,
+                skip_conflicts=str(options.get("onConflict") or "abort").lower() == "skip",
+                restart=self._interpret_filter_bool(options.get("restart", True)),
             )
+        except Exception as exc:
+            return {"status": "error", "detail": f"Failed to apply snippet batch: {exc}"}
 
-            # Refresh and reload
-            self.refresh_files()
-            self.cli.run(["restart"])
-
-            return {"status": "success", "detail": f"Created snippet '{trigger}'"}
+    def create_snippet(self, snippet_data: Dict[str, Any]) -> Dict[str, str]:
+        """Create a new snippet in base.yml."""
+        try:
+            return self._single_batch_response(self._run_snippet_batch([{"op": "create", "snippet": snippet_data}]))
         except Exception as exc:
             return {"status": "error", "detail": f"Failed to create snippet: {exc}"}
 
-    def update_snippet(self, original_trigger: str, snippet_data: Dict[str, Any]) -> Dict[str, str]:
-        """Update an existing snippet in base.yml."""
+    def update_snippet(
+        self,
+        original_trigger: str,
+        snippet_data: Dict[str, Any],
+        file: Optional[str] = None,
+    ) -> Dict[str, str]:
+        """Update an existing snippet in the match file that defines it (or `file`)."""
         try:
-            base_file = self._paths.match / "base.yml"
-
-            if not base_file.exists():
-                return {"status": "error", "detail": "base.yml not found"}
-
-            data = self.yaml_processor.load(base_file)
-
-            trigger = (snippet_data.get("trigger") or "").strip()
-            replace = self._normalize_replace_text(
-                snippet_data.get("replace", ""),
-                prefer_windows_line_endings=self.platform.is_windows,
-            )
-            if not trigger or not replace.strip():
-                return {"status": "error", "detail": "Trigger and replacement are required"}
-
-            # Find the match to update
-            found = False
-            for match in data.get("matches", []):
-                if match.get("trigger") == original_trigger:
-                    # Update fields
-                    match["trigger"] = trigger
-                    match["replace"] = replace
-
-                    # Update optional properties
-                    self._assign_snippet_optional_fields(match, snippet_data)
-
-                    found = True
-                    break
-
-            if not found:
-                return {"status": "error", "detail": f"Snippet '{original_trigger}' not found"}
-
-            # Save back to file
-            backup_dir = self._editor_backup_dir()
-            backup_file = backup_dir / f"base.yml.{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')}.bak"
-            backup_file.write_text(base_file.read_text(encoding="utf-8"), encoding="utf-8")
-
-            import yaml
-
-            base_file.write_text(
-                yaml.safe_dump(data, sort_keys=False, allow_unicode=True),
-                encoding="utf-8",
-            )
-
-            # Refresh and reload
-            self.refresh_files()
-            self.cli.run(["restart"])
-
-            return {"status": "success", "detail": f"Updated snippet '{trigger}'"}
+            operation = {"op": "update", "trigger": original_trigger, "snippet": snippet_data, "file": file}
+            return self._single_batch_response(self._run_snippet_batch([operation]))
         except Exception as exc:
             return {"status": "error", "detail": f"Failed to update snippet: {exc}"}
 
-    def delete_snippet(self, trigger: str) -> Dict[str, str]:
-        """Delete a snippet from base.yml."""
+    def delete_snippet(self, trigger: str, file: Optional[str] = None) -> Dict[str, str]:
+        """Delete a snippet from the match file that defines it (or `file`)."""
         try:
-            base_file = self._paths.match / "base.yml"
-
-            if not base_file.exists():
-                return {"status": "error", "detail": "base.yml not found"}
-
-            data = self.yaml_processor.load(base_file)
-
-            # Filter out the match
-            original_count = len(data.get("matches", []))
-            data["matches"] = [m for m in data.get("matches", []) if m.get("trigger") != trigger]
-
-            if len(data["matches"]) == original_count:
-                return {"status": "error", "detail": f"Snippet '{trigger}' not found"}
-
-            # Save back to file
-            import yaml
-            backup_dir = self._editor_backup_dir()
-            backup_file = backup_dir / f"base.yml.{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')}.bak"
-            backup_file.write_text(base_file.read_text(encoding="utf-8"), encoding="utf-8")
-
-            base_file.write_text(yaml.dump(data, sort_keys=False, allow_unicode=True), encoding="utf-8")
-
-            # Refresh and reload
-            self.refresh_files()
-            self.cli.run(["restart"])
-
-            return {"status": "success", "detail": f"Deleted snippet '{trigger}'"}
+            operation = {"op": "delete", "trigger": trigger, "file": file}
+            return self._single_batch_response(self._run_snippet_batch([operation]))
         except Exception as exc:
             return {"status": "error", "detail": f"Failed to delete snippet: {exc}"}
 
-    def get_snippet(self, trigger: str) -> Dict[str, Any]:
-        """Get a single snippet by trigger for editing."""
+    def get_snippet(self, trigger: str, file: Optional[str] = None) -> Dict[str, Any]:
+        """Get a single snippet by trigger for editing, from whichever match file defines it."""
         try:
-            base_file = self._paths.match / "base.yml"
-
-            if not base_file.exists():
-                return {"status": "error", "detail": "base.yml not found"}
-
-            data = self.yaml_processor.load(base_file)
-
-            for match in data.get("matches", []):
-                if match.get("trigger") == trigger:
-                    return {
-                        "status": "success",
-                        "snippet": {
-                            "trigger": match.get("trigger", ""),
-                            "replace": match.get("replace", ""),
-                            "word": match.get("word", False),
-                            "propagate_case": match.get("propagate_case", False),
-                            "vars": match.get("vars", []),
-                            "form": match.get("form", ""),
-                            "label": match.get("label", ""),
-                            "enabled": match.get("enabled", True),
-                            "backend": match.get("backend", ""),
-                            "delay": self._sanitize_delay_value(match.get("delay")),
-                            "left_word": match.get("left_word", False),
-                            "right_word": match.get("right_word", False),
-                            "uppercase_style": match.get("uppercase_style", ""),
-                            "image_path": match.get("image_path", ""),
-                        }
-                    }
-
-            return {"status": "error", "detail": f"Snippet '{trigger}' not found"}
+            locations = self._snippet_locator.locate(trigger, file)
+            if not locations:
+                return {"status": "error", "detail": f"Snippet '{trigger}' not found"}
+            location = locations[0]
+            record = location.record
+            return {
+                "status": "success",
+                "snippet": {
+                    "trigger": record.get("trigger") or trigger,
+                    "triggers": list(record.get("triggers") or []),
+                    "replace": self._bodies.text(getattr(record, "replace", None) or record.get("replace", "")),
+                    "word": record.get("word", False),
+                    "propagate_case": record.get("propagate_case", False),
+                    "vars": record.get("variables") or [],
+                    "form": record.get("form") or "",
+                    "label": record.get("label", ""),
+                    "enabled": record.get("enabled", True),
+                    "backend": record.get("backend", ""),
+                    "delay": record.get("delay"),
+                    "left_word": record.get("left_word", False),
+                    "right_word": record.get("right_word", False),
+                    "uppercase_style": record.get("uppercase_style", ""),
+                    "image_path": record.get("image_path", ""),
+                    "file": location.file,
+                },
+                "location": location.to_dict(),
+                "locations": [item.to_dict() for item in locations],
+            }
         except Exception as exc:
             return {"status": "error", "detail": f"Failed to get snippet: {exc}"}
 
@@ -1821,25 +2408,50 @@ matches:
         return global_vars
 
     def create_backup(self) -> Dict[str, Any]:
-        backup_dir = self._archive_backup_dir()
-        payload = {
-            "version": "1.0",
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "matchFiles": [],
-            "configFiles": [],
+        """Archive snapshot of every match and config YAML file (deduplicated in the backup store)."""
+        sources = [
+            SnapshotSource(name=self._workspace.relative_label(path, self._paths.config), path=path)
+            for path in self._workspace.files(self._paths.config)
+        ]
+        known = {source.path for source in sources}
+        for path in self._workspace.files(self._paths.match):
+            if path not in known:
+                sources.append(SnapshotSource(name=f"match/{self._workspace.relative_label(path, self._paths.match)}", path=path))
+        manifest = self._backup_store().snapshot("archive", sources, note="archive")
+        self._backup_janitor.request()
+        return {
+            "path": str(self._backup_store().root / "snapshots" / f"{manifest['id']}.json"),
+            "id": manifest["id"],
+            "count": len(manifest["files"]),
+            "storedBytes": manifest["storedBytes"],
         }
-        for file in self._paths.match.glob("*.yml"):
-            payload["matchFiles"].append({"name": file.name, "content": file.read_text(encoding="utf-8")})
-        if self._paths.config.exists():
-            for child in self._paths.config.rglob("*.yml"):
-                payload["configFiles"].append({"name": str(child.relative_to(self._paths.config)), "content": child.read_text(encoding="utf-8")})
-        backup_file = backup_dir / f"espanso-backup-{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')}.json"
-        backup_file.write_text(json.dumps(payload, indent=2), encoding="utf-8")
-        return {"path": str(backup_file), "count": len(payload["matchFiles"]) + len(payload["configFiles"])}
 
     def restart_espanso(self) -> Dict[str, Any]:
-        result = self.cli.reload()
-        return {"message": result.stdout.strip() or result.stderr.strip() or "Restart issued"}
+        state = self._restart_scheduler.request("requested", force=True)
+        return {"message": "Restart scheduled", "restart": state}
+
+    def get_restart_state(self) -> Dict[str, Any]:
+        """Pending/in-flight/last restart info for the status bar."""
+        return {"status": "success", "restart": self._restart_scheduler.state()}
+
+    def save_restart_settings(self, settings: Dict[str, Any]) -> Dict[str, Any]:
+        """Persist `quietMs` (restart debounce window) and `skipWhenAutoReload`."""
+        try:
+            settings = settings or {}
+            if "quietMs" in settings:
+                quiet_ms = self._coerce_int(settings.get("quietMs"))
+                if quiet_ms is None or quiet_ms < 0:
+                    return {"status": "error", "detail": "quietMs must be a non-negative integer"}
+                self._preferences["restartQuietMs"] = quiet_ms
+            if "skipWhenAutoReload" in settings:
+                self._preferences["skipRestartWhenAutoReload"] = self._interpret_filter_bool(
+                    settings.get("skipWhenAutoReload")
+                )
+            self._save_preferences(durable=True)
+            self._restart_scheduler.configure(quiet_seconds=self._restart_quiet_seconds())
+            return {"status": "success", "restart": self._restart_scheduler.state()}
+        except Exception as exc:
+            return {"status": "error", "detail": f"Failed to save restart settings: {exc}"}
 
     def get_feature_catalog(self) -> Dict[str, Any]:
         architecture = FeatureCatalog.describe_architecture()
@@ -1956,10 +2568,13 @@ def main() -> None:
         height=900,
         min_size=(1000, 700),
     )
+    api._attach_window(window)
     _start_webview(window, api.platform, script_path)
 
 
 if __name__ == "__main__":
+    # Must run first: in a frozen build each match-parsing pool worker re-executes this entry point
+    multiprocessing.freeze_support()
     main()
 
 """
@@ -1990,4 +2605,70 @@ CHANGELOG
 - Preserved Windows CRLF replacements when saving snippets to prevent truncated multi-line output.
 2025-11-17 Codex
 - Changed service health check to inspect `espanso status` before issuing redundant `start` commands so the daemon logs remain quiet while connected.
+2026-10-18 Codex
+- Routed match loading through MatchFileCache so refreshes only re-parse files whose fingerprint changed.
+2026-10-18 Codex
+- Fed watcher events through a debounced ReloadPipeline that re-parses only the touched match files and swaps the cache in place.
+2026-10-18 Codex
+- Routed every YAML read/write through YamlProcessor (libyaml when available) and surfaced the active backend in dashboard/ping payloads.
+2026-10-18 Codex
+- Enabled process-pool match parsing for cold loads (tunable via the `matchLoaderWorkers` preference).
+2026-10-18 Codex
+- Switched match loading, YAML validation, dashboard counts, backups and the config tree to a shared WorkspaceIndex so nested folders and .yaml files are honored; watcher events invalidate it.
+2026-10-18 Codex
+- Backed search_snippets with an incrementally maintained SnippetSearchIndex (trigram postings plus filter sets) instead of a per-call linear scan.
+2026-10-18 Codex
+- Added offset/limit, server-side sort and field projection options to list_snippets and search_snippets so the UI only fetches the visible page.
+2026-10-18 Codex
+- Added prefix and ranked fuzzy search modes to search_snippets for mistyped triggers.
+2026-10-18 Codex
+- Added a trigger trie (kept in step with per-file reloads) behind get_trigger_conflicts/check_trigger; create_snippet now rejects duplicates from any match file and warns about shadowing.
+2026-10-18 Codex
+- Added apply_snippet_batch: create/update/delete/move operations applied in memory, one backup stamp, one write per touched file, per-file reload and a single restart. The single-snippet APIs and import_snippet_pack now go through it.
+2026-10-18 Codex
+- Routed every restart through RestartScheduler (debounced, never concurrent, skipped when Espanso's auto_restart reloads on its own) and exposed its state via get_restart_state/get_dashboard.
+2026-10-18 Codex
+- get_dashboard now serves connection probes from HealthMonitor's cache (adaptive background refresh, staleness info in `health`); refresh_health forces a cycle.
+2026-10-18 Codex
+- Added start_cli_job/get_cli_job/cancel_cli_job/list_cli_jobs so doctor, log and package commands run as cancellable background jobs with streamed output.
+2026-10-18 Codex
+- Snippet batches now write existing match files through MatchFileEditor, rewriting only changed items (full dump as fallback).
+2026-10-18 Codex
+- All match, config, backup and export writes go through atomic_write_text; preferences and SnippetSense pending state are coalesced by a CoalescingWriter flushed on shutdown; temp-file rename events no longer force workspace rescans.
+2026-10-18 Codex
+- get_snippet/update_snippet/delete_snippet resolve the owning match file through SnippetLocator (cache lookup, no base.yml re-parse) and accept an optional `file` to disambiguate.
+2026-10-18 Codex
+- Config, editor and archive backups go to the content-addressed BackupStore (chunk blobs + manifests) instead of copytree/.bak/JSON copies; list_backups reads manifests and restore_config swaps in a staged tree (legacy folders still restore).
+2026-10-18 Codex
+- Backups are pruned by a background BackupJanitor using the `backupRetention` preference (legacy .bak/JSON copies included); added get_backup_settings, save_backup_retention, prune_backups and export_backup (streamed .tar.zst/.tar.gz).
+2026-10-18 Codex
+- restore_config diffs the backup against the live config and rewrites/deletes only differing files (after a safety snapshot), reloading just those match files; added preview_restore and `dryRun` for a per-file diff preview.
+2026-10-18 Codex
+- Added a push event channel (EventChannel over window.evaluate_js): match reloads publish per-file snippet deltas, file status and counts, health changes and SnippetSense suggestions, batched with sequence numbers; added subscribe_events and get_events_since for gap recovery.
+2026-10-18 Codex
+- Added SnippetRevisions alongside the other per-file indexes and get_snippet_changes(since_revision) for delta sync with tombstones; pushed `snippets` events now carry the same revision-based change sets.
+2026-10-18 Codex
+- The match cache holds slotted SnippetRecords; list_snippets/search_snippets materialize dicts only at the bridge.
+2026-10-18 Codex
+- Replace bodies over `lazyReplaceChars` (default 2048, 0 disables) are spilled to a BodyStore: lists carry a preview plus replaceLazy/replaceLength, get_snippet loads the full text, and updates from a preview keep the body on disk.
+2026-10-18 Codex
+- Startup seeds the match cache from a pickled snapshot in the data root (`matchSnapshot`, default on) and validates fingerprints on the reload thread, re-parsing only stale files; the snapshot is rewritten in the background after changes.
+2026-10-18 Codex
+- Health probes are read-only (CLI present, `espanso status` with fresh=True); installing/starting Espanso happens once in the monitor's bootstrap and is skipped after the user stops the service. "not running" no longer counts as running.
+2026-10-18 Codex
+- A snapshot restore builds the search index, trie, locator and revisions synchronously, so search and CRUD are correct before background validation finishes; the first-load push only announces the revision.
+2026-10-18 Codex
+- Retention now applies to exported tar archives (removedExports) and no longer deletes legacy `.bak`/JSON backups made before the store.
+2026-10-18 Codex
+- Path, backup, restart and SnippetSense settings are written before the call returns; other coalesced state writes also flush when the window closes.
+2026-10-18 Codex
+- Snippet batches commit their files together (atomic_write_files): a failed write restores the files already replaced, so a cross-file move cannot lose the snippet.
+2026-10-18 Codex
+- Single snippet updates/deletes splice the item at the locator's recorded lines (checked against the cached fingerprint) instead of parsing and scanning the owning file.
+2026-10-18 Codex
+- check_trigger accepts `left_word`; infix trigger conflicts count as shadowed and produce save warnings like prefix ones.
+2026-10-18 Codex
+- `skipRestartWhenAutoReload` defaults to off and only skips when default.yml parses with `auto_restart: true`; a missing or unreadable config always restarts.
+2026-10-18 Codex
+- The main guard calls multiprocessing.freeze_support() so process-pool match parsing works in frozen (PyInstaller) builds.
 """
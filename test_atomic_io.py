@@ -0,0 +1,78 @@
+"""Tests for atomic writes and the coalescing state writer."""
+
+import json
+import os
+import time
+
+import pytest
+
+import espanso_companion.atomic_io as atomic_io
+from espanso_companion.atomic_io import CoalescingWriter, atomic_write_bytes, atomic_write_text
+
+
+def test_atomic_write_replaces_content_and_keeps_permissions(tmp_path):
+    target = tmp_path / "base.yml"
+    target.write_text("old", encoding="utf-8")
+    os.chmod(target, 0o600)
+
+    atomic_write_text(target, "new ✓", fsync_dir=True)
+    atomic_write_bytes(tmp_path / "blob.bin", b"\x00\x01")
+
+    assert target.read_text(encoding="utf-8") == "new ✓"
+    if os.name != "nt":
+        assert target.stat().st_mode & 0o777 == 0o600
+    assert (tmp_path / "blob.bin").read_bytes() == b"\x00\x01"
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["base.yml", "blob.bin"]
+
+
+def test_new_files_get_the_same_mode_as_open(tmp_path):
+    plain = tmp_path / "plain.txt"
+    plain.write_text("x", encoding="utf-8")
+
+    atomic_write_text(tmp_path / "new.txt", "x")
+
+    assert (tmp_path / "new.txt").stat().st_mode == plain.stat().st_mode
+
+
+def test_failed_write_leaves_the_original_and_no_temp_file(tmp_path, monkeypatch):
+    target = tmp_path / "prefs.json"
+    target.write_text("original", encoding="utf-8")
+
+    def broken_replace(source, destination):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(atomic_io.os, "replace", broken_replace)
+    with pytest.raises(OSError):
+        atomic_write_text(target, "replacement")
+
+    assert target.read_text(encoding="utf-8") == "original"
+    assert [path.name for path in tmp_path.iterdir()] == ["prefs.json"]
+
+
+def test_writer_coalesces_bursts_and_flushes_on_close(tmp_path):
+    target = tmp_path / "state.json"
+    writer = CoalescingWriter(delay=0.05, max_delay=1.0)
+    for index in range(20):
+        writer.schedule(target, json.dumps({"n": index}))
+    deadline = time.monotonic() + 2
+    while not target.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert json.loads(target.read_text()) == {"n": 19}
+    assert writer.stats()["writes"] == 1
+    assert writer.stats()["coalesced"] == 19
+
+    slow = CoalescingWriter(delay=60, max_delay=60)
+    slow.schedule(target, json.dumps({"n": "final"}))
+    slow.close()
+    assert json.loads(target.read_text()) == {"n": "final"}
+
+
+def test_durable_preferences_are_on_disk_before_the_call_returns(espanso_home, make_api):
+    api = make_api()
+    api._state_writer._delay = api._state_writer._max_delay = 60
+
+    api.save_backup_retention({"keepRecent": 3})
+
+    saved = json.loads(api._preferences_path().read_text(encoding="utf-8"))
+    assert saved["backupRetention"]["keepRecent"] == 3
@@ -0,0 +1,83 @@
+"""Tests for backup retention: snapshot selection, store pruning and exported archives."""
+
+import os
+from datetime import datetime, timedelta, timezone
+
+from espanso_companion.backup_retention import RetentionPolicy, prune_archives, select_kept
+from espanso_companion.backup_store import BackupStore, SnapshotSource
+
+NOW = datetime(2026, 10, 18, 12, tzinfo=timezone.utc)
+
+
+def _summary(snapshot_id, hours_ago, kind="config"):
+    return {"id": snapshot_id, "kind": kind, "created": (NOW - timedelta(hours=hours_ago)).isoformat()}
+
+
+def test_select_kept_applies_recent_daily_and_weekly_rules_per_kind():
+    summaries = [
+        _summary("c0", 1),
+        _summary("c1", 2),
+        _summary("c2", 30),
+        _summary("c3", 31),
+        _summary("c4", 24 * 20),
+        _summary("e0", 24 * 40, kind="editor"),
+    ]
+    policy = RetentionPolicy(keep_recent=1, keep_daily=3, keep_weekly=0)
+
+    assert select_kept(summaries, policy, NOW) == {"c0", "c2", "e0"}
+    assert select_kept(summaries, RetentionPolicy(keep_recent=1, keep_daily=0, keep_weekly=4), NOW) == {"c0", "c4", "e0"}
+
+
+def test_store_prune_drops_old_snapshots_and_unreferenced_blobs(tmp_path):
+    store = BackupStore(tmp_path / "store")
+    for version in range(3):
+        data = "".join(f"line {index} of version {version}\n" for index in range(200)).encode("utf-8")
+        newest = store.snapshot("editor", [SnapshotSource("base.yml", data=data)])
+
+    result = store.prune(RetentionPolicy(keep_recent=1, keep_daily=0, keep_weekly=0, max_bytes=None))
+
+    assert result["removedSnapshots"] == 2
+    assert result["removedBlobs"] > 0
+    assert [summary["id"] for summary in store.snapshots()] == [newest["id"]]
+    restored = store.restore(newest["id"], tmp_path / "out")
+    assert restored == 1
+    assert (tmp_path / "out" / "base.yml").read_text(encoding="utf-8").startswith("line 0 of version 2\n")
+
+
+def _archive(directory, name, days_ago, size=100):
+    path = directory / name
+    path.write_bytes(b"x" * size)
+    stamp = (NOW - timedelta(days=days_ago)).timestamp()
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+def test_prune_archives_keeps_recent_and_caps_size(tmp_path):
+    paths = [_archive(tmp_path, f"a{index}.tar.gz", days_ago=index * 10) for index in range(4)]
+    policy = RetentionPolicy(keep_recent=2, keep_daily=0, keep_weekly=0, max_bytes=None)
+
+    removed = prune_archives(paths, policy, NOW)
+
+    assert sorted(path.name for path in removed) == ["a2.tar.gz", "a3.tar.gz"]
+    assert [path.exists() for path in paths] == [True, True, False, False]
+
+    capped = RetentionPolicy(keep_recent=5, keep_daily=0, keep_weekly=0, max_bytes=50)
+    assert [path.name for path in prune_archives(paths[:2], capped, NOW)] == ["a1.tar.gz"]
+    assert paths[0].exists()
+
+
+def test_api_prune_removes_old_exports_but_not_legacy_backups(espanso_home, make_api):
+    api = make_api()
+    archive_dir = api._archive_backup_dir()
+    legacy = archive_dir / "base.yml.20240101.bak"
+    legacy.write_text("old", encoding="utf-8")
+    for index in range(3):
+        _archive(archive_dir, f"config-{index}.tar.gz", days_ago=index * 30)
+    api.save_backup_retention({"keepRecent": 1, "keepDaily": 0, "keepWeekly": 0, "maxBytes": 0})
+
+    result = api.prune_backups()
+
+    assert result["status"] == "success"
+    assert result["removedExports"] == 2
+    assert legacy.exists()
+    assert sorted(path.name for path in archive_dir.iterdir()) == ["base.yml.20240101.bak", "config-0.tar.gz"]
@@ -0,0 +1,64 @@
+"""Tests for the chunked, deduplicating backup store."""
+
+import tarfile
+
+from espanso_companion.backup_store import CHUNK_MAX_BYTES, BackupStore, SnapshotSource, split_chunks
+
+
+def _text(lines=4000, changed=None):
+    rows = [f"  - trigger: ':s{index}'\n    replace: 'snippet number {index * 7919 % 10007}'\n" for index in range(lines)]
+    if changed is not None:
+        rows[changed] = "  - trigger: ':edited'\n    replace: 'something else entirely'\n"
+    return ("matches:\n" + "".join(rows)).encode("utf-8")
+
+
+def test_chunks_rejoin_and_an_edit_only_moves_nearby_boundaries():
+    original = _text()
+    edited = _text(changed=2000)
+    before, after = split_chunks(original), split_chunks(edited)
+
+    assert b"".join(before) == original
+    assert b"".join(after) == edited
+    assert len(before) > 10
+    assert max(len(chunk) for chunk in before) <= CHUNK_MAX_BYTES
+    assert len(set(before) - set(after)) <= 2
+    assert split_chunks(b"short") == [b"short"]
+
+
+def test_repeated_snapshots_store_only_changed_chunks(tmp_path):
+    store = BackupStore(tmp_path / "store")
+    original = _text()
+
+    first = store.snapshot("config", [SnapshotSource("match/base.yml", data=original)])
+    same = store.snapshot("config", [SnapshotSource("match/base.yml", data=original)])
+    edited = store.snapshot("config", [SnapshotSource("match/base.yml", data=_text(changed=2000))])
+
+    assert first["storedBytes"] > 0
+    assert same["storedBytes"] == 0
+    assert 0 < edited["storedBytes"] < first["storedBytes"] / 5
+    assert [summary["id"] for summary in store.snapshots("config")][0] == edited["id"]
+    assert store.usage()["snapshots"] == 3
+
+
+def test_snapshot_tree_restores_and_exports_byte_identical(tmp_path):
+    source = tmp_path / "config"
+    (source / "match").mkdir(parents=True)
+    (source / "match" / "base.yml").write_bytes(_text())
+    (source / "config" / "default.yml").parent.mkdir()
+    (source / "config" / "default.yml").write_bytes(b"toggle_key: ALT\n")
+    store = BackupStore(tmp_path / "store")
+
+    manifest = store.snapshot_tree("config", source)
+    unchanged = store.snapshot_tree("config", source)
+    assert unchanged["storedBytes"] == 0
+
+    target = tmp_path / "restored"
+    assert store.restore(manifest["id"], target) == 2
+    assert (target / "match" / "base.yml").read_bytes() == _text()
+    assert (target / "config" / "default.yml").read_bytes() == b"toggle_key: ALT\n"
+
+    archive = store.export_archive(manifest["id"], tmp_path / "exports")
+    mode = "r:gz" if archive.name.endswith(".tar.gz") else None
+    if mode:
+        with tarfile.open(archive, mode) as handle:
+            assert handle.extractfile("match/base.yml").read() == _text()
@@ -0,0 +1,79 @@
+"""Tests for spilling long replace bodies out of the snippet cache."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from espanso_companion.body_store import BodyStore, LazyBody
+
+
+def test_put_deduplicates_and_reads_back_through_the_lru(tmp_path):
+    store = BodyStore(threshold=10, directory=tmp_path, cache_bytes=12)
+    first = store.put("a" * 8)
+    again = store.put("a" * 8)
+    other = store.put("b" * 8)
+
+    assert first == again and first != other
+    assert store.stats()["bodies"] == 2
+    assert store.stats()["fileBytes"] == 16
+    assert store.text(first) == "a" * 8
+    assert store.text(first) == "a" * 8
+    assert store.text(other) == "b" * 8  # evicts the first body (cache holds 12 bytes)
+    assert store.text(first) == "a" * 8
+    assert store.stats()["reads"] == 4
+    assert store.stats()["cacheHits"] == 1
+    assert store.text("plain") == "plain"
+    store.close()
+
+
+def test_spill_moves_only_long_bodies_and_keeps_a_preview():
+    store = BodyStore(threshold=20, preview_chars=5)
+    records = [SimpleNamespace(replace="short"), SimpleNamespace(replace="x" * 21 + "tail")]
+
+    assert store.spill(records) == 1
+    assert records[0].replace == "short"
+    body = records[1].replace
+    assert isinstance(body, LazyBody)
+    assert (body.length, body.preview) == (25, "xxxxx")
+    assert store.text(body).endswith("tail")
+    assert BodyStore(threshold=0).spill([SimpleNamespace(replace="y" * 5000)]) == 0
+    store.close()
+
+
+def test_compact_keeps_only_live_bodies():
+    store = BodyStore(threshold=1, min_compact_bytes=0)
+    keep = store.put("keep me")
+    drop = store.put("drop me, I am longer")
+    assert store.needs_compaction()
+
+    store.compact([keep])
+
+    assert store.stats()["bodies"] == 1
+    assert store.stats()["fileBytes"] == len("keep me")
+    assert store.text(keep) == "keep me"
+    assert not store.needs_compaction()
+    with pytest.raises(KeyError):
+        store.text(drop)
+    store.close()
+
+
+def test_api_searches_and_opens_the_full_spilled_body(espanso_home, make_api):
+    body = "Dear team,\n" + "filler text. " * 400 + "zebracorn at the very end"
+    (espanso_home / "base.yml").write_text(
+        "matches:\n  - trigger: ':long'\n    replace: |\n"
+        + "".join(f"      {line}\n" for line in body.splitlines())
+        + "  - trigger: ':short'\n    replace: 'Hi'\n",
+        encoding="utf-8",
+    )
+    api = make_api()
+
+    listed = {snippet["trigger"]: snippet for snippet in api.list_snippets()}
+    assert listed[":long"]["replaceLazy"] is True
+    assert len(listed[":long"]["replace"]) < len(body)
+    assert api._bodies.stats()["bodies"] == 1
+
+    found = api.search_snippets("zebracorn")
+    assert [snippet["trigger"] for snippet in found["results"]] == [":long"]
+
+    opened = api.get_snippet(":long")
+    assert opened["snippet"]["replace"].rstrip("\n") == body
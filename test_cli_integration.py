@@ -0,0 +1,104 @@
+"""Tests for the EspansoCLI read cache, single-flight and invalidation."""
+
+import subprocess
+import threading
+import time
+
+import pytest
+
+import espanso_companion.cli_integration as cli_integration
+from espanso_companion.cli_integration import EspansoCLI
+
+
+class _Runner:
+    """Fake subprocess.run that counts calls and can block until released."""
+
+    def __init__(self):
+        self.calls = []
+        self.gate = None
+        self.entered = threading.Event()
+        self.status = "running"
+
+    def __call__(self, cmd, **kwargs):
+        args = cmd[1:]
+        self.calls.append(tuple(args))
+        output = f"espanso is {self.status}"  # the state when the command started
+        self.entered.set()
+        if self.gate is not None and args == ["status"]:
+            self.gate.wait(2)
+        return subprocess.CompletedProcess(cmd, 0, output, "")
+
+    def count(self, *args):
+        return self.calls.count(tuple(args))
+
+
+@pytest.fixture
+def cli(monkeypatch):
+    monkeypatch.setattr(cli_integration.shutil, "which", lambda name: "/usr/bin/espanso")
+    runner = _Runner()
+    return EspansoCLI(runner=runner), runner
+
+
+def test_read_only_results_are_reused_within_their_ttl(cli, monkeypatch):
+    espanso, runner = cli
+    clock = {"now": 100.0}
+    monkeypatch.setattr(cli_integration.time, "monotonic", lambda: clock["now"])
+
+    espanso.status()
+    espanso.status()
+    assert runner.count("status") == 1
+
+    clock["now"] += cli_integration.READ_ONLY_TTLS[("status",)] + 0.1
+    espanso.status()
+    assert runner.count("status") == 2
+
+    espanso.status(fresh=True)
+    assert runner.count("status") == 3
+
+
+def test_concurrent_identical_reads_share_one_subprocess(cli):
+    espanso, runner = cli
+    runner.gate = threading.Event()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(espanso.run(["status"]))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    assert runner.entered.wait(2)
+    time.sleep(0.1)
+    runner.gate.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert runner.count("status") == 1
+    assert len(results) == 5 and len({id(result) for result in results}) == 1
+
+
+def test_mutating_commands_invalidate_the_cache(cli):
+    espanso, runner = cli
+    espanso.status()
+    runner.status = "not running"
+
+    espanso.run(["stop"])
+
+    assert espanso.status()["stdout"] == "espanso is not running"
+    assert runner.count("status") == 2
+    assert EspansoCLI.is_mutating(["package", "install", "x"])
+    assert not EspansoCLI.is_mutating(["package", "list"])
+
+
+def test_read_overlapping_a_mutation_is_not_cached(cli):
+    espanso, runner = cli
+    runner.gate = threading.Event()
+    stale = []
+    reader = threading.Thread(target=lambda: stale.append(espanso.run(["status"])))
+    reader.start()
+    assert runner.entered.wait(2)
+
+    runner.status = "not running"
+    espanso.invalidate_cache()  # what a concurrent `stop` does
+    runner.gate.set()
+    reader.join(2)
+    runner.gate = None
+
+    assert stale[0].stdout == "espanso is running"
+    assert espanso.status()["stdout"] == "espanso is not running"
@@ -0,0 +1,92 @@
+"""Tests for background CLI jobs: streaming, limits, cancellation and timeouts."""
+
+import os
+import sys
+import time
+
+import pytest
+
+from espanso_companion.cli_jobs import CliJobRunner, command_class
+
+SCRIPTS = {
+    "echo": "import sys; print('one'); print('two'); sys.stderr.write('warn\\n')",
+    "fail": "import sys; sys.exit(3)",
+    "sleep": "import time; print('started', flush=True); time.sleep(30)",
+    # Parent and a child that would outlive it unless the whole group is killed
+    "spawn": (
+        "import subprocess, sys, time; "
+        "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)']); "
+        "print(child.pid, flush=True); time.sleep(30)"
+    ),
+}
+
+
+def _build(args):
+    return [sys.executable, "-c", SCRIPTS[args[-1]]], None
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    try:
+        with open(f"/proc/{pid}/stat") as handle:
+            return handle.read().split()[2] != "Z"
+    except OSError:
+        return True
+
+
+def test_output_is_streamed_and_state_reported():
+    runner = CliJobRunner(_build)
+    ok = runner.wait(runner.submit(["log", "echo"]).id, timeout=10)
+    failed = runner.wait(runner.submit(["log", "fail"]).id, timeout=10)
+
+    assert (ok.state, ok.returncode) == ("succeeded", 0)
+    assert ok.output("stdout") == "one\ntwo\n"
+    assert ok.output("stderr") == "warn\n"
+    assert (failed.state, failed.returncode) == ("failed", 3)
+    assert len(runner.snapshot(ok.id)["chunks"]) == 3
+    assert runner.snapshot(ok.id, cursor=3) == dict(runner.snapshot(ok.id), chunks=[])
+
+
+def test_class_limit_queues_the_second_package_job():
+    runner = CliJobRunner(_build)
+    first = runner.submit(["package", "sleep"])
+    second = runner.submit(["package", "echo"])
+    time.sleep(0.5)
+
+    assert command_class(["package", "install"]) == "package"
+    assert runner.get(first.id).state == "running"
+    assert runner.get(second.id).state == "queued"
+
+    runner.cancel(first.id)
+    assert runner.wait(second.id, timeout=10).state == "succeeded"
+    assert runner.get(first.id).state == "cancelled"
+
+
+@pytest.mark.skipif(os.name == "nt", reason="process groups are POSIX-only")
+def test_cancel_kills_the_whole_process_group():
+    runner = CliJobRunner(_build)
+    job = runner.submit(["doctor", "spawn"])
+    deadline = time.monotonic() + 10
+    while not job.output("stdout") and time.monotonic() < deadline:
+        time.sleep(0.05)
+    child_pid = int(job.output("stdout").split()[0])
+    assert _alive(child_pid)
+
+    assert runner.cancel(job.id)
+    assert runner.wait(job.id, timeout=10).state == "cancelled"
+    deadline = time.monotonic() + 5
+    while _alive(child_pid) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not _alive(child_pid)
+    assert runner.cancel(job.id) is False
+
+
+def test_timeout_kills_and_reports():
+    runner = CliJobRunner(_build, timeout=0.5)
+    job = runner.wait(runner.submit(["log", "sleep"]).id, timeout=10)
+
+    assert job.state == "timeout"
+    assert "timed out" in job.output("stderr")
@@ -0,0 +1,81 @@
+"""Tests for the coalescing backend → webview event channel."""
+
+import json
+import time
+
+from espanso_companion.event_channel import RECEIVER, EventChannel
+
+
+def _batches(sent):
+    prefix = f"{RECEIVER} && {RECEIVER}.receive("
+    return [json.loads(script[len(prefix):-1]) for script in sent]
+
+
+def test_same_kind_and_key_coalesce_into_one_event():
+    sent = []
+    channel = EventChannel()
+    channel.attach(sent.append)
+    channel.subscribe()
+
+    for index in range(20):
+        channel.publish("status", {"n": index}, key="service")
+    channel.publish("status", {"n": "other"}, key="health")
+    channel.publish("log", ["a"], merge=lambda old, new: old + new)
+    channel.publish("log", ["b"], merge=lambda old, new: old + new)
+
+    assert channel.flush() == 3
+    [batch] = _batches(sent)
+    assert (batch["first"], batch["last"]) == (1, 3)
+    assert [(event["key"], event["data"]) for event in batch["events"]] == [
+        ("service", {"n": 19}),
+        ("health", {"n": "other"}),
+        (None, ["a", "b"]),
+    ]
+    assert channel.flush() == 0
+
+
+def test_nothing_is_pushed_before_subscribe_but_since_replays_it():
+    sent = []
+    channel = EventChannel()
+    channel.attach(sent.append)
+    channel.publish("snippets", {"revision": 1})
+    channel.flush()
+    assert sent == []
+
+    seq = channel.subscribe()
+    assert seq == 1
+    replay = channel.since(0)
+    assert [event["data"] for event in replay["events"]] == [{"revision": 1}]
+    assert replay["resync"] is False
+
+
+def test_since_asks_for_resync_once_the_backlog_no_longer_reaches_back():
+    channel = EventChannel(backlog=3)
+    for index in range(5):
+        channel.publish("tick", index, key=str(index))
+        channel.flush()
+
+    assert [event["seq"] for event in channel.since(2)["events"]] == [3, 4, 5]
+    assert channel.since(2)["resync"] is False
+    assert channel.since(1)["resync"] is True
+    assert channel.since(5) == {"events": [], "seq": 5, "resync": False}
+    assert channel.since(9)["resync"] is True
+
+
+def test_worker_delivers_a_burst_as_one_batch():
+    sent = []
+    channel = EventChannel(interval=0.05)
+    channel.attach(sent.append)
+    channel.subscribe()
+    channel.start()
+    try:
+        for index in range(50):
+            channel.publish("progress", index, key="job")
+        deadline = time.monotonic() + 2
+        while not sent and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        channel.stop()
+
+    assert [[event["data"] for event in batch["events"]] for batch in _batches(sent)] == [[49]]
+    assert channel.stats()["delivered"] == 1
@@ -0,0 +1,104 @@
+"""Tests for the background health monitor and its read-only probes."""
+
+import subprocess
+import threading
+import time
+
+from espanso_companion.health_monitor import HealthMonitor
+
+
+def test_cycle_records_results_and_probe_errors():
+    monitor = HealthMonitor([("ok", lambda: ("success", "fine")), ("boom", lambda: 1 / 0)])
+
+    steps = monitor.run_cycle()
+
+    assert [(step["label"], step["status"]) for step in steps] == [("ok", "success"), ("boom", "error")]
+    assert "division" in monitor.step("boom")["detail"]
+    assert monitor.snapshot()["stale"] is False
+
+
+def test_interval_backs_off_while_stable_and_resets_on_change():
+    status = {"value": "success"}
+    changes = []
+    monitor = HealthMonitor(
+        [("daemon", lambda: (status["value"], ""))],
+        min_interval=1.0,
+        max_interval=4.0,
+        on_change=changes.append,
+    )
+
+    monitor.run_cycle()
+    intervals = []
+    for _ in range(3):
+        monitor.run_cycle()
+        intervals.append(monitor.snapshot()["intervalSeconds"])
+    status["value"] = "error"
+    monitor.run_cycle()
+
+    assert intervals == [2.0, 4.0, 4.0]
+    assert monitor.snapshot()["intervalSeconds"] == 1.0
+    assert [[step["status"] for step in steps] for steps in changes] == [["success"], ["error"]]
+
+
+def test_bootstrap_runs_once_before_the_first_cycle():
+    order = []
+    probed = threading.Event()
+
+    def probe():
+        order.append("probe")
+        probed.set()
+        return "success", ""
+
+    monitor = HealthMonitor([("p", probe)], min_interval=0.05, bootstrap=lambda: order.append("bootstrap"))
+    monitor.start()
+    try:
+        assert probed.wait(2)
+        time.sleep(0.2)
+    finally:
+        monitor.stop()
+
+    assert order[0] == "bootstrap"
+    assert order.count("bootstrap") == 1
+    assert order.count("probe") >= 2
+
+
+def test_stopped_service_stays_stopped(espanso_home, make_api, monkeypatch):
+    import espanso_companion.cli_integration as cli_integration
+
+    state = {"running": False, "starts": 0}
+
+    def runner(cmd, **kwargs):
+        args = cmd[1:]
+        if args == ["start"]:
+            state["running"] = True
+            state["starts"] += 1
+        elif args == ["stop"]:
+            state["running"] = False
+        output = "espanso is running" if state["running"] else "espanso is not running"
+        return subprocess.CompletedProcess(cmd, 0, output if args == ["status"] else "ok", "")
+
+    original_init = cli_integration.EspansoCLI.__init__
+    monkeypatch.setattr(
+        cli_integration.EspansoCLI, "__init__", lambda self, runner_=None, timeout=60: original_init(self, runner, timeout)
+    )
+    monkeypatch.setattr(cli_integration.shutil, "which", lambda name: "/usr/bin/espanso")
+    monkeypatch.setenv("ESPANSO_CONFIG_DIR", str(espanso_home.parent))
+    api = make_api()
+    api._health._min_interval = 0.05
+    assert _wait_for(lambda: state["running"])
+
+    api.stop_service()
+    api._health.refresh(wait=2)
+    time.sleep(0.3)
+
+    assert state == {"running": False, "starts": 1}
+    assert api._health.step(api._SERVICE_PROBE)["status"] == "error"
+
+
+def _wait_for(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
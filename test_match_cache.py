@@ -0,0 +1,95 @@
+"""Tests for the incremental match file cache."""
+
+import os
+from pathlib import Path
+
+from espanso_companion.match_cache import MatchFileCache, parse_match_file
+
+
+def _write(path: Path, triggers, mtime_ns=None) -> Path:
+    body = "matches:\n" + "".join(f"  - trigger: '{trigger}'\n    replace: 'out {trigger}'\n" for trigger in triggers)
+    path.write_text(body, encoding="utf-8")
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    return path
+
+
+def test_sync_reuses_unchanged_files_and_reparses_changed_ones(tmp_path):
+    base = _write(tmp_path / "base.yml", [":a", ":b"])
+    extra = _write(tmp_path / "extra.yml", [":c"])
+    calls = []
+
+    def parser(path, label):
+        calls.append(label)
+        return parse_match_file(path, label)
+
+    cache = MatchFileCache(parser)
+    first = cache.sync([(base, "base.yml"), (extra, "extra.yml")])
+    assert sorted(calls) == ["base.yml", "extra.yml"]
+    assert len(first.reparsed) == 2
+    assert [snippet["trigger"] for snippet in cache.snippets()] == [":a", ":b", ":c"]
+
+    calls.clear()
+    second = cache.sync([(base, "base.yml"), (extra, "extra.yml")])
+    assert calls == []
+    assert second.reused == 2
+
+    _write(extra, [":c", ":d"], mtime_ns=extra.stat().st_mtime_ns + 5_000_000_000)
+    third = cache.sync([(base, "base.yml"), (extra, "extra.yml")])
+    assert calls == ["extra.yml"]
+    assert third.reparsed == [extra]
+    assert [snippet["trigger"] for snippet in cache.snippets()] == [":a", ":b", ":c", ":d"]
+
+
+def test_sync_drops_files_that_left_the_listing(tmp_path):
+    base = _write(tmp_path / "base.yml", [":a"])
+    extra = _write(tmp_path / "extra.yml", [":b"])
+    cache = MatchFileCache()
+    cache.sync([(base, "base.yml"), (extra, "extra.yml")])
+
+    result = cache.sync([(base, "base.yml")])
+
+    assert result.removed == [extra]
+    assert [snippet["trigger"] for snippet in cache.snippets()] == [":a"]
+
+
+def test_hash_content_skips_reparse_when_only_mtime_changed(tmp_path):
+    base = _write(tmp_path / "base.yml", [":a"])
+    calls = []
+
+    def parser(path, label):
+        calls.append(label)
+        return parse_match_file(path, label)
+
+    cache = MatchFileCache(parser, hash_content=True)
+    cache.sync([(base, "base.yml")])
+    os.utime(base, ns=(base.stat().st_mtime_ns + 10**9,) * 2)
+
+    cache.sync([(base, "base.yml")])
+
+    assert calls == ["base.yml"]
+
+
+def test_parse_errors_are_reported_per_file(tmp_path):
+    broken = tmp_path / "broken.yml"
+    broken.write_text("matches: [unclosed\n", encoding="utf-8")
+    cache = MatchFileCache()
+
+    cache.sync([(broken, "broken.yml")])
+
+    assert cache.snippets() == []
+    assert cache.errors()[0]["file"] == "broken.yml"
+
+
+def test_parallel_parsing_matches_sequential_order(tmp_path):
+    files = [(_write(tmp_path / f"file{index:02}.yml", [f":t{index}a", f":t{index}b"]), f"file{index:02}.yml") for index in range(12)]
+    sequential = MatchFileCache()
+    sequential.sync(files)
+    parallel = MatchFileCache(workers=2, parallel_threshold=4)
+    try:
+        result = parallel.sync(files)
+    finally:
+        parallel.close()
+
+    assert len(result.reparsed) == len(files)
+    assert [dict(snippet) for snippet in parallel.snippets()] == [dict(snippet) for snippet in sequential.snippets()]
@@ -0,0 +1,86 @@
+"""Tests for the on-disk match cache snapshot."""
+
+import os
+import pickle
+import threading
+
+from espanso_companion.body_store import BodyStore
+from espanso_companion.match_cache import MatchFileCache
+from espanso_companion.match_snapshot import SnapshotWriter, load_snapshot, save_snapshot
+
+
+def _cache(tmp_path, bodies=None):
+    match_dir = tmp_path / "match"
+    match_dir.mkdir()
+    base = match_dir / "base.yml"
+    base.write_text(
+        "matches:\n"
+        "  - trigger: ':a'\n    replace: 'Alpha'\n    label: 'First'\n"
+        f"  - trigger: ':long'\n    replace: '{'z' * 300}'\n",
+        encoding="utf-8",
+    )
+    cache = MatchFileCache(bodies=bodies)
+    cache.sync([(base, "base.yml")])
+    return match_dir, cache
+
+
+def test_round_trip_restores_records_and_resolves_spilled_bodies(tmp_path):
+    bodies = BodyStore(threshold=100)
+    match_dir, cache = _cache(tmp_path, bodies)
+    path = tmp_path / "snapshot.pickle"
+
+    assert save_snapshot(path, match_dir, cache.export(), bodies) == path.stat().st_size
+    loaded = load_snapshot(path, match_dir)
+
+    assert loaded is not None
+    [entry] = loaded
+    original = cache.export()[0]
+    assert entry.label == "base.yml"
+    assert entry.fingerprint == original.fingerprint
+    assert [record.to_dict() for record in entry.snippets][0] == original.snippets[0].to_dict()
+    assert entry.snippets[1].replace == "z" * 300
+
+    seeded = MatchFileCache()
+    assert seeded.seed(loaded) == 1
+    assert [snippet["trigger"] for snippet in seeded.snippets()] == [":a", ":long"]
+    bodies.close()
+
+
+def test_snapshot_for_another_directory_or_version_is_ignored(tmp_path):
+    match_dir, cache = _cache(tmp_path)
+    path = tmp_path / "snapshot.pickle"
+    save_snapshot(path, match_dir, cache.export())
+
+    assert load_snapshot(path, tmp_path / "elsewhere") is None
+    payload = pickle.loads(path.read_bytes())
+    payload["version"] = 999
+    path.write_bytes(pickle.dumps(payload))
+    assert load_snapshot(path, match_dir) is None
+    assert load_snapshot(tmp_path / "missing.pickle", match_dir) is None
+
+
+class _Exploit:
+    def __reduce__(self):
+        return (os.system, ("echo pwned",))
+
+
+def test_unpickler_refuses_globals_outside_the_allowlist(tmp_path, capsys):
+    path = tmp_path / "snapshot.pickle"
+    path.write_bytes(pickle.dumps({"version": 1, "files": [_Exploit()]}))
+
+    assert load_snapshot(path, tmp_path) is None
+    assert "Unexpected global in match snapshot" in capsys.readouterr().out
+
+
+def test_writer_saves_a_pending_snapshot_on_stop():
+    saved = threading.Event()
+    writer = SnapshotWriter(lambda: saved.set() or 7, delay=60)
+    writer.start()
+    writer.request()
+    assert not saved.is_set()
+
+    writer.stop()
+
+    assert saved.is_set()
+    assert writer.last()["status"] == "success"
+    assert writer.last()["bytes"] == 7
@@ -0,0 +1,60 @@
+"""Tests for the debounced watcher reload pipeline."""
+
+import threading
+import time
+from pathlib import Path
+
+from espanso_companion.reload_pipeline import ReloadPipeline
+
+
+def _collector():
+    batches = []
+    arrived = threading.Event()
+
+    def handler(paths):
+        batches.append(paths)
+        arrived.set()
+
+    return batches, arrived, handler
+
+
+def test_burst_for_one_path_coalesces_into_one_reload():
+    batches, arrived, handler = _collector()
+    pipeline = ReloadPipeline(handler, quiet_seconds=0.05, max_delay=1.0)
+    pipeline.start()
+    try:
+        for _ in range(20):
+            pipeline.submit(Path("base.yml"))
+        pipeline.submit(Path("extra.yml"))
+        assert arrived.wait(2)
+        time.sleep(0.15)
+    finally:
+        pipeline.stop()
+
+    assert batches == [[Path("base.yml"), Path("extra.yml")]]
+
+
+def test_constant_churn_still_reloads_after_max_delay():
+    batches, arrived, handler = _collector()
+    pipeline = ReloadPipeline(handler, quiet_seconds=0.2, max_delay=0.1)
+    pipeline.start()
+    try:
+        deadline = time.monotonic() + 0.6
+        while time.monotonic() < deadline and not arrived.is_set():
+            pipeline.submit(Path("busy.yml"))
+            time.sleep(0.01)
+        assert arrived.is_set()
+    finally:
+        pipeline.stop()
+
+
+def test_submit_after_stop_is_ignored():
+    batches, _, handler = _collector()
+    pipeline = ReloadPipeline(handler, quiet_seconds=0.01)
+    pipeline.start()
+    pipeline.stop()
+
+    pipeline.submit(Path("base.yml"))
+
+    assert pipeline.pending() == 0
+    assert batches == []
@@ -0,0 +1,94 @@
+"""Tests for the coalescing daemon restart scheduler."""
+
+import threading
+import time
+from subprocess import CompletedProcess
+
+from espanso_companion.restart_scheduler import RestartScheduler
+
+
+class _Restarter:
+    def __init__(self, duration=0.0):
+        self.calls = 0
+        self.duration = duration
+        self.done = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.duration)
+        self.done.set()
+        return CompletedProcess(["espanso", "restart"], 0, "", "")
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_burst_of_requests_restarts_once():
+    restarter = _Restarter()
+    scheduler = RestartScheduler(restarter, quiet_seconds=0.05, max_delay=1.0)
+    scheduler.start()
+    try:
+        for index in range(10):
+            scheduler.request(f"edit {index % 2}")
+        assert restarter.done.wait(2)
+        time.sleep(0.15)
+        state = scheduler.state()
+    finally:
+        scheduler.stop()
+
+    assert restarter.calls == 1
+    assert state["coalesced"] == 9
+    assert state["restarts"] == 1
+    assert not state["pending"]
+
+
+def test_request_during_a_restart_queues_one_follow_up():
+    restarter = _Restarter(duration=0.2)
+    scheduler = RestartScheduler(restarter, quiet_seconds=0.01, max_delay=0.5)
+    scheduler.start()
+    try:
+        scheduler.request("first")
+        assert _wait_for(lambda: scheduler.state()["inFlight"])
+        scheduler.request("second")
+        scheduler.request("third")
+        assert _wait_for(lambda: restarter.calls == 2 and not scheduler.state()["inFlight"])
+        time.sleep(0.1)
+    finally:
+        scheduler.stop()
+
+    assert restarter.calls == 2
+
+
+def test_skip_when_auto_restart_is_on_unless_forced(capsys):
+    restarter = _Restarter()
+    scheduler = RestartScheduler(restarter, quiet_seconds=0.0, skip_when=lambda: True)
+
+    scheduler.request("edit")
+    assert restarter.calls == 0
+    assert scheduler.state()["skipped"] == 1
+    assert "Skipped Espanso restart (edit)" in capsys.readouterr().out
+
+    scheduler.request("manual", force=True)
+    assert restarter.calls == 1
+
+
+def test_restarts_are_only_skipped_for_an_explicit_auto_restart(espanso_home, make_api):
+    api = make_api()
+    config_file = espanso_home.parent / "config" / "default.yml"
+    config_file.write_text("auto_restart: true\n", encoding="utf-8")
+    assert api._espanso_auto_restarts() is False  # off unless the user opts in
+
+    api.save_restart_settings({"skipWhenAutoReload": True})
+    assert api._espanso_auto_restarts() is True
+    config_file.write_text("toggle_key: ALT\n", encoding="utf-8")
+    assert api._espanso_auto_restarts() is False
+    config_file.write_text("auto_restart: [unclosed\n", encoding="utf-8")
+    assert api._espanso_auto_restarts() is False
+    config_file.unlink()
+    assert api._espanso_auto_restarts() is False
@@ -0,0 +1,70 @@
+"""Tests for diff-based restores from the backup store."""
+
+from espanso_companion.backup_store import BackupStore
+from espanso_companion.restore_plan import apply_restore, plan_restore, snapshot_entries
+
+
+def _tree(root, files):
+    for name, text in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+
+
+def test_plan_lists_added_changed_removed_and_apply_touches_only_those(tmp_path):
+    live = tmp_path / "live"
+    _tree(live, {"match/base.yml": "a\nb\n", "match/keep.yml": "same\n", "match/gone.yml": "x\n"})
+    store = BackupStore(tmp_path / "store")
+    snapshot = store.snapshot_tree("config", live)
+    entries = snapshot_entries(store, snapshot["id"])
+
+    (live / "match" / "gone.yml").unlink()
+    (live / "match" / "base.yml").write_text("a\nB\n", encoding="utf-8")
+    (live / "match" / "extra.yml").write_text("new\n", encoding="utf-8")
+    keep_mtime = (live / "match" / "keep.yml").stat().st_mtime_ns
+
+    plan = plan_restore(entries.values(), live, delete_extra=True, include_diff=True)
+    summary = plan.to_dict()
+    assert (summary["added"], summary["changed"], summary["removed"], summary["unchanged"]) == (1, 1, 1, 1)
+    statuses = {change["name"]: change["status"] for change in summary["files"]}
+    assert statuses == {"match/base.yml": "changed", "match/gone.yml": "added", "match/extra.yml": "removed"}
+    diff = next(change["diff"] for change in summary["files"] if change["name"] == "match/base.yml")
+    assert "-B\n" in diff and "+b\n" in diff
+
+    touched = apply_restore(plan, entries, live)
+    assert len(touched) == 3
+    assert (live / "match" / "base.yml").read_text(encoding="utf-8") == "a\nb\n"
+    assert (live / "match" / "gone.yml").exists()
+    assert not (live / "match" / "extra.yml").exists()
+    assert (live / "match" / "keep.yml").stat().st_mtime_ns == keep_mtime
+    assert plan_restore(entries.values(), live, delete_extra=True).changes == []
+
+
+def test_partial_plan_keeps_extra_files(tmp_path):
+    live = tmp_path / "live"
+    _tree(live, {"base.yml": "one\n"})
+    store = BackupStore(tmp_path / "store")
+    entries = snapshot_entries(store, store.snapshot_tree("editor", live)["id"])
+    (live / "other.yml").write_text("x\n", encoding="utf-8")
+
+    assert plan_restore(entries.values(), live, delete_extra=False).to_dict()["removed"] == 0
+
+
+def test_api_preview_then_restore(espanso_home, make_api):
+    base = espanso_home / "base.yml"
+    base.write_text("matches:\n  - trigger: ':a'\n    replace: 'Alpha'\n", encoding="utf-8")
+    api = make_api()
+    backup = api.backup_config()
+    assert backup["status"] == "success"
+
+    base.write_text("matches:\n  - trigger: ':a'\n    replace: 'Changed'\n", encoding="utf-8")
+    preview = api.preview_restore(backup["id"], {"includeDiff": True})
+    assert preview["status"] == "success"
+    assert preview["plan"]["changed"] == 1
+    assert "Changed" in preview["plan"]["files"][0]["diff"]
+    assert "Changed" in base.read_text(encoding="utf-8")
+
+    restored = api.restore_config(backup["id"])
+    assert restored["status"] == "success"
+    assert "Alpha" in base.read_text(encoding="utf-8")
+    assert [snippet["replace"] for snippet in api.list_snippets()] == ["Alpha"]
@@ -0,0 +1,155 @@
+"""Tests for the trigram snippet search index."""
+
+import random
+
+from espanso_companion.search_index import SnippetSearchIndex
+
+
+def _snippet(trigger, replace="", file="base.yml", **extra):
+    return {"trigger": trigger, "replace": replace, "label": extra.pop("label", ""), "file": file, **extra}
+
+
+def _linear(snippets, query):
+    needle = query.strip().lower()
+    return [
+        snippet
+        for snippet in snippets
+        if needle in " ".join([snippet["trigger"], snippet["replace"], snippet["label"], snippet["file"]]).lower()
+    ]
+
+
+def test_substring_search_matches_a_linear_scan():
+    rng = random.Random(7)
+    alphabet = "abcde :"
+    snippets = [
+        _snippet(":" + "".join(rng.choice(alphabet) for _ in range(4)), "".join(rng.choice(alphabet) for _ in range(30)), file=f"f{i % 3}.yml")
+        for i in range(300)
+    ]
+    index = SnippetSearchIndex()
+    for file_index in range(3):
+        index.replace_file(f"f{file_index}", [snippet for snippet in snippets if snippet["file"] == f"f{file_index}.yml"])
+    ordered = [snippet for file_index in range(3) for snippet in snippets if snippet["file"] == f"f{file_index}.yml"]
+
+    for query in ["", "a", "ab", "abc", "cde:", " a", "zzz", "F1.Y"]:
+        assert index.search(query) == _linear(ordered, query), query
+
+
+def test_replace_file_swaps_documents_and_filters_apply():
+    index = SnippetSearchIndex()
+    index.replace_file("base", [_snippet(":hello", "Hello there"), _snippet(":bye", "Goodbye", enabled=False)])
+    index.replace_file("work", [_snippet(":sig", "Kind regards", file="work.yml", label="signature", hasVars=True)])
+
+    assert [s["trigger"] for s in index.search("", {"enabled": "disabled"})] == [":bye"]
+    assert [s["trigger"] for s in index.search("", {"hasVars": True})] == [":sig"]
+    assert [s["trigger"] for s in index.search("re", {"file": "work.yml"})] == [":sig"]
+    assert [s["trigger"] for s in index.search("", {"label": "SIGN"})] == [":sig"]
+
+    index.replace_file("base", [_snippet(":hi", "Hi")])
+    assert index.search("hello") == []
+    assert [s["trigger"] for s in index.search(":h")] == [":hi"]
+
+    index.remove_file("work")
+    assert index.search("regards") == []
+    assert len(index) == 1
+
+
+def test_tombstones_are_compacted_without_changing_results():
+    index = SnippetSearchIndex()
+    for round_number in range(5):
+        index.replace_file("base", [_snippet(f":t{i}", f"body {round_number} {i}") for i in range(600)])
+
+    # 2,400 superseded documents exceed the threshold, so the postings were rebuilt
+    assert index._dead == 0
+    assert len(index._postings["bod"]) == 600
+    assert [s["trigger"] for s in index.search("body 4 59")] == [":t59"] + [f":t{i}" for i in range(590, 600)]
+    assert index.search("body 3") == []
+
+
+class _CountingDict(dict):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.reads = 0
+
+    def get(self, *args):
+        self.reads += 1
+        return super().get(*args)
+
+
+def test_short_queries_use_their_own_postings_instead_of_a_scan():
+    snippets = [_snippet(f":t{i}", "plain words" if i % 50 else "quiz") for i in range(500)]
+    index = SnippetSearchIndex()
+    index.replace_file("base", snippets)
+    index._haystacks = _CountingDict(index._haystacks)
+
+    for query in ["q", "qu", "Z", "iz"]:
+        assert index.search(query) == _linear(snippets, query), query
+    # only the ten "quiz" documents are candidates for each query
+    assert index._haystacks.reads == 40
+    assert len(index._postings["q"]) == 10
+    assert index.search("x") == []
+
+
+def test_prefix_mode_only_matches_trigger_starts():
+    index = SnippetSearchIndex()
+    index.replace_file("base", [_snippet(":addr", "street"), _snippet(":mail", "addr@example.com")])
+
+    assert [s["trigger"] for s in index.search(":ad", prefix=True)] == [":addr"]
+    assert [s["trigger"] for s in index.search("addr")] == [":addr", ":mail"]
+
+
+def test_bounded_levenshtein_agrees_with_the_full_distance():
+    from espanso_companion.search_index import bounded_levenshtein
+
+    def full(left, right):
+        previous = list(range(len(right) + 1))
+        for row, left_char in enumerate(left, 1):
+            current = [row]
+            for column, right_char in enumerate(right, 1):
+                current.append(min(previous[column] + 1, current[column - 1] + 1, previous[column - 1] + (left_char != right_char)))
+            previous = current
+        return previous[-1]
+
+    rng = random.Random(3)
+    for _ in range(500):
+        left = "".join(rng.choice("abc") for _ in range(rng.randint(0, 7)))
+        right = "".join(rng.choice("abc") for _ in range(rng.randint(0, 7)))
+        for bound in range(4):
+            distance = full(left, right)
+            assert bounded_levenshtein(left, right, bound) == (distance if distance <= bound else None)
+
+
+def test_ranked_search_orders_tiers_and_tolerates_typos():
+    from espanso_companion.search_index import RANK_BODY, RANK_EXACT, RANK_FUZZY_BASE, RANK_LABEL, RANK_PREFIX
+
+    index = SnippetSearchIndex()
+    index.replace_file("base", [
+        _snippet(":email", "Reply-To"),
+        _snippet(":emails", "many"),
+        _snippet(":emial", "typo"),
+        _snippet(":x", "see :email below"),
+        _snippet(":y", "", label="Work :email"),
+    ])
+
+    ranked = [(snippet["trigger"], rank) for snippet, rank in index.search_ranked(":email")]
+
+    assert ranked == [
+        (":email", RANK_EXACT),
+        (":emails", RANK_PREFIX),
+        (":emial", RANK_FUZZY_BASE + 2),
+        (":y", RANK_LABEL),
+        (":x", RANK_BODY),
+    ]
+    assert [s["trigger"] for s, _ in index.search_ranked(":emial", max_distance=0)] == [":emial"]
+
+
+def test_every_triggers_entry_is_searchable():
+    index = SnippetSearchIndex()
+    index.replace_file("base", [{"trigger": "", "triggers": [":hello", ":hi"], "replace": "Hey", "file": "base.yml"}])
+
+    assert len(index.search(":hel", prefix=True)) == 1
+    assert len(index.search(":hi", prefix=True)) == 1
+    assert [rank for _, rank in index.search_ranked(":hi")] == [0]
+    assert [rank for _, rank in index.search_ranked(":helo")] == [4]
+
+    index.remove_file("base")
+    assert index._triggers == [] and index._trigger_docs == {}
@@ -0,0 +1,139 @@
+"""Tests for transactional snippet batches."""
+
+BASE = """# my snippets
+matches:
+  - trigger: ":a"   # first
+    replace: 'Alpha'
+  - trigger: ":b"
+    replace: "Beta"
+"""
+
+
+def _triggers(api):
+    return [snippet["trigger"] for snippet in api.list_snippets()]
+
+
+def test_failed_operation_rolls_back_the_whole_batch(espanso_home, make_api):
+    base = espanso_home / "base.yml"
+    base.write_text(BASE, encoding="utf-8")
+    api = make_api()
+
+    result = api.apply_snippet_batch(
+        [
+            {"op": "create", "snippet": {"trigger": ":c", "replace": "Gamma"}},
+            {"op": "update", "trigger": ":a", "snippet": {"trigger": ":a", "replace": "Changed"}},
+            {"op": "create", "snippet": {"trigger": ":b", "replace": "duplicate"}},
+        ],
+        {"restart": False},
+    )
+
+    assert result["status"] == "error"
+    assert result["index"] == 2
+    assert base.read_text(encoding="utf-8") == BASE
+    assert _triggers(api) == [":a", ":b"]
+
+
+def test_skip_mode_applies_the_rest_with_one_write_per_file(espanso_home, make_api):
+    base = espanso_home / "base.yml"
+    base.write_text(BASE, encoding="utf-8")
+    (espanso_home / "work.yml").write_text("matches:\n  - trigger: ':w'\n    replace: 'Work'\n", encoding="utf-8")
+    api = make_api()
+
+    result = api.apply_snippet_batch(
+        [
+            {"op": "create", "snippet": {"trigger": ":c", "replace": "Gamma"}},
+            {"op": "delete", "trigger": ":missing"},
+            {"op": "move", "trigger": ":w", "target": "base.yml"},
+            {"op": "update", "trigger": ":a", "snippet": {"trigger": ":a", "replace": "Alpha 2"}},
+        ],
+        {"onConflict": "skip", "restart": False},
+    )
+
+    assert result["status"] == "success"
+    assert [item["status"] for item in result["results"]] == ["success", "skipped", "success", "success"]
+    assert sorted(result["files"]) == ["base.yml", "work.yml"]
+    text = base.read_text(encoding="utf-8")
+    assert text.startswith("# my snippets\nmatches:\n")
+    assert '  - trigger: ":b"\n    replace: "Beta"\n' in text
+    assert sorted(_triggers(api)) == [":a", ":b", ":c", ":w"]
+    assert api.get_snippet(":a")["snippet"]["replace"] == "Alpha 2"
+
+
+def test_failed_second_write_restores_the_first_file(espanso_home, make_api, monkeypatch):
+    import espanso_companion.atomic_io as atomic_io
+
+    base = espanso_home / "base.yml"
+    base.write_text(BASE, encoding="utf-8")
+    work = espanso_home / "work.yml"
+    work.write_text("matches:\n  - trigger: ':w'\n    replace: 'Work'\n", encoding="utf-8")
+    before = {path: path.read_bytes() for path in (base, work)}
+    api = make_api()
+
+    real_replace = atomic_io.os.replace
+    calls = []
+
+    def flaky_replace(source, target):
+        calls.append(target)
+        if len(calls) == 2:
+            raise OSError("disk full")
+        real_replace(source, target)
+
+    monkeypatch.setattr(atomic_io.os, "replace", flaky_replace)
+    result = api.apply_snippet_batch([{"op": "move", "trigger": ":w", "target": "base.yml"}], {"restart": False})
+
+    assert result["status"] == "error"
+    assert "disk full" in result["detail"]
+    assert {path: path.read_bytes() for path in (base, work)} == before
+    assert not [path for path in espanso_home.iterdir() if path.name.endswith(".tmp")]
+    assert sorted(_triggers(api)) == [":a", ":b", ":w"]
+
+
+def test_single_edits_splice_the_located_item_without_loading_the_file(espanso_home, make_api, monkeypatch):
+    base = espanso_home / "base.yml"
+    base.write_text(BASE, encoding="utf-8")
+    api = make_api()
+
+    def no_full_parse(path):
+        raise AssertionError(f"{path} was parsed in full")
+
+    monkeypatch.setattr(api.yaml_processor, "load", no_full_parse)
+
+    assert api.update_snippet(":b", {"trigger": ":b", "replace": "Beta 2"})["status"] == "success"
+    assert base.read_text(encoding="utf-8") == BASE.replace('  - trigger: ":b"\n    replace: "Beta"\n', "  - trigger: :b\n    replace: Beta 2\n")
+    assert api.delete_snippet(":b")["status"] == "success"
+    assert base.read_text(encoding="utf-8") == BASE.split('  - trigger: ":b"')[0]
+    assert _triggers(api) == [":a"]
+
+
+def test_later_operations_see_an_in_place_edit(espanso_home, make_api):
+    base = espanso_home / "base.yml"
+    base.write_text(BASE, encoding="utf-8")
+    api = make_api()
+
+    result = api.apply_snippet_batch(
+        [
+            {"op": "update", "trigger": ":b", "snippet": {"trigger": ":b2", "replace": "Beta"}},
+            {"op": "create", "snippet": {"trigger": ":b2", "replace": "again"}},
+        ],
+        {"onConflict": "skip", "restart": False},
+    )
+
+    assert [item["status"] for item in result["results"]] == ["success", "skipped"]
+    assert _triggers(api) == [":a", ":b2"]
+    assert base.read_text(encoding="utf-8").startswith("# my snippets\nmatches:\n")
+
+
+def test_stale_locations_fall_back_to_the_whole_file(espanso_home, make_api):
+    base = espanso_home / "base.yml"
+    base.write_text(BASE, encoding="utf-8")
+    api = make_api()
+    base.write_text(BASE.replace("matches:\n", "matches:\n  - trigger: ':new'\n    replace: 'New'\n"), encoding="utf-8")
+
+    assert api.update_snippet(":a", {"trigger": ":a", "replace": "Alpha 2"})["status"] == "success"
+
+    document = api.yaml_processor.load(base)
+    assert [(match["trigger"], match["replace"]) for match in document["matches"]] == [
+        (":new", "New"),
+        (":a", "Alpha 2"),
+        (":b", "Beta"),
+    ]
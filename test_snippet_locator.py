@@ -0,0 +1,60 @@
+"""Tests for the trigger → match file locator and multi-file snippet edits."""
+
+from espanso_companion.snippet_locator import SnippetLocator
+
+
+def test_locator_indexes_triggers_lists_and_swaps_files():
+    locator = SnippetLocator()
+    locator.replace_file(
+        "a",
+        [
+            {"trigger": ":x", "triggers": [":x", ":y"], "file": "a.yml", "line": 3},
+            {"trigger": ":off", "enabled": False, "file": "a.yml"},
+        ],
+    )
+    locator.replace_file("b", [{"trigger": ":x", "file": "b.yml"}])
+
+    assert [location.file for location in locator.locate(":x")] == ["a.yml", "b.yml"]
+    assert locator.first(":y").to_dict() == {"trigger": ":y", "file": "a.yml", "index": 0, "line": 3, "endLine": None}
+    assert locator.first(":off").index == 1
+    assert locator.first(":x", file="b.yml").key == "b"
+
+    locator.replace_file("a", [{"trigger": ":z", "file": "a.yml"}])
+    assert locator.locate(":y") == []
+    assert [location.file for location in locator.locate(":x")] == ["b.yml"]
+
+    locator.remove_file("b")
+    assert locator.locate(":x") == []
+    assert len(locator) == 1
+
+
+def test_snippets_outside_base_are_found_and_edited_in_place(espanso_home, make_api):
+    base = espanso_home / "base.yml"
+    base.write_text("matches:\n  - trigger: ':a'\n    replace: 'Alpha'\n", encoding="utf-8")
+    work = espanso_home / "work.yml"
+    work.write_text(
+        "matches:\n"
+        "  - trigger: ':w'\n"
+        "    triggers: [':w', ':work']\n"
+        "    replace: 'Work'\n"
+        "  - trigger: ':off'\n"
+        "    enabled: false\n"
+        "    replace: 'Off'\n",
+        encoding="utf-8",
+    )
+    api = make_api()
+
+    found = api.get_snippet(":work")
+    assert found["status"] == "success"
+    assert found["snippet"]["file"] == "work.yml"
+    assert found["snippet"]["replace"] == "Work"
+    assert api.get_snippet(":off")["snippet"]["enabled"] is False
+
+    result = api.update_snippet(":w", {"trigger": ":w", "triggers": [":w", ":work"], "replace": "Work 2"}, "work.yml")
+    assert result["status"] == "success"
+    assert "Work 2" in work.read_text(encoding="utf-8")
+    assert "Work 2" not in base.read_text(encoding="utf-8")
+
+    assert api.delete_snippet(":off")["status"] == "success"
+    assert ":off" not in work.read_text(encoding="utf-8")
+    assert api.get_snippet(":off")["status"] == "error"
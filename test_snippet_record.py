@@ -0,0 +1,60 @@
+"""Tests for the slotted snippet records kept in the match cache."""
+
+import pickle
+
+from espanso_companion.body_store import LazyBody
+from espanso_companion.snippet_record import EMPTY, KEYS, SnippetRecord, as_dict
+
+RAW = {
+    "trigger": ":sig",
+    "triggers": [":sig", ":signature", 3],
+    "replace": "Regards",
+    "label": "Signature",
+    "delay": "-5",
+    "word": 1,
+    "vars": [{"name": "d", "type": "date"}],
+}
+
+
+def test_record_reads_like_the_dict_it_replaces():
+    record = SnippetRecord.from_raw(RAW, "base.yml", index=2, line=4, end_line=8)
+
+    assert list(record) == list(KEYS)
+    assert len(record) == len(KEYS)
+    assert record["trigger"] == ":sig"
+    assert record["triggers"] == (":sig", ":signature")
+    assert record["endLine"] == 8
+    assert record["hasVars"] is True and record["hasForm"] is False
+    assert record["delay"] is None and record["word"] is True
+    assert record.get("missing", "x") == "x"
+    assert "label" in record and "missing" not in record
+
+    data = record.to_dict()
+    assert set(data) == set(KEYS)
+    assert data["triggers"] == [":sig", ":signature"]
+    assert as_dict(record) == data
+
+
+def test_records_share_empty_sentinels_and_round_trip_through_state():
+    bare = SnippetRecord.from_raw({"trigger": ":a", "replace": "A"}, "base.yml")
+    assert bare.triggers is EMPTY and bare.variables is EMPTY
+    assert bare.to_dict()["variables"] == []
+
+    record = SnippetRecord.from_raw(RAW, "base.yml", index=2)
+    copy = pickle.loads(pickle.dumps(record))
+    assert copy == record
+    assert copy.file is record.file
+
+    moved = SnippetRecord.from_raw(RAW, "base.yml", index=7, line=20)
+    assert moved != record
+    assert moved.content() == record.content()
+
+
+def test_spilled_body_reads_as_its_preview():
+    record = SnippetRecord.from_raw({"trigger": ":long", "replace": ""}, "base.yml")
+    record.replace = LazyBody("0" * 32, 5000, "Once upon")
+
+    assert record["replace"] == "Once upon"
+    data = record.to_dict()
+    assert data["replace"] == "Once upon"
+    assert data["replaceLazy"] is True and data["replaceLength"] == 5000
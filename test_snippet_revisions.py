@@ -0,0 +1,84 @@
+"""Tests for snippet revisions, tombstones and delta sync."""
+
+from espanso_companion.snippet_revisions import SnippetRevisions, merge_changes
+
+
+def _snippet(trigger, replace, index=0, file="base.yml"):
+    return {"trigger": trigger, "replace": replace, "file": file, "index": index}
+
+
+def test_only_real_changes_bump_revisions_and_removals_leave_tombstones():
+    revisions = SnippetRevisions()
+    revisions.replace_file("base", [_snippet(":a", "A"), _snippet(":b", "B", 1)])
+    start = revisions.revision
+
+    # Moving :b above :a only changes positions
+    revisions.replace_file("base", [_snippet(":b", "B", 0), _snippet(":a", "A", 1)])
+    assert revisions.revision == start
+    assert revisions.changes_since(start)["changed"] == []
+
+    revisions.replace_file("base", [_snippet(":b", "B2", 0), _snippet(":c", "C", 1)])
+    delta = revisions.changes_since(start)
+    assert delta["reset"] is False
+    assert [(item["trigger"], item["replace"]) for item in delta["changed"]] == [(":b", "B2"), (":c", "C")]
+    assert [(item["id"], item["trigger"]) for item in delta["removed"]] == [("base.yml:::a", ":a")]
+    assert delta["revision"] == revisions.revision
+    assert revisions.changes_since(revisions.revision) == {
+        "revision": revisions.revision, "reset": False, "truncated": False, "changed": [], "removed": [],
+    }
+
+
+def test_repeated_triggers_get_occurrence_ids_and_limit_truncates():
+    revisions = SnippetRevisions()
+    revisions.replace_file("base", [_snippet(":a", "one"), _snippet(":a", "two", 1)])
+    first = revisions.changes_since(0)
+    assert first["reset"] is True
+    assert [item["id"] for item in first["changed"]] == ["base.yml:::a", "base.yml:::a#1"]
+
+    since = revisions.revision
+    revisions.replace_file("other", [_snippet(f":o{index}", "x", index, file="other.yml") for index in range(5)])
+    page = revisions.changes_since(since, limit=2)
+    assert page["truncated"] is True
+    assert len(page["changed"]) == 2
+    rest = revisions.changes_since(page["revision"])
+    assert [item["trigger"] for item in rest["changed"]] == [":o2", ":o3", ":o4"]
+
+
+def test_clients_older_than_the_kept_tombstones_get_a_reset():
+    revisions = SnippetRevisions(tombstone_limit=2)
+    revisions.replace_file("base", [_snippet(f":t{index}", "x", index) for index in range(4)])
+    since = revisions.revision
+    revisions.replace_file("base", [])
+
+    delta = revisions.changes_since(since)
+    assert delta["reset"] is True
+    assert delta["changed"] == [] and len(revisions) == 0
+
+
+def test_merge_changes_keeps_the_latest_state_per_id():
+    first = {"from": 1, "revision": 3, "changed": [{"id": "x", "v": 1}, {"id": "y", "v": 1}], "removed": []}
+    second = {"from": 3, "revision": 5, "changed": [{"id": "z", "v": 1}], "removed": [{"id": "x"}]}
+
+    merged = merge_changes(first, second)
+    assert merged == {"from": 1, "revision": 5, "changed": [{"id": "y", "v": 1}, {"id": "z", "v": 1}], "removed": [{"id": "x"}]}
+    assert merge_changes(first, {"from": 3, "revision": 6}) == {"from": 1, "revision": 6}
+
+
+def test_api_changes_report_edits_and_deletions(espanso_home, make_api):
+    (espanso_home / "base.yml").write_text(
+        "matches:\n  - trigger: ':a'\n    replace: 'Alpha'\n  - trigger: ':b'\n    replace: 'Beta'\n", encoding="utf-8"
+    )
+    api = make_api()
+    full = api.get_snippet_changes(0, {"fields": ["trigger", "replace"]})
+    assert full["reset"] is True
+    assert sorted(item["trigger"] for item in full["changed"]) == [":a", ":b"]
+    assert set(full["changed"][0]) == {"trigger", "replace", "id", "revision"}
+
+    assert api.update_snippet(":a", {"trigger": ":a", "replace": "Alpha 2"})["status"] == "success"
+    assert api.delete_snippet(":b")["status"] == "success"
+
+    delta = api.get_snippet_changes(full["revision"])
+    assert delta["status"] == "success" and delta["reset"] is False
+    assert [(item["trigger"], item["replace"]) for item in delta["changed"]] == [(":a", "Alpha 2")]
+    assert [item["trigger"] for item in delta["removed"]] == [":b"]
+    assert api.get_snippet_changes("nope")["status"] == "error"
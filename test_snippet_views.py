@@ -0,0 +1,53 @@
+"""Tests for paging, sorting and projection of snippet lists."""
+
+from espanso_companion.snippet_views import PageRequest, page_snippets, preview_text
+
+
+def _snippets(count):
+    return [
+        {"trigger": f":t{index:03}", "label": f"L{(count - index):03}", "file": "base.yml", "replace": f"body   {index}\n  more", "enabled": index % 2 == 0}
+        for index in range(count)
+    ]
+
+
+def test_default_request_returns_everything():
+    request = PageRequest.from_options(None)
+    page = page_snippets(_snippets(5), request)
+
+    assert request.is_default
+    assert page["count"] == 5
+    assert page["nextOffset"] is None
+    assert len(page["results"]) == 5
+
+
+def test_pages_walk_the_list_with_a_cursor():
+    snippets = _snippets(25)
+    offset, seen = 0, []
+    while offset is not None:
+        page = page_snippets(snippets, PageRequest.from_options({"offset": offset, "limit": 10}))
+        seen.extend(item["trigger"] for item in page["results"])
+        offset = page["nextOffset"]
+
+    assert seen == [snippet["trigger"] for snippet in snippets]
+
+
+def test_partial_sort_matches_a_full_sort():
+    snippets = _snippets(200)
+    full = sorted(snippets, key=lambda snippet: snippet["label"].lower(), reverse=True)
+
+    page = page_snippets(snippets, PageRequest.from_options({"sort": "label", "order": "desc", "limit": 5, "offset": 5}))
+
+    assert [item["label"] for item in page["results"]] == [item["label"] for item in full[5:10]]
+
+
+def test_projection_keeps_requested_fields_and_builds_a_preview():
+    page = page_snippets(_snippets(3), PageRequest.from_options({"fields": "compact", "previewLength": 8, "limit": 1}))
+
+    assert page["results"] == [{"trigger": ":t000", "label": "L003", "file": "base.yml", "preview": "body 0 …"}]
+
+
+def test_options_are_sanitized():
+    request = PageRequest.from_options({"offset": "-3", "limit": "abc", "sort": "__class__", "fields": ["trigger"]})
+
+    assert (request.offset, request.limit, request.sort, request.fields) == (0, None, None, ["trigger"])
+    assert preview_text(None, 10) == ""
@@ -0,0 +1,80 @@
+"""Tests for trigger duplicate and shadowing analysis."""
+
+from espanso_companion.trigger_trie import TriggerTrie
+
+
+def _snippet(trigger, file="base.yml", **extra):
+    return {"trigger": trigger, "file": file, **extra}
+
+
+def _summary(conflicts):
+    return [(conflict.kind, conflict.trigger, conflict.other, conflict.mitigated) for conflict in conflicts]
+
+
+def test_library_conflicts_report_duplicates_and_shadowing():
+    trie = TriggerTrie()
+    trie.replace_file("base", [_snippet(":a"), _snippet(":ab"), _snippet(":x", word=True), _snippet(":xy")])
+    trie.replace_file("work", [_snippet(":ab", file="work.yml"), _snippet(":x ", file="work.yml")])
+
+    assert _summary(trie.conflicts()) == [
+        ("duplicate", ":ab", None, False),
+        ("prefix", ":a", ":ab", False),
+        ("prefix", ":x", ":x ", False),
+        ("prefix", ":x", ":xy", True),
+    ]
+    assert (":x", ":xy") not in [(c.trigger, c.other) for c in trie.conflicts(include_mitigated=False)]
+
+
+def test_disabled_snippets_and_triggers_lists():
+    trie = TriggerTrie()
+    trie.replace_file("base", [_snippet(":off", enabled=False), {"trigger": "", "triggers": [":one", ":two"], "file": "base.yml"}])
+
+    assert trie.lookup(":off") == []
+    assert [entry.trigger for entry in trie.lookup(":two")] == [":two"]
+    assert len(trie) == 2
+
+
+def test_check_reports_what_a_typed_trigger_would_collide_with():
+    trie = TriggerTrie()
+    trie.replace_file("base", [_snippet(":sig"), _snippet(":signature"), _snippet(":s")])
+
+    assert _summary(trie.check(":sig")) == [
+        ("duplicate", ":sig", None, False),
+        ("prefix", ":s", ":sig", False),
+        ("prefix", ":sig", ":signature", False),
+    ]
+    # Editing ":sig" in place is not a duplicate of itself
+    assert [c.kind for c in trie.check(":sig", ignore=":sig")] == ["prefix", "prefix"]
+    assert _summary(trie.check(":sig", word=True, ignore=":sig"))[-1] == ("prefix", ":sig", ":signature", True)
+
+
+def test_replacing_a_file_prunes_old_entries():
+    trie = TriggerTrie()
+    trie.replace_file("base", [_snippet(":long")])
+    trie.replace_file("base", [_snippet(":other")])
+
+    assert trie.lookup(":long") == []
+    assert trie.extensions_of(":l") == []
+    trie.remove_file("base")
+    assert trie._root == {}
+
+
+def test_left_word_stops_a_trigger_firing_inside_a_longer_one():
+    trie = TriggerTrie()
+    trie.replace_file(
+        "base",
+        [_snippet("ion", left_word=True), _snippet("at"), _snippet("ok", left_word=True), _snippet(":enations"), _snippet("be ok!")],
+    )
+
+    assert _summary(trie.conflicts()) == [
+        ("infix", "at", ":enations", False),
+        ("infix", "ion", ":enations", True),
+        ("infix", "ok", "be ok!", False),
+    ]
+    assert ("ion", ":enations") not in [(c.trigger, c.other) for c in trie.conflicts(include_mitigated=False)]
+    # A new trigger is checked both ways: shorter triggers inside it and longer ones containing it
+    assert _summary(trie.check("nati", left_word=True)) == [
+        ("infix", "at", "nati", False),
+        ("infix", "nati", ":enations", True),
+    ]
+    assert _summary(trie.check("nati"))[-1] == ("infix", "nati", ":enations", False)
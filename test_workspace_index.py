@@ -0,0 +1,51 @@
+"""Tests for recursive match discovery in the workspace index."""
+
+from pathlib import Path
+
+from espanso_companion.workspace_index import WorkspaceIndex
+
+
+def _touch(path: Path) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("matches: []\n", encoding="utf-8")
+    return path
+
+
+def test_match_entries_recurse_and_skip_hidden_and_import_only(tmp_path):
+    match = tmp_path / "match"
+    _touch(match / "base.yml")
+    _touch(match / "work" / "email.yaml")
+    _touch(match / "work" / "deep" / "sig.yml")
+    _touch(match / "_shared.yml")
+    _touch(match / "_private" / "inner.yml")
+    _touch(match / ".git" / "config.yml")
+    _touch(match / "notes.txt")
+
+    index = WorkspaceIndex([match])
+
+    assert [label for _, label in index.match_entries(match)] == ["base.yml", "work/deep/sig.yml", "work/email.yaml"]
+    assert match / "_shared.yml" in index.files(match)
+    assert match / ".git" / "config.yml" not in index.files(match)
+
+
+def test_loadable_label_agrees_with_the_walk(tmp_path):
+    match = tmp_path / "match"
+    index = WorkspaceIndex([match])
+
+    assert index.loadable_label(match / "work" / "email.yml", match) == "work/email.yml"
+    assert index.loadable_label(match / "_private" / "inner.yml", match) is None
+    assert index.loadable_label(match / "notes.txt", match) is None
+    assert index.loadable_label(tmp_path / "elsewhere.yml", match) is None
+
+
+def test_listing_is_cached_until_invalidated(tmp_path):
+    match = tmp_path / "match"
+    _touch(match / "base.yml")
+    index = WorkspaceIndex([tmp_path, match])
+    assert len(index.files()) == 1
+
+    _touch(match / "new.yml")
+    assert len(index.files()) == 1
+
+    index.invalidate()
+    assert len(index.files()) == 2
@@ -0,0 +1,164 @@
+"""Tests for span-based match file edits."""
+
+import copy
+import random
+
+from espanso_companion.yaml_editing import MatchFileEditor, match_item_spans
+from espanso_companion.yaml_processor import YamlProcessor
+
+SOURCE = """# header comment
+global_vars:
+  - name: who   # keep me
+    type: echo
+    params: {echo: "me"}
+
+matches:
+  # first group
+  - trigger: ":a"
+    replace: 'single quoted'   # trailing
+
+  - trigger: ":b"
+    replace: |
+      multi
+      line
+
+  - triggers: [":c", ":cc"]
+    replace: "x"
+# footer comment
+"""
+
+
+def _edit(document, change):
+    edited = copy.deepcopy(document)
+    change(edited["matches"])
+    return edited
+
+
+def test_editing_one_item_leaves_every_other_byte_alone():
+    processor = YamlProcessor()
+    editor = MatchFileEditor(processor)
+    document = processor.load_document(SOURCE)
+
+    text, surgical = editor.render(SOURCE, _edit(document, lambda matches: matches[1].update(replace="changed")))
+
+    assert surgical
+    before, after = SOURCE.split('  - trigger: ":b"')
+    assert text.startswith(before)
+    assert text.endswith(after[after.index("\n  - triggers"):])
+    assert processor.load_document(text)["matches"][1]["replace"] == "changed"
+
+
+def test_insert_delete_and_move_keep_comments_and_styles():
+    processor = YamlProcessor()
+    editor = MatchFileEditor(processor)
+    document = processor.load_document(SOURCE)
+
+    def change(matches):
+        matches.insert(0, matches.pop(2))
+        matches.append({"trigger": ":new", "replace": "two\nlines"})
+        del matches[2]
+
+    edited = _edit(document, change)
+    text, surgical = editor.render(SOURCE, edited)
+
+    assert surgical
+    assert processor.load_document(text) == edited
+    for fragment in ("# header comment", "# keep me", "# first group", "'single quoted'   # trailing", "# footer comment"):
+        assert fragment in text
+
+
+def test_random_edit_sequences_always_load_back_exactly():
+    processor = YamlProcessor()
+    editor = MatchFileEditor(processor)
+    rng = random.Random(11)
+    text, document = SOURCE, processor.load_document(SOURCE)
+    for step in range(150):
+        def change(matches):
+            choice = rng.random()
+            if choice < 0.35 or len(matches) < 2:
+                matches.insert(rng.randrange(len(matches) + 1), {"trigger": f":n{step}", "replace": rng.choice(["a", "b\nc", "k: v"])})
+            elif choice < 0.6:
+                rng.choice(matches)["replace"] = f"v{step}"
+            elif choice < 0.8:
+                matches.pop(rng.randrange(len(matches)))
+            else:
+                matches.insert(rng.randrange(len(matches)), matches.pop(rng.randrange(len(matches))))
+
+        document = _edit(document, change)
+        text, surgical = editor.render(text, document)
+        assert surgical, step
+        assert processor.load_document(text) == document, step
+    assert "# header comment" in text and "# footer comment" in text
+
+
+def test_changes_outside_matches_fall_back_to_a_full_dump():
+    processor = YamlProcessor()
+    editor = MatchFileEditor(processor)
+    document = processor.load_document(SOURCE)
+    document["global_vars"][0]["name"] = "other"
+
+    text, surgical = editor.render(SOURCE, document)
+
+    assert not surgical
+    assert processor.load_document(text) == document
+
+
+def test_files_with_aliases_fall_back_to_a_full_dump():
+    source = (
+        "matches:\n"
+        "  - trigger: ':a'\n"
+        "    replace: &sig 'Regards'\n"
+        "  - trigger: ':b'\n"
+        "    replace: *sig\n"
+    )
+    processor = YamlProcessor()
+    editor = MatchFileEditor(processor)
+    document = processor.load_document(source)
+    document["matches"][0]["replace"] = "Cheers"
+
+    text, surgical = editor.render(source, document)
+
+    assert not surgical
+    assert processor.load_document(text) == document
+
+
+def test_repeat_edits_reuse_the_remembered_layout(monkeypatch):
+    processor = YamlProcessor()
+    editor = MatchFileEditor(processor)
+    document = processor.load_document(SOURCE)
+    first = _edit(document, lambda matches: matches[0].update(replace="one"))
+    text, _ = editor.render(SOURCE, first)
+
+    composed = []
+    monkeypatch.setattr(processor, "compose", lambda source: composed.append(source))
+    second = _edit(first, lambda matches: matches[2].update(replace="two"))
+    text, surgical = editor.render(text, second)
+
+    assert surgical and composed == []
+    assert processor.load_document(text) == second
+
+
+def test_item_spans_carry_source_lines():
+    processor = YamlProcessor()
+
+    spans = match_item_spans(SOURCE, processor.compose(SOURCE))
+
+    assert [(span.line, span.end_line) for span in spans] == [(9, 10), (12, 15), (17, 18)]
+
+
+def test_read_item_parses_only_the_recorded_lines():
+    processor = YamlProcessor()
+    editor = MatchFileEditor(processor)
+
+    span, match = editor.read_item(SOURCE, 12, 15)
+    assert match == {"trigger": ":b", "replace": "multi\nline\n"}
+    assert (span.start, span.end) == (SOURCE.index('  - trigger: ":b"'), SOURCE.index('\n\n  - triggers') + 1)
+
+    edited = editor.replace_item(SOURCE, span, {"trigger": ":b", "replace": "one"})
+    expected = processor.load_document(SOURCE)
+    expected["matches"][1] = {"trigger": ":b", "replace": "one"}
+    assert processor.load_document(edited) == expected
+    assert edited.replace("  - trigger: :b\n    replace: one\n", "") == SOURCE.replace(SOURCE[span.start:span.end], "")
+
+    assert editor.read_item(SOURCE, 11, 15) is None  # a blank line is not an item
+    assert editor.read_item("matches:\n  - trigger: ':x'\n    replace: *sig\n", 2, 3) is None
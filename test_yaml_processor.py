@@ -0,0 +1,47 @@
+"""Tests for the YAML gateway (libyaml-backed when available)."""
+
+import yaml
+
+from espanso_companion.yaml_processor import YAML_BACKEND, YamlProcessor
+
+
+def test_backend_matches_what_pyyaml_provides():
+    expected = "libyaml" if getattr(yaml, "__with_libyaml__", False) else "python"
+    assert YAML_BACKEND == expected
+    assert YamlProcessor.backend == YAML_BACKEND
+
+
+def test_round_trip_keeps_order_and_unicode():
+    processor = YamlProcessor()
+    data = {"matches": [{"trigger": ":café", "replace": "naïve ☕", "word": True}], "global_vars": []}
+
+    text = processor.dumps(data)
+
+    assert "☕" in text
+    assert processor.load_str(text) == data
+    assert list(processor.load_str(text)) == ["matches", "global_vars"]
+
+
+def test_safe_loading_refuses_python_tags():
+    processor = YamlProcessor()
+    try:
+        processor.load_str("x: !!python/object/apply:os.system ['true']\n")
+    except yaml.YAMLError:
+        return
+    raise AssertionError("python tags must not be constructed")
+
+
+def test_literal_dumper_writes_multiline_strings_as_blocks():
+    processor = YamlProcessor()
+
+    text = processor.dumps({"replace": "line one\nline two"}, literal_multiline=True)
+
+    assert "|" in text
+    assert processor.load_document(text) == {"replace": "line one\nline two"}
+
+
+def test_non_mapping_documents_normalize_to_empty(tmp_path):
+    target = tmp_path / "list.yml"
+    target.write_text("- a\n- b\n", encoding="utf-8")
+
+    assert YamlProcessor().load(target) == {}